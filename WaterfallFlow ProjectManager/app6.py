@@ -1,217 +1,128 @@
-import wx
-import wx.dataview
 import time
-import threading
+
+STARTUP_T0 = time.perf_counter()
+
+import wx
+import datetime
+import gc
 import json
 import os
+import sqlite3
+import sys
+
+from waterfallflow import (
+    ADDED, AVAILABLE_CODECS, CHANGED, REMOVED, AssigneeIndex, Estimate, Journal, OfflineWorker, Phase, Project,
+    ProjectLoadWorker, ProjectSaveWorker, Rollups, Schedule, ScheduleError, SimulationWorker, SnapshotBuilder,
+    SqlStore, Subtask, Task, apply_leveling, build_project, clear_leveling, find_overallocations,
+    format_dependencies, generate_offline_plan, level_resources, load_binary, load_session, open_journal,
+    parse_dependencies, save_json_atomic, snapshot_session, write_binary, write_session,
+)
+
+AUTOSAVE_INTERVAL_MS = 60 * 1000
+SNAPSHOT_SLICE_MS = 15  # GUI time per event-loop tick spent serializing a snapshot
+COMPRESSED_EXTENSIONS = tuple(f'.json{suffix}' for suffix in AVAILABLE_CODECS)
+_COMPRESSED_PATTERNS = [f'*{extension}' for extension in COMPRESSED_EXTENSIONS]
+PROJECT_WILDCARD = ("JSON files (*.json)|*.json|"
+                    f"Compressed JSON ({', '.join(_COMPRESSED_PATTERNS)})|{';'.join(_COMPRESSED_PATTERNS)}|"
+                    "Project databases (*.wfdb)|*.wfdb|Binary projects (*.wfb)|*.wfb|All files (*.*)|*.*")
+PROJECT_EXTENSIONS = ('.json', '.wfdb', '.wfb') + COMPRESSED_EXTENSIONS
 
 # -------------------------------------------------------------------------
-# OFFLINE TEMPLATE LOGIC
+# STARTUP TIMING
 # -------------------------------------------------------------------------
+class StartupTimer:
+    """Records startup milestones relative to STARTUP_T0.
 
-TEMPLATES = {
-    "software": {
-        "name": "Enterprise Software Project",
-        "description": "Full Waterfall SDLC with Validation & Verification.",
-        "phases": [
-            ("Requirements", "Gathering needs", [
-                ("Stakeholder Interviews", 5, "Alice (PM)", [("Prep", 1), ("Interview", 3), ("Review", 1)]),
-                ("Spec Doc", 7, "Alice (PM)", [])
-            ]),
-            ("Design", "System architecture", [
-                ("UI Mockups", 5, "Carol (Design)", [("Wireframes", 2), ("Hi-Fi", 3)]),
-                ("DB Schema", 3, "Dave (DBA)", [])
-            ]),
-            ("Implementation", "Coding", [
-                ("Backend Setup", 5, "Backend Team", []),
-                ("API Dev", 10, "Backend Team", []),
-                ("Frontend", 10, "Frontend Team", [])
-            ]),
-            ("Verification", "Internal Testing", [
-                ("Code Reviews", 3, "Tech Lead", []),
-                ("Unit Testing", 5, "Dev Team", []),
-                ("Integration Testing", 5, "QA", [])
-            ]),
-            ("Validation", "Requirements Check", [
-                ("User Acceptance Testing (UAT)", 5, "Stakeholders", []),
-                ("Compliance Check", 2, "Legal", [])
-            ]),
-            ("Final Test & Demo", "Final steps", [
-                ("Performance Test", 3, "QA", []),
-                ("Final Client Demo", 1, "PM & Lead", []),
-                ("Sign-off Meeting", 1, "Sponsors", [])
-            ]),
-            ("Maintenance", "Support", [
-                ("Production Deployment", 1, "DevOps", []),
-                ("User Training", 2, "Alice (PM)", [])
-            ])
-        ]
-    },
-    "construction": {
-        "name": "Construction Project",
-        "description": "Physical infrastructure project.",
-        "phases": [
-            ("Planning", "Permits and blueprints", [
-                ("Site Survey", 3, "Surveyor", []),
-                ("Permits", 14, "Manager", [])
-            ]),
-            ("Foundation", "Ground work", [
-                ("Excavation", 5, "Crew A", []),
-                ("Pouring Concrete", 7, "Crew A", [])
-            ]),
-            ("Structure", "Framing", [
-                ("Framing", 10, "Carpenters", [("Walls", 6), ("Roof", 4)])
-            ])
-        ]
-    },
-    "generic": {
-        "name": "General Project",
-        "description": "Generic 5-stage waterfall plan.",
-        "phases": [
-            ("Initiation", "Define goals", [("Kickoff Meeting", 1, "Lead", [])]),
-            ("Planning", "Roadmap", [("Resource Plan", 3, "Manager", [])]),
-            ("Execution", "Core work", [
-                ("Task A", 5, "Team A", [("Subtask 1", 2), ("Subtask 2", 3)]),
-                ("Task B", 5, "Team B", [])
-            ]),
-            ("Monitoring", "Quality check", [("Review", 2, "Lead", [])]),
-            ("Closing", "Handover", [("Final Report", 1, "Admin", [])])
-        ]
-    }
-}
-
-
-def generate_offline_plan(prompt):
-    prompt = prompt.lower()
-    if any(x in prompt for x in ['soft', 'app', 'web', 'code', 'program']):
-        key = 'software'
-    elif any(x in prompt for x in ['build', 'house', 'construct', 'civil']):
-        key = 'construction'
-    else:
-        key = 'generic'
-
-    data = TEMPLATES[key]
-
-    project_data = {
-        "name": data["name"],
-        "description": f"{data['description']}",
-        "phases": []
-    }
-
-    for p_name, p_desc, tasks in data["phases"]:
-        phase_tasks = []
-        for t in tasks:
-            title, duration, assignee, sub_raw = t
-            subtasks_list = []
-            sub_duration_sum = 0
-            for st in sub_raw:
-                subtasks_list.append({"title": st[0], "durationDays": st[1]})
-                sub_duration_sum += st[1]
-
-            final_duration = sub_duration_sum if subtasks_list else duration
-            phase_tasks.append({
-                "title": title,
-                "durationDays": final_duration,
-                "assignee": assignee,
-                "subtasks": subtasks_list
-            })
-
-        phase_obj = {
-            "name": p_name,
-            "description": p_desc,
-            "tasks": phase_tasks
-        }
-        project_data["phases"].append(phase_obj)
+    Run with --startup-report (or WATERFALLFLOW_STARTUP_REPORT=1) to have
+    the report printed to stderr once the first project is on screen.
+    """
 
-    return project_data
+    def __init__(self, t0, verbose=False):
+        self.t0 = t0
+        self.verbose = verbose
+        self.marks = []
 
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
 
-# -------------------------------------------------------------------------
-# DATA MODELS
-# -------------------------------------------------------------------------
-class Subtask:
-    def __init__(self, title, duration, completed=False):
-        self.title = title
-        self.duration = duration
-        self.completed = completed
-
-    def to_dict(self):
-        return {
-            "title": self.title,
-            "durationDays": self.duration,
-            "completed": self.completed
-        }
+    def elapsed_ms(self):
+        return 1000 * ((self.marks[-1][1] if self.marks else self.t0) - self.t0)
 
-
-class Task:
-    def __init__(self, title, duration, assignee="Unassigned", completed=False):
-        self.title = title
-        self.duration = duration
-        self.assignee = assignee
-        self.completed = completed
-        self.subtasks = []
-
-    def to_dict(self):
-        return {
-            "title": self.title,
-            "durationDays": self.duration,
-            "assignee": self.assignee,
-            "completed": self.completed,
-            "subtasks": [s.to_dict() for s in self.subtasks]
-        }
-
-
-class Phase:
-    def __init__(self, name, description):
-        self.name = name
-        self.description = description
-        self.tasks = []
-
-    def to_dict(self):
-        return {
-            "name": self.name,
-            "description": self.description,
-            "tasks": [t.to_dict() for t in self.tasks]
-        }
-
-
-class Project:
-    def __init__(self, name="New Project", description=""):
-        self.name = name
-        self.description = description
-        self.phases = []
-
-    def to_dict(self):
-        return {
-            "name": self.name,
-            "description": self.description,
-            "phases": [p.to_dict() for p in self.phases]
-        }
+    def report(self):
+        lines = ["Startup timing:"]
+        prev = self.t0
+        for name, t in self.marks:
+            lines.append(f"  {name:<12} {1000 * (t - self.t0):8.1f} ms  (+{1000 * (t - prev):.1f} ms)")
+            prev = t
+        return "\n".join(lines)
 
 
 # -------------------------------------------------------------------------
-# WORKER
+# UPDATE COALESCER
 # -------------------------------------------------------------------------
-class OfflineWorker(threading.Thread):
-    def __init__(self, prompt, callback):
-        threading.Thread.__init__(self)
-        self.prompt = prompt
-        self.callback = callback
-
-    def run(self):
-        time.sleep(0.5)
+class UpdateCoalescer:
+    """Batches model ChangeEvents into one UI pass per tick.
+
+    Structural events (ADDED/REMOVED) are kept in order because row and
+    tree positions depend on them; field changes are keyed by (node, field)
+    so repeated edits of the same value collapse into one. Everything is
+    applied by `apply(structural, changes)` inside Freeze()/Thaw() at most
+    once every `interval_ms`.
+    """
+
+    def __init__(self, window, apply, interval_ms=16):
+        self.window = window
+        self.apply = apply
+        self.interval_ms = interval_ms
+        self.structural = []
+        self.changes = {}
+        self.timer = None
+        self.received = 0
+        self.coalesced = 0
+        self.flushes = 0
+
+    def push(self, event):
+        self.received += 1
+        if event.kind == CHANGED:
+            key = (id(event.node), event.field)
+            if key in self.changes:
+                self.coalesced += 1
+            self.changes[key] = event
+        else:
+            self.structural.append(event)
+        if self.timer is None:
+            self.timer = wx.CallLater(self.interval_ms, self.flush)
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.Stop()
+            self.timer = None
+        if not self.structural and not self.changes:
+            return
+        structural, changes = self.structural, list(self.changes.values())
+        self.structural, self.changes = [], {}
+        self.flushes += 1
+        self.window.Freeze()
         try:
-            data = generate_offline_plan(self.prompt)
-            self.callback(data, None)
-        except Exception as e:
-            self.callback(None, str(e))
+            self.apply(structural, changes)
+        finally:
+            self.window.Thaw()
+
+    def clear(self):
+        if self.timer is not None:
+            self.timer.Stop()
+            self.timer = None
+        self.structural, self.changes = [], {}
+
+    def stats(self):
+        return {"received": self.received, "coalesced": self.coalesced, "flushes": self.flushes}
 
 
 # -------------------------------------------------------------------------
 # MAIN FRAME - DARK THEME
 # -------------------------------------------------------------------------
 class MainFrame(wx.Frame):
-    def __init__(self):
+    def __init__(self, startup=None):
         super().__init__(parent=None, title='WaterfallFlow (Dark Edition)', size=(1280, 850))
 
         # -- Theme Colors (Dracula/Dark Inspired) --
@@ -223,8 +134,28 @@ class MainFrame(wx.Frame):
         self.col_input_bg = wx.Colour(60, 60, 60)
 
         self.project = None
+        self.assignees = None  # AssigneeIndex of self.project
+        self.rollups = None  # Rollups of self.project
+        self.schedule = None  # Schedule of self.project while the critical path is shown
+        self.dates = None  # workdays.ProjectDates for self.schedule, if the project has a start date
         self.current_phase = None
-        self.row_map = {}
+        self.load_worker = None
+        self.save_worker = None
+        self.save_snapshot = None  # (SnapshotBuilder, callback) while a save's snapshot is being built
+        self.gc_pauses = 0  # snapshots being built or written; see pause_gc()
+        self.session_worker = None
+        self.autosave_snapshot = None  # (SnapshotBuilder, callback) while the session snapshot is being built
+        self.simulation_worker = None
+        self.session_path = None
+        self.project_path = None
+        self.store = None  # SqlStore of self.project when it was opened from / saved as a .wfdb file
+        self.journal = None  # Journal of self.project when it was opened from / saved as a JSON file
+        self.save_journal = None  # Journal of the file a save is writing, until it replaces self.journal
+        self.restore_view = None  # session state to return to once the project being loaded arrives
+        self.edited = False  # self.project changed since it was opened or saved
+        self.updates = UpdateCoalescer(self, self.apply_model_changes)
+        self.tree_items = {}  # model object -> tree item, only for nodes created so far
+        self.startup = startup
 
         self.init_ui()
         self.Center()
@@ -246,16 +177,34 @@ class MainFrame(wx.Frame):
         # Create a unique ID for the Wizard menu item
         self.wizard_id = wx.NewId()
         tools_menu.Append(self.wizard_id, '&Wizard...\tCtrl+W', 'Generate plan from description')
+        self.update_stats_id = wx.NewId()
+        tools_menu.Append(self.update_stats_id, '&UI Update Stats', 'Show how many model changes were coalesced')
+        self.reassign_id = wx.NewId()
+        tools_menu.Append(self.reassign_id, '&Reassign Tasks...', 'Move every task of one assignee to another')
+        tools_menu.AppendSeparator()
+        self.dependencies_id = wx.NewId()
+        tools_menu.Append(self.dependencies_id, 'Set &Dependencies...\tCtrl+D',
+                          'Set the predecessors of the selected task or subtask')
+        self.estimate_id = wx.NewId()
+        tools_menu.Append(self.estimate_id, 'Set &Estimate...',
+                          'Set optimistic, most likely and pessimistic durations for risk simulation')
+        self.simulation_id = wx.NewId()
+        tools_menu.Append(self.simulation_id, 'Risk &Simulation...',
+                          'Estimate finish dates and criticality with a Monte Carlo simulation')
+        self.conflicts_id = wx.NewId()
+        tools_menu.Append(self.conflicts_id, 'Resource C&onflicts...',
+                          'Find assignees booked on overlapping tasks and level them')
+        self.clear_leveling_id = wx.NewId()
+        tools_menu.Append(self.clear_leveling_id, 'C&lear Leveling', 'Remove the delays added by leveling')
+        self.calendar_id = wx.NewId()
+        tools_menu.Append(self.calendar_id, 'Project Cale&ndar...',
+                          'Set the project start date and working calendars')
+        self.critical_id = wx.NewId()
+        tools_menu.AppendCheckItem(self.critical_id, 'Show &Critical Path\tCtrl+K',
+                                   'Schedule the plan and highlight the activities that drive its length')
         menubar.Append(tools_menu, '&Tools')
         self.SetMenuBar(menubar)
 
-        # Bind each menu item to its specific handler with the correct ID
-        self.Bind(wx.EVT_MENU, self.on_exit, id=wx.ID_EXIT)
-        self.Bind(wx.EVT_MENU, self.on_new_project, id=wx.ID_NEW)
-        self.Bind(wx.EVT_MENU, self.on_save_project, id=wx.ID_SAVE)
-        self.Bind(wx.EVT_MENU, self.on_open_project, id=wx.ID_OPEN)
-        self.Bind(wx.EVT_MENU, self.on_generate, id=self.wizard_id)  # Use the specific ID
-
         # -- Splitter --
         self.splitter = wx.SplitterWindow(self, style=wx.SP_3D | wx.SP_LIVE_UPDATE | wx.SP_NOBORDER)
         self.splitter.SetBackgroundColour(self.col_bg_main)
@@ -265,7 +214,7 @@ class MainFrame(wx.Frame):
         self.tree_panel.SetBackgroundColour(self.col_bg_panel)
 
         tree_sizer = wx.BoxSizer(wx.VERTICAL)
-        lbl_tree = wx.StaticText(self.tree_panel, label=" PROJECT PHASES")
+        lbl_tree = wx.StaticText(self.tree_panel, label=" PROJECT OUTLINE")
         lbl_tree.SetFont(wx.Font(9, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
         lbl_tree.SetForegroundColour(wx.Colour(150, 150, 150))
 
@@ -276,6 +225,7 @@ class MainFrame(wx.Frame):
 
         self.root = self.tree.AddRoot("Root")
         self.Bind(wx.EVT_TREE_SEL_CHANGED, self.on_phase_selected, self.tree)
+        self.Bind(wx.EVT_TREE_ITEM_EXPANDING, self.on_tree_expanding, self.tree)
 
         tree_sizer.Add(lbl_tree, 0, wx.ALL, 15)
         tree_sizer.Add(self.tree, 1, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
@@ -298,24 +248,112 @@ class MainFrame(wx.Frame):
         self.lbl_phase_desc = wx.StaticText(self.header_panel, label="...")
         self.lbl_phase_desc.SetForegroundColour(wx.Colour(180, 180, 180))
 
+        self.lbl_phase_stats = wx.StaticText(self.header_panel, label="")
+        self.lbl_phase_stats.SetForegroundColour(wx.Colour(150, 150, 150))
+
         header_sizer.Add(self.lbl_phase_name, 0, wx.BOTTOM, 5)
         header_sizer.Add(self.lbl_phase_desc, 0, wx.EXPAND)
+        header_sizer.Add(self.lbl_phase_stats, 0, wx.EXPAND | wx.TOP, 5)
         self.header_panel.SetSizer(header_sizer)
 
-        # Task List (DataViewListCtrl)
-        self.task_list = wx.dataview.DataViewListCtrl(self.right_panel, style=wx.BORDER_NONE)
+        self.right_sizer.Add(self.header_panel, 0, wx.EXPAND | wx.ALL, 25)
+        line = wx.StaticLine(self.right_panel)
+        line.SetBackgroundColour(wx.Colour(60, 60, 60))
+        self.right_sizer.Add(line, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 25)
+        self.right_panel.SetSizer(self.right_sizer)
+
+        self.splitter.SplitVertically(self.tree_panel, self.right_panel, 280)
+        self.splitter.SetMinimumPaneSize(200)
+
+        self.status_bar = self.CreateStatusBar(2)
+        self.status_bar.SetStatusWidths([-1, 90])
+        self.btn_cancel_load = wx.Button(self.status_bar, label="Cancel")
+        self.btn_cancel_load.Hide()
+        self.Bind(wx.EVT_BUTTON, self.on_cancel_load, self.btn_cancel_load)
+        self.status_bar.Bind(wx.EVT_SIZE, self.on_status_bar_size)
+        self.SetStatusText("Starting...")
+
+        # The task list, its controls and the default project are built on
+        # the first idle event, after the frame has been shown and painted.
+        self.right_panel.Bind(wx.EVT_PAINT, self.on_first_paint)
+        self.Bind(wx.EVT_IDLE, self.on_first_idle)
+
+    def on_first_paint(self, event):
+        self.right_panel.Unbind(wx.EVT_PAINT, handler=self.on_first_paint)
+        if self.startup:
+            self.startup.mark("first paint")
+        event.Skip()
+
+    def on_first_idle(self, event):
+        self.Unbind(wx.EVT_IDLE, handler=self.on_first_idle)
+        self.finish_startup()
+
+    def finish_startup(self):
+        self.Freeze()
+        self.build_task_area()
+        self.right_panel.Layout()
+        self.Thaw()
+
+        # Menu handlers need the task list, so they go live only now.
+        # Bind each menu item to its specific handler with the correct ID
+        self.Bind(wx.EVT_MENU, self.on_exit, id=wx.ID_EXIT)
+        self.Bind(wx.EVT_MENU, self.on_new_project, id=wx.ID_NEW)
+        self.Bind(wx.EVT_MENU, self.on_save_project, id=wx.ID_SAVE)
+        self.Bind(wx.EVT_MENU, self.on_open_project, id=wx.ID_OPEN)
+        self.Bind(wx.EVT_MENU, self.on_generate, id=self.wizard_id)  # Use the specific ID
+        self.Bind(wx.EVT_MENU, self.on_update_stats, id=self.update_stats_id)
+        self.Bind(wx.EVT_MENU, self.on_reassign, id=self.reassign_id)
+        self.Bind(wx.EVT_MENU, self.on_set_dependencies, id=self.dependencies_id)
+        self.Bind(wx.EVT_MENU, self.on_set_estimate, id=self.estimate_id)
+        self.Bind(wx.EVT_MENU, self.on_run_simulation, id=self.simulation_id)
+        self.Bind(wx.EVT_MENU, self.on_toggle_critical_path, id=self.critical_id)
+        self.Bind(wx.EVT_MENU, self.on_project_calendar, id=self.calendar_id)
+        self.Bind(wx.EVT_MENU, self.on_resource_conflicts, id=self.conflicts_id)
+        self.Bind(wx.EVT_MENU, self.on_clear_leveling, id=self.clear_leveling_id)
+
+        session_dir = wx.StandardPaths.Get().GetUserDataDir()
+        os.makedirs(session_dir, exist_ok=True)
+        self.session_path = os.path.join(session_dir, "session.wfs")
+        if self.restore_session():
+            self.SetStatusText("Restored last session")
+        else:
+            self.create_default_project()
+            self.SetStatusText("Ready")
+        self.autosave_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_autosave, self.autosave_timer)
+        self.autosave_timer.Start(AUTOSAVE_INTERVAL_MS)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        if self.startup:
+            self.startup.mark("first data")
+            self.SetStatusText(f"Ready in {self.startup.elapsed_ms():.0f} ms")
+            if self.startup.verbose:
+                print(self.startup.report(), file=sys.stderr)
+
+    def build_task_area(self):
+        import wx.dataview
+        from task_list_model import TaskListModel
+
+        # Task List (virtual DataViewCtrl)
+        self.task_list = wx.dataview.DataViewCtrl(self.right_panel, style=wx.BORDER_NONE)
         self.task_list.SetBackgroundColour(wx.Colour(40, 40, 40))
         self.task_list.SetForegroundColour(self.col_fg_text)
+        self.task_model = TaskListModel()
+        self.task_list.AssociateModel(self.task_model)
+        self.task_model.DecRef()  # The control now owns the model reference
 
         # Columns
-        self.task_list.AppendToggleColumn("✔", width=40, mode=wx.dataview.DATAVIEW_CELL_ACTIVATABLE)
-        self.task_list.AppendTextColumn("Task / Subtask (Double-click to edit)", width=450)
-        self.task_list.AppendTextColumn("Duration", width=80)
-        self.task_list.AppendTextColumn("Assignee", width=150)
+        self.task_list.AppendToggleColumn("✔", 0, width=40, mode=wx.dataview.DATAVIEW_CELL_ACTIVATABLE)
+        self.task_list.AppendTextColumn("Task / Subtask (Double-click to edit)", 1, width=450)
+        self.task_list.AppendTextColumn("Duration", 2, width=80)
+        self.task_list.AppendTextColumn("Assignee", 3, width=150)
+        self.task_list.AppendTextColumn("ID", 4, width=60)
+        self.task_list.AppendTextColumn("Depends on", 5, width=120)
+        self.task_list.AppendTextColumn("Start", 6, width=90)
+        self.task_list.AppendTextColumn("Finish", 7, width=90)
+        self.task_list.AppendTextColumn("Float", 8, width=60)
 
         self.Bind(wx.dataview.EVT_DATAVIEW_SELECTION_CHANGED, self.on_list_selection, self.task_list)
         self.Bind(wx.dataview.EVT_DATAVIEW_ITEM_ACTIVATED, self.on_list_double_click, self.task_list)
-        self.Bind(wx.dataview.EVT_DATAVIEW_ITEM_VALUE_CHANGED, self.on_item_value_changed, self.task_list)
 
         # -- Controls Panel (Bottom) --
         self.controls_panel = wx.Panel(self.right_panel)
@@ -371,37 +409,442 @@ class MainFrame(wx.Frame):
 
         self.controls_panel.SetSizer(controls_sizer)
 
-        self.right_sizer.Add(self.header_panel, 0, wx.EXPAND | wx.ALL, 25)
-        line = wx.StaticLine(self.right_panel)
-        line.SetBackgroundColour(wx.Colour(60, 60, 60))
-        self.right_sizer.Add(line, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 25)
         self.right_sizer.Add(self.task_list, 1, wx.EXPAND | wx.ALL, 25)
         self.right_sizer.Add(self.controls_panel, 0, wx.EXPAND | wx.ALL, 0)
-        self.right_panel.SetSizer(self.right_sizer)
-
-        self.splitter.SplitVertically(self.tree_panel, self.right_panel, 280)
-        self.splitter.SetMinimumPaneSize(200)
-
-        self.CreateStatusBar()
-        self.SetStatusText("Ready")
-
-        # Load default project
-        self.create_default_project()
 
     def create_default_project(self):
         data = generate_offline_plan("Software Development")
         self.load_project_data(data, None)
 
+    # -- Session snapshot ---------------------------------------------------
+    def restore_session(self):
+        """Reopen the project, phase and scroll position from the last run."""
+        if not os.path.exists(self.session_path):
+            return False
+        try:
+            project, state = load_session(self.session_path)
+        except (OSError, ValueError, EOFError, TypeError) as e:
+            print(f"Ignoring session snapshot: {e}", file=sys.stderr)
+            return False
+        path = state.get("path")
+        if path and path.lower().endswith(".wfdb"):
+            # The database holds the plan; the snapshot only says where we were.
+            try:
+                store = SqlStore.open(path)
+            except (ValueError, sqlite3.Error) as e:
+                print(f"Could not reopen {path}: {e}", file=sys.stderr)
+                return False
+            self.set_project(store.project, state.get("phase", 0))
+            self.store = store
+        elif path and path.lower().endswith(".wfb") and state.get("reopen"):
+            try:
+                project = load_binary(path)
+            except (OSError, ValueError) as e:
+                print(f"Could not reopen {path}: {e}", file=sys.stderr)
+                return False
+            self.set_project(project, state.get("phase", 0))
+        elif path and state.get("reopen"):
+            # The file and its journal hold the plan; reload them and come
+            # back to the same view. Meanwhile the default project shows.
+            if not os.path.exists(path):
+                return False
+            self.restore_view = state
+            wx.CallAfter(self.start_load, path)
+            return False
+        else:
+            self.set_project(project, state.get("phase", 0))
+            # The snapshot may hold edits that never reached the file.
+            self.edited = True
+        self.project_path = path
+        wx.CallAfter(self.restore_list_position, state.get("top_row", 0), state.get("selected_id"))
+        return True
+
+    def session_state(self):
+        phase = self.project.phases.index(self.current_phase) if self.current_phase is not None else -1
+        top = self.task_list.GetTopItem()
+        ref = self.get_selected_ref()
+        return {
+            "path": self.project_path,
+            "phase": phase,
+            "top_row": self.task_model.GetRow(top) if top.IsOk() else 0,
+            "selected_id": (ref.subtask or ref.task).id if ref is not None else None,
+        }
+
+    def session_view_only(self):
+        # Every edit is already in the database or journal, or there are
+        # none since the archive was opened; the session only records the view.
+        unchanged_archive = (not self.edited and self.project_path is not None
+                             and self.project_path.lower().endswith(".wfb"))
+        return self.store is not None or self.journal is not None or unchanged_archive
+
+    def session_snapshot(self):
+        if self.session_view_only():
+            return dict(self.session_state(), reopen=True), self.project.info_dict(), []
+        return snapshot_session(self.project, self.session_state())
+
+    def restore_list_position(self, top_row, selected_id):
+        node = self.project.find(selected_id) if selected_id is not None else None
+        if isinstance(node, Subtask):
+            node, subtask = node.parent, node
+        else:
+            subtask = None
+        if isinstance(node, Task) and node.parent is self.current_phase:
+            self.select_task_row(node, subtask)
+        count = self.task_model.GetCount()
+        if 0 < top_row < count:
+            # Scroll to the end first so the top row lands at the top.
+            self.task_list.EnsureVisible(self.task_model.GetItem(count - 1))
+            self.task_list.EnsureVisible(self.task_model.GetItem(top_row))
+
+    def on_autosave(self, event):
+        if self.project is None or self.session_worker is not None or self.autosave_snapshot is not None:
+            return
+        if self.session_view_only():
+            self.start_session_save(self.session_snapshot(), False)
+        else:
+            # Serialized a slice per tick like a save, so autosaving never stalls editing.
+            self.autosave_snapshot = self.build_snapshot(self.write_autosave, keep_blobs=True)
+
+    def write_autosave(self, builder):
+        self.autosave_snapshot = None
+        self.start_session_save(builder.session(self.session_state()), True)
+
+    def drop_autosave(self):
+        """Abandon a session snapshot still being built."""
+        if self.autosave_snapshot is not None:
+            self.autosave_snapshot[0].detach()
+            self.autosave_snapshot = None
+            self.resume_gc()
+
+    def start_session_save(self, snapshot, gc_paused):
+        self.session_worker = ProjectSaveWorker(
+            snapshot, self.session_path,
+            lambda pathname, error: wx.CallAfter(self.finish_session_save, error, gc_paused), write_session)
+        self.session_worker.start()
+
+    def finish_session_save(self, error, gc_paused):
+        self.session_worker = None
+        if gc_paused:
+            self.resume_gc()
+        if error:
+            self.SetStatusText(f"Autosave failed: {error}")
+
+    def on_close(self, event):
+        self.autosave_timer.Stop()
+        if self.save_snapshot is not None:
+            # Finish serializing the pending save; its worker completes before exit.
+            self.continue_snapshot(self.save_snapshot, deadline=float("inf"))
+        self.drop_autosave()
+        if self.session_worker is not None:
+            self.session_worker.join()
+        if self.project is not None:
+            try:
+                write_session(self.session_path, self.session_snapshot())
+            except Exception as e:
+                print(f"Could not write session snapshot: {e}", file=sys.stderr)
+        if self.store is not None:
+            self.store.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.save_journal is not None:
+            self.save_journal.close()
+        event.Skip()
+
     def on_exit(self, event):
         self.Close()
 
+    def on_update_stats(self, event):
+        stats = self.updates.stats()
+        wx.MessageBox(f"Model changes received: {stats['received']}\n"
+                      f"Coalesced away: {stats['coalesced']}\n"
+                      f"UI flushes: {stats['flushes']}",
+                      "UI Update Stats", wx.OK | wx.ICON_INFORMATION)
+
+    def on_reassign(self, event):
+        if self.project is None:
+            return
+        counts = self.assignees.assignees()
+        if not counts:
+            wx.MessageBox("There are no tasks to reassign.", "Reassign Tasks", wx.OK | wx.ICON_INFORMATION)
+            return
+        names = sorted(counts)
+        dlg = wx.SingleChoiceDialog(self, "Reassign all tasks of:", "Reassign Tasks",
+                                    [f"{name} ({counts[name]})" for name in names])
+        old = names[dlg.GetSelection()] if dlg.ShowModal() == wx.ID_OK else None
+        dlg.Destroy()
+        if old is None:
+            return
+        dlg = wx.TextEntryDialog(self, f'New assignee for the tasks of "{old}":', 'Reassign Tasks', old)
+        if dlg.ShowModal() == wx.ID_OK:
+            new = dlg.GetValue().strip()
+            if new and new != old:
+                moved = self.assignees.reassign(old, new)
+                self.SetStatusText(f"Reassigned {moved} tasks from {old} to {new}.")
+        dlg.Destroy()
+
+    # -- Scheduling -----------------------------------------------------------
+    def on_set_dependencies(self, event):
+        ref = self.get_selected_ref()
+        if ref is None:
+            wx.MessageBox("Select a task or subtask first.", "Set Dependencies", wx.OK | wx.ICON_INFORMATION)
+            return
+        node = ref.subtask or ref.task
+        dlg = wx.TextEntryDialog(self, 'Predecessor IDs, e.g. "12, 15SS, 20FF+2" (FS is the default):',
+                                 'Set Dependencies', format_dependencies(node.dependencies))
+        text = dlg.GetValue() if dlg.ShowModal() == wx.ID_OK else None
+        dlg.Destroy()
+        if text is None:
+            return
+        try:
+            deps = parse_dependencies(text)
+            for dep in deps:
+                pred = self.project.find(dep.pred, load=True)
+                if pred is node or not isinstance(pred, (Task, Subtask)):
+                    raise ValueError(f"{dep.pred} is not the ID of another task or subtask.")
+        except ValueError as e:
+            wx.MessageBox(str(e), "Invalid Dependencies", wx.OK | wx.ICON_WARNING)
+            return
+        old = node.dependencies
+        node.dependencies = deps
+        try:
+            Schedule(self.project)
+        except ScheduleError as e:
+            node.dependencies = old
+            wx.MessageBox(str(e), "Invalid Dependencies", wx.OK | wx.ICON_WARNING)
+
+    def on_set_estimate(self, event):
+        ref = self.get_selected_ref()
+        if ref is None:
+            wx.MessageBox("Select a task or subtask first.", "Set Estimate", wx.OK | wx.ICON_INFORMATION)
+            return
+        node = ref.subtask or ref.task
+        current = ", ".join(f"{value:g}" for value in node.estimate) if node.estimate else ""
+        dlg = wx.TextEntryDialog(self, 'Optimistic, most likely and pessimistic days, e.g. "3, 5, 10" '
+                                       '(empty to remove):', 'Set Estimate', current)
+        text = dlg.GetValue() if dlg.ShowModal() == wx.ID_OK else None
+        dlg.Destroy()
+        if text is None:
+            return
+        try:
+            values = [float(part) for part in text.replace(";", ",").split(",") if part.strip()]
+            if values and (len(values) != 3 or not 0 <= values[0] <= values[1] <= values[2]):
+                raise ValueError("Enter three numbers with optimistic <= most likely <= pessimistic.")
+        except ValueError as e:
+            wx.MessageBox(str(e), "Invalid Estimate", wx.OK | wx.ICON_WARNING)
+            return
+        node.estimate = Estimate(*(int(v) if v == int(v) else v for v in values)) if values else None
+
+    def on_run_simulation(self, event):
+        if self.project is None or self.simulation_worker is not None:
+            return
+        try:
+            from waterfallflow.montecarlo import Network
+        except ImportError:
+            wx.MessageBox("Risk simulation requires NumPy.", "Risk Simulation", wx.OK | wx.ICON_WARNING)
+            return
+        iterations = wx.GetNumberFromUser("Number of simulated schedules:", "Iterations", "Risk Simulation",
+                                          10000, 100, 1000000, self)
+        if iterations < 0:
+            return
+        try:
+            schedule = Schedule(self.project)
+            network = Network(schedule)
+        except (ScheduleError, ValueError) as e:
+            wx.MessageBox(str(e), "Risk Simulation", wx.OK | wx.ICON_WARNING)
+            return
+        self.SetStatusText(f"Simulating {iterations} schedules...")
+        self.simulation_worker = SimulationWorker(network, iterations, lambda result, error: wx.CallAfter(
+            self.finish_simulation, schedule.nodes, result, error))
+        self.simulation_worker.start()
+
+    def finish_simulation(self, nodes, result, error):
+        self.simulation_worker = None
+        if error:
+            self.SetStatusText("Simulation failed.")
+            wx.MessageBox(error, "Risk Simulation", wx.OK | wx.ICON_ERROR)
+            return
+        from waterfallflow.montecarlo import SimulationResult
+        result = SimulationResult(nodes, *result)
+        days = result.percentiles()
+        dates = result.finish_dates(self.project) or {}
+        lines = [f"P{p}: {days[p]:.1f} working days" + (f", finishing {dates[p]}" if p in dates else "")
+                 for p in days]
+        lines.append("")
+        lines.append("Most often critical:")
+        lines.extend(f"  #{node.id} {node.title}: {index:.0%}" for node, index in result.most_critical(10))
+        self.SetStatusText(f"Simulated {result.iterations} schedules.")
+        wx.MessageBox("\n".join(lines), f"Risk Simulation ({result.iterations} iterations)",
+                      wx.OK | wx.ICON_INFORMATION)
+
+    def on_resource_conflicts(self, event):
+        if self.project is None:
+            return
+        try:
+            if self.schedule is not None:
+                self.schedule.update()
+                schedule = self.schedule
+            else:
+                schedule = Schedule(self.project)
+        except ScheduleError as e:
+            wx.MessageBox(str(e), "Resource Conflicts", wx.OK | wx.ICON_WARNING)
+            return
+        conflicts = find_overallocations(schedule)
+        if not conflicts:
+            wx.MessageBox("No assignee is booked on overlapping tasks.", "Resource Conflicts",
+                          wx.OK | wx.ICON_INFORMATION)
+            return
+        lines = [f"{c.assignee}: days {c.start:g}-{c.finish:g}, {c.load} tasks at once "
+                 f"({', '.join(f'#{t.id}' for t in c.tasks[:6])}{', ...' if len(c.tasks) > 6 else ''})"
+                 for c in conflicts[:15]]
+        if len(conflicts) > 15:
+            lines.append(f"... and {len(conflicts) - 15} more")
+        dlg = wx.MessageDialog(self, "\n".join(lines) + "\n\nLevel now? Non-critical tasks are delayed "
+                                                        "within their float; the project end does not move.",
+                               f"{len(conflicts)} Resource Conflicts", wx.YES_NO | wx.ICON_QUESTION)
+        level = dlg.ShowModal() == wx.ID_YES
+        dlg.Destroy()
+        if not level:
+            return
+        delays = level_resources(schedule)
+        apply_leveling(delays)
+        if schedule is self.schedule:
+            self.update_schedule()
+        else:
+            schedule.rebuild()
+        remaining = len(find_overallocations(schedule))
+        self.SetStatusText(f"Leveling delayed {len(delays)} tasks; {remaining} conflicts remain.")
+
+    def on_clear_leveling(self, event):
+        if self.project is not None:
+            self.SetStatusText(f"Cleared the leveling delay of {clear_leveling(self.project)} tasks.")
+
+    def on_project_calendar(self, event):
+        if self.project is None:
+            return
+        settings = {"startDate": self.project.start_date or datetime.date.today().isoformat(),
+                    "calendars": self.project.calendars or {
+                        "default": {"weekmask": "1111100", "holidays": []}}}
+        dlg = wx.TextEntryDialog(self, 'Start date and calendars (weekmask Mon..Sun, holidays as '
+                                       'YYYY-MM-DD).\nA calendar named after an assignee applies to '
+                                       'their tasks; "default" to everything else.',
+                                 'Project Calendar', json.dumps(settings, indent=2),
+                                 style=wx.OK | wx.CANCEL | wx.TE_MULTILINE)
+        dlg.SetSize((520, 420))
+        text = dlg.GetValue() if dlg.ShowModal() == wx.ID_OK else None
+        dlg.Destroy()
+        if text is None:
+            return
+        try:
+            settings = json.loads(text)
+            start = settings.get("startDate") or None
+            calendars = settings.get("calendars") or {}
+            if start is not None:
+                datetime.date.fromisoformat(start)
+            if not isinstance(calendars, dict):
+                raise ValueError("calendars must be an object of name -> calendar")
+            try:
+                from waterfallflow.workdays import busday_calendar
+            except ImportError:
+                pass
+            else:
+                for spec in calendars.values():
+                    busday_calendar(spec)
+        except (ValueError, TypeError, AttributeError) as e:
+            wx.MessageBox(str(e), "Invalid Calendar", wx.OK | wx.ICON_WARNING)
+            return
+        self.project.start_date = start
+        self.project.calendars = calendars
+
+    def on_toggle_critical_path(self, event):
+        if not event.IsChecked():
+            self.stop_schedule()
+            return
+        try:
+            self.schedule = Schedule(self.project)
+        except ScheduleError as e:
+            self.GetMenuBar().Check(self.critical_id, False)
+            self.SetStatusText(str(e))
+            return
+        # The schedule follows edits itself; apply_model_changes asks it to
+        # catch up once per coalesced batch.
+        self.schedule.watch()
+        self.show_schedule()
+
+    def update_schedule(self):
+        try:
+            self.schedule.update()
+        except ScheduleError as e:
+            self.stop_schedule()
+            self.SetStatusText(str(e))
+            return
+        self.show_schedule()
+
+    def show_schedule(self, assignments=False):
+        # A full pass may follow a rebuild that renumbered the activities.
+        self.update_dates(assignments or self.schedule.last_update[0] == "full")
+        status = f"Project length: {self.schedule.length:g} working days"
+        if self.dates is not None:
+            status += f", finishing {self.dates.project_finish()}"
+        self.SetStatusText(status + " (critical activities highlighted)")
+        self.task_model.schedule = self.schedule
+        self.task_list.Refresh()
+
+    def update_dates(self, assignments=False):
+        """Map the schedule onto calendar dates if the project has a start date."""
+        if self.project.start_date is None:
+            self.dates = None
+        elif self.dates is not None and self.dates.schedule is self.schedule:
+            self.dates.refresh(assignments)
+        else:
+            try:
+                from waterfallflow.workdays import ProjectDates
+            except ImportError:  # no NumPy: keep showing working-day offsets
+                self.dates = None
+            else:
+                self.dates = ProjectDates(self.project, self.schedule)
+        self.task_model.dates = self.dates
+
+    def stop_schedule(self):
+        if self.schedule is not None:
+            self.schedule.detach()
+        self.schedule = self.task_model.schedule = None
+        self.dates = self.task_model.dates = None
+        self.GetMenuBar().Check(self.critical_id, False)
+        self.task_list.Refresh()
+
+    def watch_project(self, project):
+        if self.save_snapshot is not None:
+            # A save that was asked for goes ahead with the project it was asked for.
+            self.continue_snapshot(self.save_snapshot, deadline=float("inf"))
+        # The next autosave covers the new project.
+        self.drop_autosave()
+        if self.project is not None:
+            self.project.unsubscribe(self.updates.push)
+            self.assignees.detach()
+            self.rollups.detach()
+            self.stop_schedule()
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        self.updates.clear()
+        self.project = project
+        # Rollups subscribes first so totals are current when the UI reads them.
+        self.rollups = Rollups(project)
+        self.project.subscribe(self.updates.push)
+        self.assignees = AssigneeIndex(project)
+
     def on_new_project(self, event):
-        self.project = Project("Untitled Project", "Start by adding phases or using the Wizard.")
+        self.watch_project(Project("Untitled Project", "Start by adding phases or using the Wizard."))
+        self.project_path = None
         self.refresh_tree()
         self.lbl_phase_name.SetLabel("New Project")
         self.lbl_phase_desc.SetLabel("Empty project created.")
-        self.task_list.DeleteAllItems()
-        self.row_map = {}
+        self.current_phase = None
+        self.update_header_stats()
+        self.task_model.set_phase(None)
         self.SetStatusText("New project created.")
 
     def on_save_project(self, event):
@@ -415,7 +858,7 @@ class MainFrame(wx.Frame):
             message="Save project file",
             defaultDir=os.getcwd(),
             defaultFile="myproject.json",
-            wildcard="JSON files (*.json)|*.json|All files (*.*)|*.*",
+            wildcard=PROJECT_WILDCARD,
             style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT
         )
 
@@ -424,23 +867,168 @@ class MainFrame(wx.Frame):
             pathname = dlg.GetPath()
 
             # Ensure .json extension
-            if not pathname.lower().endswith('.json'):
+            if not pathname.lower().endswith(PROJECT_EXTENSIONS):
                 pathname += '.json'
 
+            if pathname.lower().endswith('.wfdb'):
+                self.save_database(pathname)
+            else:
+                self.start_save(pathname)
+
+        dlg.Destroy()
+
+    def save_database(self, pathname):
+        """Save to a .wfdb file, which then keeps every later edit as it is made."""
+        if self.store is not None and os.path.abspath(self.store.path) == os.path.abspath(pathname):
+            self.store.commit()
+        else:
             try:
-                # Save the project as JSON
-                with open(pathname, 'w', encoding='utf-8') as f:
-                    json.dump(self.project.to_dict(), f, indent=2, ensure_ascii=False)
+                store = SqlStore.create(pathname, self.project)
+            except (OSError, sqlite3.Error) as e:
+                wx.MessageBox(f"Error saving file:\n{e}", "Save Error", wx.OK | wx.ICON_ERROR)
+                self.SetStatusText("Save failed.")
+                return
+            if self.store is not None:
+                self.store.close()
+            self.store = store
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+        self.project_path = pathname
+        self.SetStatusText(f"Saved: {os.path.basename(pathname)} at {time.strftime('%H:%M:%S')}")
+
+    def build_snapshot(self, finish, keep_blobs=False):
+        """Serialize the project a slice per event-loop tick, then call finish(builder).
+
+        Returns the job to keep while it runs. Edits made meanwhile end up
+        in the snapshot (see SnapshotBuilder).
+        """
+        self.pause_gc()
+        job = (SnapshotBuilder(self.project, keep_blobs), finish)
+        wx.CallAfter(self.continue_snapshot, job)
+        return job
+
+    def pause_gc(self):
+        # A snapshot adds about as many objects as the plan has, which sets
+        # off full collections that scan the whole plan for nothing: the
+        # snapshot has no cycles and its worker frees it. Collection resumes
+        # once every pending snapshot is written (see resume_gc()).
+        self.gc_pauses += 1
+        gc.disable()
+
+    def resume_gc(self):
+        self.gc_pauses -= 1
+        if not self.gc_pauses:
+            gc.enable()
+
+    def continue_snapshot(self, job, deadline=None):
+        if job is not self.save_snapshot and job is not self.autosave_snapshot:
+            return  # finished or dropped meanwhile
+        builder, finish = job
+        if deadline is None:
+            deadline = time.perf_counter() + SNAPSHOT_SLICE_MS / 1000
+        while not builder.step():
+            if time.perf_counter() >= deadline:
+                wx.CallAfter(self.continue_snapshot, job)
+                return
+        finish(builder)
+
+    def start_save(self, pathname):
+        if self.save_worker is not None or self.save_snapshot is not None:
+            wx.MessageBox("A save is already in progress.", "Busy", wx.OK | wx.ICON_INFORMATION)
+            return
+        self.SetStatusText(f"Saving {os.path.basename(pathname)}...")
+        self.save_snapshot = self.build_snapshot(lambda builder: self.write_snapshot(builder, pathname))
 
-                wx.MessageBox(f"Project saved successfully to:\n{pathname}",
-                              "Save Successful", wx.OK | wx.ICON_INFORMATION)
-                self.SetStatusText(f"Saved: {os.path.basename(pathname)}")
+    def write_snapshot(self, builder, pathname):
+        self.save_snapshot = None
+        snapshot, write = builder.project_dict(), save_json_atomic
+        try:
+            if pathname.lower().endswith('.wfb'):
+                write = write_binary
+            elif self.journal is not None and os.path.abspath(self.journal.path) == os.path.abspath(pathname):
+                snapshot = self.journal.checkpoint(snapshot)
+            else:
+                # The current file keeps its journal until the new one is written.
+                self.save_journal = Journal.start(self.project, pathname)
+                snapshot = self.save_journal.snapshot(snapshot)
+        except OSError as e:
+            self.resume_gc()
+            self.save_failed(e)
+            return
+        project, stamp = self.project, snapshot.get("journal")
+        self.save_worker = ProjectSaveWorker(
+            snapshot, pathname,
+            lambda pathname, error: wx.CallAfter(self.finish_save, project, pathname, error, stamp), write)
+        self.save_worker.start()
+
+    def compact_journal(self):
+        """Fold the journal into a new checkpoint of the project file, in the background."""
+        journal = self.journal
+        self.save_snapshot = self.build_snapshot(lambda builder: self.write_checkpoint(journal, builder))
+
+    def write_checkpoint(self, journal, builder):
+        self.save_snapshot = None
+        if journal is not self.journal:
+            # Saved elsewhere meanwhile; that file has its own journal, or none.
+            builder.detach()
+            self.resume_gc()
+            return
+        try:
+            snapshot = journal.checkpoint(builder.project_dict())
+        except OSError as e:
+            self.resume_gc()
+            self.SetStatusText(f"Journal compaction failed: {e}")
+            return
+        seq = snapshot["journal"]["seq"]
+        self.save_worker = ProjectSaveWorker(
+            snapshot, journal.path,
+            lambda pathname, error: wx.CallAfter(self.finish_compaction, journal, seq, error))
+        self.save_worker.start()
+
+    def finish_compaction(self, journal, seq, error):
+        self.save_worker = None
+        self.resume_gc()
+        if error:
+            self.SetStatusText(f"Journal compaction failed: {error}")
+        else:
+            journal.discard_segments(seq)
 
-            except Exception as e:
-                wx.MessageBox(f"Error saving file:\n{str(e)}",
-                              "Save Error", wx.OK | wx.ICON_ERROR)
+    def save_failed(self, error):
+        wx.MessageBox(f"Error saving file:\n{error}",
+                      "Save Error", wx.OK | wx.ICON_ERROR)
+        self.SetStatusText("Save failed.")
 
-        dlg.Destroy()
+    def finish_save(self, project, pathname, error, stamp):
+        self.save_worker = None
+        self.resume_gc()
+        journal, self.save_journal = self.save_journal, None
+        if error:
+            if journal is not None:
+                # The project stays with the file it came from and that file's journal.
+                journal.close()
+                journal.discard_segments(journal.seq + 1)
+            self.save_failed(error)
+        elif project is not self.project:
+            # Another project was opened meanwhile; its store and journal stay as they are.
+            if journal is not None:
+                journal.close()
+            self.SetStatusText(f"Saved: {os.path.basename(pathname)} at {time.strftime('%H:%M:%S')}")
+        else:
+            if self.store is not None:
+                # The project now lives in the saved file; stop writing to the database.
+                self.store.close()
+                self.store = None
+            if journal is not None or stamp is None:
+                # Saved to another file, with its own journal or, as a .wfb archive, none.
+                if self.journal is not None:
+                    self.journal.close()
+                self.journal = journal
+            elif self.journal is not None and self.journal.id == stamp["id"]:
+                self.journal.discard_segments(stamp["seq"])
+            self.project_path = pathname
+            self.edited = False
+            self.SetStatusText(f"Saved: {os.path.basename(pathname)} at {time.strftime('%H:%M:%S')}")
 
     def on_open_project(self, event):
         # Create a proper file open dialog
@@ -449,31 +1037,90 @@ class MainFrame(wx.Frame):
             message="Open project file",
             defaultDir=os.getcwd(),
             defaultFile="",
-            wildcard="JSON files (*.json)|*.json|All files (*.*)|*.*",
+            wildcard=PROJECT_WILDCARD,
             style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST
         )
 
         if dlg.ShowModal() == wx.ID_OK:
-            # Get the file path
             pathname = dlg.GetPath()
+            if pathname.lower().endswith('.wfdb'):
+                self.open_database(pathname)
+            elif pathname.lower().endswith('.wfb'):
+                self.open_binary(pathname)
+            else:
+                self.start_load(pathname)
 
-            try:
-                # Load the JSON file
-                with open(pathname, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                # Load the project data
-                self.load_project_data(data, None)
+        dlg.Destroy()
 
-                wx.MessageBox(f"Project loaded successfully:\n{os.path.basename(pathname)}",
-                              "Load Successful", wx.OK | wx.ICON_INFORMATION)
-                self.SetStatusText(f"Loaded: {os.path.basename(pathname)}")
+    def open_database(self, pathname):
+        # Only the phase list is read here; each phase loads when selected.
+        try:
+            store = SqlStore.open(pathname)
+        except (ValueError, sqlite3.Error) as e:
+            wx.MessageBox(f"Error loading file:\n{e}", "Load Error", wx.OK | wx.ICON_ERROR)
+            self.SetStatusText("Load failed.")
+            return
+        self.set_project(store.project)
+        self.store = store
+        self.project_path = pathname
+        self.SetStatusText(f"Loaded: {os.path.basename(pathname)}")
 
-            except Exception as e:
-                wx.MessageBox(f"Error loading file:\n{str(e)}",
-                              "Load Error", wx.OK | wx.ICON_ERROR)
+    def open_binary(self, pathname):
+        # Maps the file and reads the phase index; phases decode when selected.
+        try:
+            project = load_binary(pathname)
+        except (OSError, ValueError) as e:
+            wx.MessageBox(f"Error loading file:\n{e}", "Load Error", wx.OK | wx.ICON_ERROR)
+            self.SetStatusText("Load failed.")
+            return
+        self.set_project(project)
+        self.project_path = pathname
+        self.SetStatusText(f"Loaded: {os.path.basename(pathname)}")
 
-        dlg.Destroy()
+    def start_load(self, pathname):
+        if self.load_worker is not None:
+            wx.MessageBox("A project is already being loaded.", "Busy", wx.OK | wx.ICON_INFORMATION)
+            return
+        self.SetStatusText(f"Loading {os.path.basename(pathname)}...")
+        self.btn_cancel_load.SetRect(self.status_bar.GetFieldRect(1))
+        self.btn_cancel_load.Show()
+        self.load_worker = ProjectLoadWorker(pathname, self.on_load_progress, self.on_load_complete, open_journal)
+        self.load_worker.start()
+
+    def on_cancel_load(self, event):
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+            self.SetStatusText("Cancelling load...")
+
+    def on_status_bar_size(self, event):
+        self.btn_cancel_load.SetRect(self.status_bar.GetFieldRect(1))
+        event.Skip()
+
+    def on_load_progress(self, done, total):
+        wx.CallAfter(self.SetStatusText, f"Loading... {done / 2**20:.0f} of {total / 2**20:.0f} MB")
+
+    def on_load_complete(self, journal, error):
+        wx.CallAfter(self.finish_load, journal, error)
+
+    def finish_load(self, journal, error):
+        pathname = self.load_worker.path
+        self.load_worker = None
+        self.btn_cancel_load.Hide()
+        view, self.restore_view = self.restore_view, None
+        if error:
+            wx.MessageBox(f"Error loading file:\n{error}",
+                          "Load Error", wx.OK | wx.ICON_ERROR)
+            self.SetStatusText("Load failed.")
+        elif journal is None:
+            self.SetStatusText("Load cancelled.")
+        else:
+            self.set_project(journal.project, view["phase"] if view else 0)
+            self.journal = journal
+            self.project_path = pathname
+            if view:
+                wx.CallAfter(self.restore_list_position, view.get("top_row", 0), view.get("selected_id"))
+            recovered = f" (recovered {journal.recovered} unsaved changes)" if journal.recovered else ""
+            self.SetStatusText(f"Loaded: {os.path.basename(pathname)}{recovered}")
 
     def on_generate(self, event):
         dlg = wx.TextEntryDialog(self, 'Describe your project (e.g., "software app", "house construction"):',
@@ -499,59 +1146,223 @@ class MainFrame(wx.Frame):
             wx.MessageBox("No data received.", "Error", wx.ICON_ERROR)
             return
 
-        self.project = Project(data.get('name', 'Untitled'), data.get('description', ''))
-        self.SetTitle(f"{self.project.name} - WaterfallFlow (Dark Mode)")
-
-        for p_data in data.get('phases', []):
-            phase = Phase(p_data.get('name'), p_data.get('description'))
-            for t_data in p_data.get('tasks', []):
-                dur = t_data.get('durationDays', t_data.get('duration', 1))
-                t = Task(
-                    title=t_data.get('title', 'Untitled Task'),
-                    duration=dur,
-                    assignee=t_data.get('assignee', 'Unassigned'),
-                    completed=t_data.get('completed', False)
-                )
-                for st_data in t_data.get('subtasks', []):
-                    sdur = st_data.get('durationDays', st_data.get('duration', 1))
-                    st = Subtask(
-                        title=st_data.get('title', 'Untitled Subtask'),
-                        duration=sdur,
-                        completed=st_data.get('completed', False)
-                    )
-                    t.subtasks.append(st)
-                phase.tasks.append(t)
-            self.project.phases.append(phase)
+        self.set_project(build_project(data))
+        self.SetStatusText("Project loaded.")
 
+    def set_project(self, project, phase_index=0):
+        self.watch_project(project)
+        self.project_path = None
+        self.edited = False
+        self.SetTitle(f"{self.project.name} - WaterfallFlow (Dark Mode)")
+        self.Freeze()
         self.refresh_tree()
         if self.project.phases:
-            first_item = self.tree.GetFirstChild(self.root)[0]
-            if first_item.IsOk():
-                self.tree.SelectItem(first_item)
+            phase = self.project.phases[min(max(phase_index, 0), len(self.project.phases) - 1)]
+            self.tree.SelectItem(self.tree_items[phase])
         else:
             self.lbl_phase_name.SetLabel(self.project.name)
             self.lbl_phase_desc.SetLabel(self.project.description)
-            self.task_list.DeleteAllItems()
-            self.row_map = {}
-        self.SetStatusText("Project loaded.")
+            self.current_phase = None
+            self.update_header_stats()
+            self.task_model.set_phase(None)
+        self.Thaw()
 
     def refresh_tree(self):
+        # Only phase nodes are created here; tasks and subtasks are added
+        # when their parent is first expanded (see on_tree_expanding).
+        self.tree.Freeze()
         self.tree.DeleteAllItems()
+        self.tree_items = {}
         self.root = self.tree.AddRoot("Project")
+        self.tree_items[self.project] = self.root
         for phase in self.project.phases:
-            self.tree.AppendItem(self.root, phase.name, data=phase)
-        self.tree.ExpandAll()
+            # Phases that are not loaded yet are assumed to have tasks.
+            self.add_tree_node(self.root, phase, self.tree_label(phase), phase.loader is not None or bool(phase.tasks))
+        self.tree.Thaw()
+
+    def add_tree_node(self, parent_item, obj, label, has_children):
+        item = self.tree.AppendItem(parent_item, label, data=obj)
+        if has_children:
+            self.tree.SetItemHasChildren(item, True)
+        self.tree_items[obj] = item
+        return item
+
+    def on_tree_expanding(self, event):
+        item = event.GetItem()
+        if not item.IsOk() or self.tree.GetChildrenCount(item, False):
+            return
+        obj = self.tree.GetItemData(item)
+        self.tree.Freeze()
+        if isinstance(obj, Phase):
+            for task in obj.tasks:
+                self.add_tree_node(item, task, self.tree_label(task), bool(task.subtasks))
+        elif isinstance(obj, Task):
+            for st in obj.subtasks:
+                self.add_tree_node(item, st, self.tree_label(st), False)
+        self.tree.Thaw()
+        if not self.tree.GetChildrenCount(item, False):
+            self.tree.SetItemHasChildren(item, False)
+
+    def tree_child_added(self, parent_obj, obj, label):
+        parent_item = self.tree_items.get(parent_obj)
+        if parent_item is None:
+            return
+        if parent_obj is self.project or self.tree.GetChildrenCount(parent_item, False):
+            self.add_tree_node(parent_item, obj, label, False)
+        else:
+            # Not populated yet; the child shows up on first expansion.
+            self.tree.SetItemHasChildren(parent_item, True)
+
+    def tree_child_removed(self, obj):
+        item = self.tree_items.pop(obj, None)
+        if item is None:
+            return
+        for child in getattr(obj, 'tasks', ()):
+            self.tree_items.pop(child, None)
+            for st in child.subtasks:
+                self.tree_items.pop(st, None)
+        for st in getattr(obj, 'subtasks', ()):
+            self.tree_items.pop(st, None)
+        parent_item = self.tree.GetItemParent(item)
+        self.tree.Delete(item)
+        if not self.tree.GetChildrenCount(parent_item, False):
+            self.tree.SetItemHasChildren(parent_item, False)
+
+    def tree_label_changed(self, obj, label):
+        item = self.tree_items.get(obj)
+        if item is not None:
+            self.tree.SetItemText(item, label)
+
+    def tree_label(self, obj):
+        """Tree text for a node; phases and tasks with subtasks show progress."""
+        if isinstance(obj, Phase):
+            return f"{obj.name}  ({self.rollups.of(obj).percent:.0f}%)"
+        if isinstance(obj, Task) and obj.subtasks:
+            return f"{obj.title}  ({self.rollups.of(obj).percent:.0f}%)"
+        return obj.title
+
+    def update_rollup_labels(self, event):
+        """Refresh the progress shown for the node whose totals `event` changed."""
+        node = event.node
+        if event.kind == CHANGED:
+            if event.field not in ("duration", "completed"):
+                return
+            node = node.parent
+        if isinstance(node, (Phase, Task)):
+            self.tree_label_changed(node, self.tree_label(node))
+        self.update_header_stats()
+
+    def update_header_stats(self):
+        node = self.current_phase or self.project
+        if node is None:
+            self.lbl_phase_stats.SetLabel("")
+            return
+        totals = self.rollups.of(node)
+        self.lbl_phase_stats.SetLabel(
+            f"{totals.done:g} of {totals.total:g} days done ({totals.percent:.0f}%)   ·   "
+            f"{totals.open} open, {totals.closed} completed tasks")
+
+    def apply_model_changes(self, structural, changes):
+        """Apply one coalesced batch of ChangeEvents (see UpdateCoalescer)."""
+        self.edited = True
+        if len(structural) == 1:
+            self.on_model_changed(structural[0])
+        elif structural:
+            # Positions recorded in earlier events may be stale by now, so
+            # replay only the identity-based tree updates and rebuild the
+            # list index once.
+            for event in structural:
+                self.update_tree_structure(event)
+                self.update_rollup_labels(event)
+            self.refresh_task_list()
+        for event in changes:
+            self.on_model_changed(event)
+        if self.schedule is not None and self.schedule.dirty:
+            self.update_schedule()
+        elif self.schedule is not None and any(
+                event.field in ("assignee", "start_date", "calendars") for event in changes):
+            self.show_schedule(assignments=True)
+        if self.store is not None:
+            # One transaction per coalesced batch of edits.
+            self.store.commit()
+        if (self.journal is not None and self.save_worker is None and self.save_snapshot is None
+                and self.journal.should_compact()):
+            self.compact_journal()
+
+    def on_model_changed(self, event):
+        """Apply a single model ChangeEvent to the tree and the task list."""
+        node = event.node
+        self.update_rollup_labels(event)
+        if event.kind == CHANGED:
+            if isinstance(node, Phase):
+                self.tree_label_changed(node, self.tree_label(node))
+                if node is self.current_phase:
+                    self.lbl_phase_name.SetLabel(node.name)
+                    self.lbl_phase_desc.SetLabel(node.description)
+            elif isinstance(node, (Task, Subtask)):
+                if event.field == "title":
+                    self.tree_label_changed(node, self.tree_label(node))
+                task = node if isinstance(node, Task) else node.parent
+                if event.field == "delay":
+                    columns = self.task_model.SCHEDULE_COLUMNS
+                else:
+                    # Fields without a column of their own (the estimate) leave the row as it is.
+                    column = self.task_model.FIELD_COLUMNS.get(event.field)
+                    columns = () if column is None else (column,)
+                if columns and task is not None and task.parent is self.current_phase:
+                    slot = self.task_model.slot_of(task)
+                    row = self.task_model.row_of(slot, -1 if node is task else task.subtasks.index(node))
+                    for column in columns:
+                        self.task_model.RowValueChanged(row, column)
+            return
+
+        self.update_tree_structure(event)
+        if node is self.current_phase:
+            if event.kind == REMOVED:
+                self.task_model.task_removed(self.task_model.slot_of(event.old))
+            elif event.index == len(node.tasks) - 1:
+                self.task_model.task_appended(event.new)
+            else:
+                self.refresh_task_list()
+        elif isinstance(node, Task) and node.parent is self.current_phase:
+            slot = self.task_model.slot_of(node)
+            if event.kind == ADDED:
+                self.task_model.subtask_inserted(slot, event.index)
+            else:
+                self.task_model.subtask_removed(slot, event.index)
+
+    def update_tree_structure(self, event):
+        if event.kind == ADDED:
+            child = event.new
+            self.tree_child_added(event.node, child, self.tree_label(child))
+        else:
+            self.tree_child_removed(event.old)
+            if event.old is self.current_phase:
+                self.current_phase = None
+                self.task_model.set_phase(None)
 
     def on_phase_selected(self, event):
         item = event.GetItem()
         if not item.IsOk():
             return
+        self.updates.flush()
         data = self.tree.GetItemData(item)
+        task = subtask = None
+        if isinstance(data, Subtask):
+            subtask, item = data, self.tree.GetItemParent(item)
+            data = self.tree.GetItemData(item)
+        if isinstance(data, Task):
+            task, item = data, self.tree.GetItemParent(item)
+            data = self.tree.GetItemData(item)
         if isinstance(data, Phase):
-            self.current_phase = data
-            self.lbl_phase_name.SetLabel(data.name)
-            self.lbl_phase_desc.SetLabel(data.description)
-            self.refresh_task_list()
+            if data is not self.current_phase:
+                self.current_phase = data
+                self.lbl_phase_name.SetLabel(data.name)
+                self.lbl_phase_desc.SetLabel(data.description)
+                self.update_header_stats()
+                self.refresh_task_list()
+            if task is not None:
+                self.select_task_row(task, subtask)
         else:
             self.current_phase = None
             if self.project:
@@ -560,42 +1371,33 @@ class MainFrame(wx.Frame):
             else:
                 self.lbl_phase_name.SetLabel("No Project")
                 self.lbl_phase_desc.SetLabel("")
-            self.task_list.DeleteAllItems()
-            self.row_map = {}
+            self.update_header_stats()
+            self.task_model.set_phase(None)
+
+    def select_task_row(self, task, subtask=None):
+        slot = self.task_model.slot_of(task)
+        sub_index = task.subtasks.index(subtask) if subtask is not None else -1
+        item = self.task_model.GetItem(self.task_model.row_of(slot, sub_index))
+        self.task_list.Select(item)
+        self.task_list.EnsureVisible(item)
+        self.on_list_selection(None)
 
     def refresh_task_list(self):
-        self.task_list.DeleteAllItems()
-        self.row_map = {}
-        idx = 0
-        if not self.current_phase:
-            return
-        for task in self.current_phase.tasks:
-            self.task_list.AppendItem([task.completed, task.title, str(task.duration), task.assignee])
-            self.row_map[idx] = {'type': 'task', 'obj': task}
-            idx += 1
-            for st in task.subtasks:
-                self.task_list.AppendItem([st.completed, f"    ↳ {st.title}", str(st.duration), ""])
-                self.row_map[idx] = {'type': 'subtask', 'obj': st, 'parent': task}
-                idx += 1
+        self.task_model.set_phase(self.current_phase)
 
-    def on_item_value_changed(self, event):
-        item = event.GetItem()
+    def get_selected_ref(self):
+        """Return the RowRef of the selected row, or None."""
+        self.updates.flush()
+        item = self.task_list.GetSelection()
         if not item.IsOk():
-            return
-        row = self.task_list.ItemToRow(item)
-        if row == wx.NOT_FOUND or row not in self.row_map:
-            return
-        is_checked = self.task_list.GetValue(row, 0)
-        obj = self.row_map[row]['obj']
-        obj.completed = bool(is_checked)
+            return None
+        return self.task_model.ref(self.task_model.GetRow(item))
 
     def on_list_selection(self, event):
-        row = self.task_list.GetSelectedRow()
-        has_sel = (row != wx.NOT_FOUND and row in self.row_map)
-        self.btn_delete.Enable(has_sel)
-        if has_sel:
-            item_data = self.row_map[row]
-            if item_data['type'] == 'task':
+        ref = self.get_selected_ref()
+        self.btn_delete.Enable(ref is not None)
+        if ref is not None:
+            if ref.subtask is None:
                 self.btn_add_sub.Enable()
                 self.btn_add_sub.SetLabel("+ Sub")
             else:
@@ -605,20 +1407,15 @@ class MainFrame(wx.Frame):
             self.btn_add_sub.SetLabel("+ Subtask")
 
     def on_list_double_click(self, event):
-        row = self.task_list.GetSelectedRow()
-        if row == wx.NOT_FOUND or row not in self.row_map:
+        ref = self.get_selected_ref()
+        if ref is None:
             return
-        item = self.row_map[row]
-        obj = item['obj']
+        obj = ref.subtask or ref.task
         dlg = wx.TextEntryDialog(self, 'Rename:', 'Edit Item', obj.title)
         if dlg.ShowModal() == wx.ID_OK:
             new_title = dlg.GetValue().strip()
             if new_title:
                 obj.title = new_title
-                if item['type'] == 'task':
-                    self.task_list.SetValue(new_title, row, 1)
-                else:
-                    self.task_list.SetValue(f"    ↳ {new_title}", row, 1)
         dlg.Destroy()
 
     def on_add_task(self, event):
@@ -630,51 +1427,49 @@ class MainFrame(wx.Frame):
             wx.MessageBox("Task title cannot be empty.", "Invalid Input", wx.OK | wx.ICON_WARNING)
             return
         t = Task(title, self.spin_dur.GetValue(), self.txt_assignee.GetValue().strip() or "Unassigned")
-        self.current_phase.tasks.append(t)
+        self.current_phase.add_task(t)
         self.txt_title.SetValue("")
         self.spin_dur.SetValue(1)
         self.txt_assignee.SetValue("")
-        self.refresh_task_list()
 
     def on_add_subtask(self, event):
-        row = self.task_list.GetSelectedRow()
-        if row == wx.NOT_FOUND or row not in self.row_map:
+        ref = self.get_selected_ref()
+        if ref is None:
             return
-        item = self.row_map[row]
-        if item['type'] != 'task':
+        if ref.subtask is not None:
             wx.MessageBox("Please select a main task to add a subtask.", "Invalid Selection", wx.OK | wx.ICON_WARNING)
             return
         title = self.txt_title.GetValue().strip()
         if not title:
             wx.MessageBox("Subtask title cannot be empty.", "Invalid Input", wx.OK | wx.ICON_WARNING)
             return
-        parent_task = item['obj']
+        parent_task = ref.task
         st = Subtask(title, self.spin_dur.GetValue())
-        parent_task.subtasks.append(st)
+        parent_task.add_subtask(st)
         self.txt_title.SetValue("")
         self.spin_dur.SetValue(1)
-        self.refresh_task_list()
 
     def on_delete_item(self, event):
-        row = self.task_list.GetSelectedRow()
-        if row == wx.NOT_FOUND or row not in self.row_map:
+        ref = self.get_selected_ref()
+        if ref is None:
             return
         if wx.MessageBox("Are you sure you want to delete this item?", "Confirm Delete",
                          wx.YES_NO | wx.NO_DEFAULT | wx.ICON_QUESTION) != wx.YES:
             return
-        item = self.row_map[row]
-        if item['type'] == 'task':
-            if item['obj'] in self.current_phase.tasks:
-                self.current_phase.tasks.remove(item['obj'])
-        elif item['type'] == 'subtask':
-            parent = item['parent']
-            if item['obj'] in parent.subtasks:
-                parent.subtasks.remove(item['obj'])
-        self.refresh_task_list()
+        if ref.subtask is None:
+            self.current_phase.remove_task(ref.task, self.task_model.task_index(ref.slot))
+        else:
+            ref.task.remove_subtask(ref.subtask, ref.sub_index)
+        self.on_list_selection(None)
 
 
 if __name__ == '__main__':
+    verbose = '--startup-report' in sys.argv or os.environ.get('WATERFALLFLOW_STARTUP_REPORT') == '1'
+    startup = StartupTimer(STARTUP_T0, verbose)
+    startup.mark("import")
     app = wx.App()
-    frame = MainFrame()
+    app.SetAppName("WaterfallFlow")
+    frame = MainFrame(startup)
+    startup.mark("frame build")
     frame.Show()
     app.MainLoop()
\ No newline at end of file
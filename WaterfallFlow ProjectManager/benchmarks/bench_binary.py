@@ -0,0 +1,77 @@
+"""Size and speed of binary (.wfb) project files compared with JSON.
+
+Writes a plan of N tasks split into phases of --phase-size tasks (see
+bench_schedule.make_plan, one subtask per task) as JSON and as .wfb, then
+times opening the archive (header and phase index only), decoding one
+phase from the mapping as the UI does when it is selected, and reading
+every phase, against loading the JSON file.
+
+    python benchmarks/bench_binary.py [--tasks 1000000] [--phase-size 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_schedule import make_plan
+from waterfallflow import load_binary, load_project, save_json_atomic, write_binary
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - t0, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--phase-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    data = make_plan(args.tasks, links=1)
+    tasks = data["phases"][0]["tasks"]
+    for task in tasks:
+        task["assignee"] = "Backend Team"
+        task["subtasks"].append({"id": task["id"] + args.tasks, "title": "Review", "durationDays": 1,
+                                 "completed": False})
+    data["phases"] = [{"id": 2 * args.tasks + 1 + n, "name": f"Phase {n + 1}", "description": "",
+                       "tasks": tasks[i:i + args.phase_size]}
+                      for n, i in enumerate(range(0, len(tasks), args.phase_size))]
+    data["nextId"] = 2 * args.tasks + len(data["phases"]) + 1
+    del tasks
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "bench.json")
+        binary_path = os.path.join(tmp, "bench.wfb")
+        json_write, _ = timed(save_json_atomic, json_path, data)
+        binary_write, _ = timed(write_binary, binary_path, data)
+        del data
+
+        open_time, project = timed(load_binary, binary_path)
+        phase = random.Random(args.seed).choice(project.phases)
+        phase_time, _ = timed(lambda: phase.tasks)
+        full_binary, _ = timed(lambda: [p.tasks for p in project.phases])
+        full_json, reference = timed(load_project, json_path)
+        assert project.to_dict() == reference.to_dict()
+
+        print(f"{args.tasks} tasks + {args.tasks} subtasks in {len(project.phases)} phases")
+        print(f"  {'':<26} {'JSON':>10} {'.wfb':>10}")
+        print(f"  {'file size (MiB)':<26} {os.path.getsize(json_path) / 2**20:10.1f} "
+              f"{os.path.getsize(binary_path) / 2**20:10.1f}")
+        print(f"  {'write (s)':<26} {json_write:10.2f} {binary_write:10.2f}")
+        print(f"  {'load everything (s)':<26} {full_json:10.2f} {open_time + full_binary:10.2f}")
+        print(f"  open archive              {open_time * 1000:8.1f} ms")
+        print(f"  show one phase            {phase_time * 1000:8.1f} ms ({len(phase.tasks)} tasks)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
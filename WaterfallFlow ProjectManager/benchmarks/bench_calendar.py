@@ -0,0 +1,68 @@
+"""Date recomputation speed after a holiday-calendar change.
+
+Schedules a plan of N tasks (see bench_schedule.make_plan) spread over a
+few assignees with their own calendars, then times ProjectDates.refresh()
+after adding holidays, i.e. redoing the vectorised offset -> date mapping
+for every activity.
+
+    python benchmarks/bench_calendar.py [--tasks 500000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_schedule import make_plan
+from waterfallflow import Schedule, build_project
+from waterfallflow.workdays import ProjectDates
+
+ASSIGNEES = ("Backend Team", "Frontend Team", "QA", "DevOps")
+CALENDARS = {
+    "default": {"weekmask": "1111100", "holidays": ["2026-12-25", "2027-01-01"]},
+    "QA": {"weekmask": "1111110", "holidays": []},
+    "DevOps": {"weekmask": "1111111", "holidays": []},
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    data = make_plan(args.tasks, window=20, links=1)
+    for i, task in enumerate(data["phases"][0]["tasks"]):
+        task["assignee"] = ASSIGNEES[i % len(ASSIGNEES)]
+    data["startDate"] = "2026-11-02"
+    data["calendars"] = CALENDARS
+    project = build_project(data)
+    schedule = Schedule(project)
+
+    t0 = time.perf_counter()
+    dates = ProjectDates(project, schedule)
+    first = time.perf_counter() - t0
+
+    best = float("inf")
+    for year in range(2027, 2027 + args.repeat):
+        calendars = dict(project.calendars)
+        default = dict(calendars["default"])
+        default["holidays"] = default["holidays"] + [f"{year}-07-04", f"{year}-12-24"]
+        calendars["default"] = default
+        project.calendars = calendars
+        t0 = time.perf_counter()
+        dates.refresh()
+        best = min(best, time.perf_counter() - t0)
+
+    print(f"{len(schedule.nodes)} activities, {len(dates.calendars)} calendars, "
+          f"finish {dates.project_finish()}")
+    print(f"  first mapping (reads assignments)  {first * 1000:8.1f} ms")
+    print(f"  refresh after holiday change       {best * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
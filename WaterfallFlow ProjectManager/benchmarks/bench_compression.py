@@ -0,0 +1,67 @@
+"""Size and save/load time of a large project per compression codec.
+
+Builds a plan of N tasks (see bench_schedule.make_plan) with the usual
+repetition of real plans -- a handful of assignees, the same few subtask
+titles -- and saves and loads it as plain JSON and through every codec
+in persistence.CODECS that this Python supports (.zst needs 3.14+).
+
+    python benchmarks/bench_compression.py [--tasks 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_schedule import make_plan
+from waterfallflow import AVAILABLE_CODECS, build_project, load_project, save_json_atomic
+from waterfallflow.persistence import zstd
+
+ASSIGNEES = ("Backend Team", "Frontend Team", "QA", "DevOps", "Product")
+SUBTASKS = ("Design review", "Implementation", "Code review", "Testing")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    data = make_plan(args.tasks, seed=args.seed)
+    for task in data["phases"][0]["tasks"]:
+        task["assignee"] = rng.choice(ASSIGNEES)
+        task["subtasks"] = [{"title": title, "durationDays": rng.randint(1, 3), "completed": rng.random() < 0.3}
+                            for title in rng.sample(SUBTASKS, rng.randint(0, 3))]
+    data = build_project(data).to_dict()
+    suffixes = [""] + list(AVAILABLE_CODECS)
+
+    print(f"{args.tasks} tasks")
+    print(f"  {'file':<14} {'size MiB':>9} {'ratio':>7} {'save s':>8} {'load s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = None
+        for suffix in suffixes:
+            path = os.path.join(tmp, "bench.json" + suffix)
+            t0 = time.perf_counter()
+            save_json_atomic(path, data)
+            save_time = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            project = load_project(path)
+            load_time = time.perf_counter() - t0
+            assert project.to_dict() == data
+            size = os.path.getsize(path)
+            plain = plain or size
+            print(f"  {'.json' + suffix:<14} {size / 2**20:9.1f} {plain / size:6.1f}x {save_time:8.2f} {load_time:8.2f}")
+            os.unlink(path)
+    if zstd is None:
+        print("  (.json.zst skipped: needs compression.zstd, Python 3.14+)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
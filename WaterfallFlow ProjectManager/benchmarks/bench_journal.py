@@ -0,0 +1,74 @@
+"""Cost of journaling edits compared with rewriting the JSON file.
+
+Saves a plan of N tasks (see bench_schedule.make_plan) as JSON, opens it
+with a Journal and times random single-field edits as they are recorded,
+the group write + fsync of the whole batch, replaying the journal on
+reopen and a full save_json_atomic() of the same plan for comparison.
+
+    python benchmarks/bench_journal.py [--tasks 200000] [--edits 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_schedule import make_plan
+from waterfallflow import open_journal, save_json_atomic
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200000)
+    parser.add_argument("--edits", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.json")
+        save_json_atomic(path, make_plan(args.tasks))
+        journal = open_journal(path)
+        project = journal.project
+        tasks = project.phases[0].tasks
+        rng = random.Random(args.seed)
+
+        t0 = time.perf_counter()
+        for n in range(args.edits):
+            task = rng.choice(tasks)
+            if n % 2:
+                task.completed = not task.completed
+            else:
+                task.duration = task.duration % 10 + 1
+        record_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        journal.sync()
+        sync_time = time.perf_counter() - t0
+        size = journal.size
+        journal.close()
+
+        t0 = time.perf_counter()
+        save_json_atomic(path + ".full", project.to_dict())
+        full_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        reopened = open_journal(path)
+        open_time = time.perf_counter() - t0
+        reopened.close()
+        assert reopened.recovered == args.edits
+        assert reopened.project.to_dict() == project.to_dict()
+
+    print(f"{args.tasks} tasks, {args.edits} edits, journal {size / 2**10:.0f} KiB")
+    print(f"  record one edit          {record_time / args.edits * 1e6:8.2f} us")
+    print(f"  write + fsync the batch  {sync_time * 1000:8.1f} ms")
+    print(f"  full JSON save           {full_time * 1000:8.1f} ms")
+    print(f"  reopen with replay       {open_time * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Peak memory and time of loading a large JSON project.
+
+Saves a plan of N tasks (see bench_schedule.make_plan, one subtask per
+task) and loads it twice: json.load() followed by build_project(), and
+the streaming read_project() behind load_project(). Peak memory is
+measured with tracemalloc in a separate, untimed run and reported
+against the size of the resulting model.
+
+    python benchmarks/bench_load.py [--tasks 200000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_schedule import make_plan
+from waterfallflow import build_project, load_project, save_json_atomic
+
+
+def load_whole(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return build_project(json.load(f))
+
+
+def measure(load, path):
+    """(seconds, peak bytes, bytes kept) of load(path)."""
+    gc.collect()
+    t0 = time.perf_counter()
+    load(path)
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    tracemalloc.start()
+    try:
+        project = load(path)
+        kept, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del project
+    return elapsed, peak, kept
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    data = make_plan(args.tasks)
+    for task in data["phases"][0]["tasks"]:
+        task["subtasks"].append({"title": "Review", "durationDays": 1, "completed": False})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.json")
+        save_json_atomic(path, data)
+        del data
+        size = os.path.getsize(path)
+        print(f"{args.tasks} tasks, file {size / 2**20:.0f} MiB")
+        print(f"  {'loader':<28} {'time s':>7} {'peak MiB':>9} {'model MiB':>10} {'peak/model':>11}")
+        for name, load in (("json.load + build_project", load_whole), ("load_project (streaming)", load_project)):
+            elapsed, peak, kept = measure(load, path)
+            print(f"  {name:<28} {elapsed:7.2f} {peak / 2**20:9.0f} {kept / 2**20:10.0f} {peak / kept:11.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
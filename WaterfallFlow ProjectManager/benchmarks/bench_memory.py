@@ -0,0 +1,77 @@
+"""Memory footprint of the waterfallflow model.
+
+Builds plans of 10k, 100k and 1M nodes (half tasks, half subtasks) and
+reports the bytes allocated per Task and per Subtask, measured with
+tracemalloc. Titles and assignees are shared strings so the figures cover
+the model objects themselves rather than their text.
+
+    python benchmarks/bench_memory.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from waterfallflow import Phase, Subtask, Task
+
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+
+
+def measure(build):
+    """Return the bytes still allocated by build() once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        keep = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del keep
+    return after - before
+
+
+def build_tasks(count, subtasks_per_task):
+    phase = Phase("Benchmark", "")
+    tasks = phase.tasks
+    for _ in range(count):
+        task = Task("Task", 3, "Backend Team")
+        for _ in range(subtasks_per_task):
+            task.add_subtask(Subtask("Subtask", 1))
+        phase.add_task(task)
+    return phase, tasks
+
+
+def run(nodes):
+    tasks = nodes // 2
+    task_bytes = measure(lambda: build_tasks(tasks, 0))
+    total_bytes = measure(lambda: build_tasks(tasks, 1))
+    return {
+        "nodes": tasks * 2,
+        "total": total_bytes,
+        "per_task": task_bytes / tasks,
+        "per_subtask": (total_bytes - task_bytes) / tasks,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="node counts to measure")
+    args = parser.parse_args(argv)
+
+    print(f"{'nodes':>10}  {'total MiB':>10}  {'B/task':>8}  {'B/subtask':>10}")
+    for nodes in args.sizes:
+        result = run(nodes)
+        print(f"{result['nodes']:>10}  {result['total'] / 2 ** 20:>10.1f}  "
+              f"{result['per_task']:>8.0f}  {result['per_subtask']:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
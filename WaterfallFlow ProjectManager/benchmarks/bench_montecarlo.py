@@ -0,0 +1,54 @@
+"""Monte Carlo schedule simulation speed.
+
+Gives every task of a plan of N tasks (see bench_schedule.make_plan) a
+three-point estimate around its duration and times simulate() for the
+requested iterations, first in this process and then over a process pool.
+
+    python benchmarks/bench_montecarlo.py [--tasks 5000] [--iterations 100000] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_schedule import make_plan
+from waterfallflow import Schedule, build_project
+from waterfallflow.montecarlo import simulate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--distribution", default="pert")
+    args = parser.parse_args(argv)
+
+    data = make_plan(args.tasks)
+    for task in data["phases"][0]["tasks"]:
+        d = task["durationDays"]
+        task["estimate"] = {"optimistic": d * 0.75, "mostLikely": d, "pessimistic": d * 2}
+    schedule = Schedule(build_project(data))
+    print(f"{len(schedule.nodes)} activities, planned length {schedule.length:g} days, "
+          f"{args.iterations} iterations")
+
+    runs = [1] if args.workers <= 1 else [1, args.workers]
+    for workers in runs:
+        t0 = time.perf_counter()
+        result = simulate(schedule, args.iterations, args.distribution, workers=workers, batch=args.batch, seed=0)
+        elapsed = time.perf_counter() - t0
+        p = result.percentiles()
+        print(f"  {workers:2d} worker(s)  {elapsed:7.2f} s   "
+              f"P50 {p[50]:.1f}  P80 {p[80]:.1f}  P95 {p[95]:.1f} days")
+    top = result.most_critical(1)
+    print(f"  most critical: {top[0][0].title} ({top[0][1]:.0%} of iterations)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
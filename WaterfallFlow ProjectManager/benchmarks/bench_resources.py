@@ -0,0 +1,63 @@
+"""Resource over-allocation sweep and leveling speed on a large plan.
+
+Spreads a plan of N tasks (see bench_schedule.make_plan) over A assignees,
+then times find_overallocations() and level_resources(), applies the
+leveling and checks that the project length is unchanged.
+
+    python benchmarks/bench_resources.py [--tasks 200000] [--assignees 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_schedule import make_plan
+from waterfallflow import Schedule, build_project
+from waterfallflow.resources import apply_leveling, find_overallocations, level_resources
+
+
+def booked_days(conflicts):
+    return sum(c.finish - c.start for c in conflicts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200000)
+    parser.add_argument("--assignees", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    data = make_plan(args.tasks)
+    for task in data["phases"][0]["tasks"]:
+        task["assignee"] = f"Person {rng.randrange(args.assignees)}"
+    project = build_project(data)
+    schedule = Schedule(project)
+
+    t0 = time.perf_counter()
+    conflicts = find_overallocations(schedule)
+    sweep_time = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    delays = level_resources(schedule)
+    level_time = time.perf_counter() - t0
+
+    apply_leveling(delays)
+    leveled = Schedule(project)
+    assert leveled.length == schedule.length
+    remaining = find_overallocations(leveled)
+
+    print(f"{len(schedule.nodes)} activities, {args.assignees} assignees, length {schedule.length:g} days")
+    print(f"  sweep     {sweep_time * 1000:8.1f} ms   {len(conflicts)} over-allocations, "
+          f"{booked_days(conflicts)} days")
+    print(f"  leveling  {level_time * 1000:8.1f} ms   {len(delays)} tasks delayed, "
+          f"{len(remaining)} over-allocations left, {booked_days(remaining)} days")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
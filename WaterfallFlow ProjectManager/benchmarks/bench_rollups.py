@@ -0,0 +1,97 @@
+"""Rollup speed: object model loops versus the columnar NumPy store.
+
+Builds a plan with N tasks (one subtask each, spread over ten phases) and
+times total duration, percent complete and per-assignee load computed by
+walking Task objects and by ColumnarProject's vectorised reductions.
+
+    python benchmarks/bench_rollups.py [--tasks 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from waterfallflow import build_project
+from waterfallflow.columnar import ColumnarProject
+
+ASSIGNEES = ("Backend Team", "Frontend Team", "QA", "DevOps", "Alice (PM)")
+
+
+def make_plan(tasks, phases=10):
+    per_phase = tasks // phases
+    return {
+        "name": "Benchmark",
+        "description": "",
+        "phases": [
+            {
+                "name": f"Phase {p + 1}",
+                "description": "",
+                "tasks": [
+                    {
+                        "title": "Task",
+                        "durationDays": 1 + i % 7,
+                        "assignee": ASSIGNEES[i % len(ASSIGNEES)],
+                        "completed": i % 3 == 0,
+                        "subtasks": [{"title": "Subtask", "durationDays": 1, "completed": False}]
+                    }
+                    for i in range(per_phase)
+                ]
+            }
+            for p in range(phases)
+        ]
+    }
+
+
+def rollups_objects(project):
+    total = done = 0
+    load = {}
+    for phase in project.phases:
+        for task in phase.tasks:
+            total += task.duration
+            if task.completed:
+                done += task.duration
+            load[task.assignee] = load.get(task.assignee, 0) + task.duration
+    return total, 100.0 * done / total if total else 0.0, load
+
+
+def rollups_columnar(store):
+    return store.total_duration(), store.percent_complete(), store.assignee_load()
+
+
+def best_of(repeat, func, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    data = make_plan(args.tasks)
+    project = build_project(data)
+    t0 = time.perf_counter()
+    store = ColumnarProject.from_project(project)
+    build_time = time.perf_counter() - t0
+
+    obj_time, obj_result = best_of(args.repeat, rollups_objects, project)
+    col_time, col_result = best_of(args.repeat, rollups_columnar, store)
+    assert obj_result[0] == col_result[0]
+
+    print(f"{store.task_count} tasks, {store.subtask_count} subtasks "
+          f"(columnar build {build_time * 1000:.0f} ms)")
+    print(f"  objects   {obj_time * 1000:9.1f} ms")
+    print(f"  columnar  {col_time * 1000:9.1f} ms   ({obj_time / col_time:.0f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Critical path scheduling speed on a large random dependency graph.
+
+Builds a plan of N tasks where each task depends on up to two of the 50
+tasks before it (a mix of FS, SS and FF links) and times building the
+schedule and rerunning its forward/backward passes. It then applies random
+single-task duration edits and compares Schedule.update() (incremental)
+with a full pass for each, checking that both agree.
+
+    python benchmarks/bench_schedule.py [--tasks 200000] [--edits 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from waterfallflow import Schedule, build_project
+
+KINDS = ("FS", "FS", "FS", "SS", "FF")
+
+
+def make_plan(tasks, seed=0, window=50, links=2):
+    rng = random.Random(seed)
+    data = []
+    for i in range(tasks):
+        preds = rng.sample(range(max(0, i - window), i), min(i, links))
+        data.append({
+            "id": i + 1,
+            "title": f"Task {i + 1}",
+            "durationDays": rng.randint(1, 10),
+            "subtasks": [],
+            "dependencies": [{"id": p + 1, "type": rng.choice(KINDS), "lag": 0} for p in preds],
+        })
+    return {"name": "Benchmark", "nextId": tasks + 1, "phases": [{"name": "Phase", "tasks": data}]}
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - t0, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200000)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    project = build_project(make_plan(args.tasks))
+    build_time, schedule = timed(Schedule, project)
+    pass_time, _ = timed(schedule.compute)
+    edges = sum(len(p) for p in schedule.preds)
+
+    print(f"{len(schedule.nodes)} activities, {edges} links, "
+          f"length {schedule.length:g} days, {len(schedule.critical_path())} critical")
+    print(f"  build + schedule  {build_time * 1000:8.1f} ms")
+    print(f"  passes only       {pass_time * 1000:8.1f} ms")
+
+    rng = random.Random(args.seed)
+    tasks = project.phases[0].tasks
+    reference = Schedule(project)
+    schedule.watch()
+    incremental = []
+    touched = []
+    for _ in range(args.edits):
+        task = rng.choice(tasks)
+        task.duration = rng.randint(1, 10)
+        elapsed, _ = timed(schedule.update)
+        incremental.append(elapsed)
+        touched.append(schedule.last_update[1])
+    schedule.detach()
+    reference.duration = [node.duration for node in reference.nodes]
+    full_time, _ = timed(reference.compute)
+    assert (schedule.early_start, schedule.tail) == (reference.early_start, reference.tail)
+
+    incremental.sort()
+    touched.sort()
+    median = incremental[len(incremental) // 2]
+    print(f"{args.edits} duration edits, median {touched[len(touched) // 2]} activities touched "
+          f"(max {touched[-1]})")
+    print(f"  incremental  median {median * 1000:8.2f} ms   "
+          f"p95 {incremental[int(len(incremental) * 0.95)] * 1000:8.2f} ms")
+    print(f"  full pass           {full_time * 1000:8.2f} ms   ({full_time / median:.0f}x median)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""GUI-thread pauses of building a save snapshot, whole or in slices.
+
+Builds a plan of N tasks (see bench_schedule.make_plan) and times
+Project.to_dict(), the single pause a background save used to cost, then
+builds the same snapshot with a SnapshotBuilder, making random edits
+between its steps as a user would, and reports the longest step and the
+final project_dict() that hands the snapshot to the save worker. As in
+the app, garbage collection is paused meanwhile; with --gc it is not, and
+the snapshot's new objects set off full collections that scan the whole
+plan, which show up as steps over 20 ms.
+
+    python benchmarks/bench_snapshot.py [--tasks 200000] [--edits-per-step 5] [--gc]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_schedule import make_plan
+from waterfallflow import SnapshotBuilder, build_project
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200000)
+    parser.add_argument("--phases", type=int, default=20)
+    parser.add_argument("--edits-per-step", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--gc", action="store_true", help="keep garbage collection running")
+    args = parser.parse_args(argv)
+
+    data = make_plan(args.tasks)
+    tasks = data["phases"][0]["tasks"]
+    size = -(-len(tasks) // args.phases)
+    data["phases"] = [{"name": f"Phase {p + 1}", "tasks": tasks[p * size:(p + 1) * size]}
+                      for p in range(args.phases)]
+    project = build_project(data)
+    all_tasks = [t for phase in project.phases for t in phase.tasks]
+
+    t0 = time.perf_counter()
+    project.to_dict()
+    whole = time.perf_counter() - t0
+
+    rng = random.Random(args.seed)
+    if not args.gc:
+        gc.disable()
+    builder = SnapshotBuilder(project)
+    steps = []
+    while True:
+        t0 = time.perf_counter()
+        done = builder.step()
+        steps.append(time.perf_counter() - t0)
+        if done:
+            break
+        for _ in range(args.edits_per_step):
+            rng.choice(all_tasks).duration = rng.randint(1, 10)
+    t0 = time.perf_counter()
+    snapshot = builder.project_dict()
+    take = time.perf_counter() - t0
+    gc.enable()
+    assert snapshot == project.to_dict()
+
+    steps.sort()
+    print(f"{args.tasks} tasks in {args.phases} phases")
+    print(f"  to_dict() in one go    {whole * 1000:8.1f} ms")
+    print(f"  {len(steps)} steps           median {steps[len(steps) // 2] * 1000:.2f} ms, "
+          f"max {steps[-1] * 1000:.2f} ms, {sum(step > 0.02 for step in steps)} over 20 ms")
+    print(f"  project_dict() at end  {take * 1000:8.1f} ms  "
+          f"({(len(steps) - 1) * args.edits_per_step} edits made meanwhile)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
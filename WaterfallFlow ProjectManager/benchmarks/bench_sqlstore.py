@@ -0,0 +1,82 @@
+"""Open and edit speed of a large plan kept in a SQLite store (.wfdb).
+
+Writes a plan of N tasks split into phases of --phase-size tasks (see
+bench_schedule.make_plan) to a temporary database, then times opening it,
+loading one phase as the UI does when the phase is selected, and single
+edits each committed as its own transaction.
+
+    python benchmarks/bench_sqlstore.py [--tasks 1000000] [--phase-size 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_schedule import make_plan
+from waterfallflow import SqlStore, Task, build_project
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--phase-size", type=int, default=1000)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    data = make_plan(args.tasks, links=1)
+    tasks = data["phases"][0]["tasks"]
+    data["phases"] = [{"id": args.tasks + 1 + n, "name": f"Phase {n + 1}", "tasks": tasks[i:i + args.phase_size]}
+                      for n, i in enumerate(range(0, len(tasks), args.phase_size))]
+    data["nextId"] = args.tasks + len(data["phases"]) + 1
+    project = build_project(data)
+    del data, tasks
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.wfdb")
+        t0 = time.perf_counter()
+        SqlStore.create(path, project).close()
+        create_time = time.perf_counter() - t0
+        size = os.path.getsize(path)
+        del project
+
+        t0 = time.perf_counter()
+        store = SqlStore.open(path)
+        open_time = time.perf_counter() - t0
+        rng = random.Random(args.seed)
+        phases = store.project.phases
+        t0 = time.perf_counter()
+        phase = rng.choice(phases)
+        loaded = len(phase.tasks)
+        load_time = time.perf_counter() - t0
+
+        edits = []
+        for n in range(args.edits):
+            t0 = time.perf_counter()
+            if n % 4 == 3:
+                phase.add_task(Task(f"Inserted {n}", 3), rng.randrange(len(phase.tasks)))
+            else:
+                task = rng.choice(phase.tasks)
+                task.duration = rng.randint(1, 10)
+            store.commit()
+            edits.append(time.perf_counter() - t0)
+        store.close()
+        edits.sort()
+
+    print(f"{args.tasks} tasks in {len(phases)} phases, database {size / 2**20:.1f} MiB")
+    print(f"  create (full write)      {create_time:8.2f} s")
+    print(f"  open (phase list only)   {open_time * 1000:8.1f} ms")
+    print(f"  load one phase ({loaded} tasks) {load_time * 1000:6.1f} ms")
+    print(f"  edit + commit  median {edits[len(edits) // 2] * 1000:.2f} ms, "
+          f"p95 {edits[int(len(edits) * 0.95)] * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
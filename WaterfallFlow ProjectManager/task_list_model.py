@@ -0,0 +1,172 @@
+"""Virtual wx.dataview model for the task list.
+
+Kept out of app6.py so wx.dataview is only imported once the task list is
+actually built (see MainFrame.finish_startup).
+"""
+
+import wx.dataview
+from collections import namedtuple
+
+from waterfallflow import RowIndex, format_dependencies
+
+
+# A resolved task-list row. `slot` is the task's position in the model's slot
+# list; `sub_index` is the subtask position within the task (-1 for task rows).
+RowRef = namedtuple("RowRef", "row task subtask slot sub_index")
+
+
+class TaskListModel(wx.dataview.DataViewVirtualListModel):
+    """Virtual list over Phase.tasks / Task.subtasks.
+
+    Rows are only looked up when the control asks for them, so the cost of
+    showing a phase does not depend on how many rows it has. Edits are
+    reported through the task_* / subtask_* methods, which adjust the row
+    index in O(log n) and notify the control about the affected rows only.
+    Deleted tasks leave an empty slot behind so the index never has to be
+    renumbered; slots are compacted once they outnumber the live tasks.
+    `slot_map` maps each live task to its slot so rows are found without
+    scanning, and `live` counts the live slots so a slot's position in
+    Phase.tasks is known in O(log n) as well. When `schedule` is set, rows show their early start, finish
+    and float and critical activities are highlighted; with `dates` (a
+    workdays.ProjectDates) start and finish are shown as calendar dates.
+    """
+
+    COLUMN_TYPES = ("bool", "string", "string", "string", "string", "string", "string", "string", "string")
+    FIELD_COLUMNS = {"completed": 0, "title": 1, "duration": 2, "assignee": 3, "dependencies": 5}
+    # Start, finish and float, which a leveling delay moves.
+    SCHEDULE_COLUMNS = (6, 7, 8)
+    CRITICAL_COLOUR = wx.Colour(255, 121, 121)
+
+    def __init__(self):
+        super().__init__(0)
+        self.phase = None
+        self.slots = []
+        self.slot_map = {}
+        self.dead_slots = 0
+        self.index = RowIndex()
+        self.live = RowIndex()  # 1 per live slot, 0 per dead one
+        self.schedule = None
+        self.dates = None
+
+    def set_phase(self, phase):
+        self.phase = phase
+        self.slots = list(phase.tasks) if phase is not None else []
+        self.slot_map = {t: slot for slot, t in enumerate(self.slots)}
+        self.dead_slots = 0
+        self.index.rebuild([len(t.subtasks) + 1 for t in self.slots])
+        self.live.rebuild([1] * len(self.slots))
+        self.Reset(self.index.total())
+
+    def ref(self, row):
+        """Resolve a row to a RowRef, or None if it is out of range."""
+        if self.phase is None or row < 0:
+            return None
+        slot, offset = self.index.find(row)
+        if slot >= len(self.slots) or self.slots[slot] is None:
+            return None
+        task = self.slots[slot]
+        if offset == 0:
+            return RowRef(row, task, None, slot, -1)
+        if offset - 1 < len(task.subtasks):
+            return RowRef(row, task, task.subtasks[offset - 1], slot, offset - 1)
+        return None
+
+    def slot_of(self, task):
+        return self.slot_map[task]
+
+    def task_index(self, slot):
+        """Position in Phase.tasks of the task in `slot`; live slots keep the phase's order."""
+        return self.live.prefix(slot)
+
+    def row_of(self, slot, sub_index=-1):
+        return self.index.prefix(slot) + 1 + sub_index
+
+    # -- Incremental updates ----------------------------------------------
+    def task_appended(self, task):
+        self.slot_map[task] = len(self.slots)
+        self.slots.append(task)
+        self.index.append(len(task.subtasks) + 1)
+        self.live.append(1)
+        for _ in range(len(task.subtasks) + 1):
+            self.RowAppended()
+
+    def task_removed(self, slot):
+        task = self.slots[slot]
+        span = len(task.subtasks) + 1
+        first = self.index.prefix(slot)
+        self.index.add(slot, -span)
+        self.live.add(slot, -1)
+        self.slots[slot] = None
+        del self.slot_map[task]
+        self.dead_slots += 1
+        self.RowsDeleted(list(range(first, first + span)))
+        if self.dead_slots > 64 and self.dead_slots * 2 > len(self.slots):
+            self.compact()
+
+    def subtask_inserted(self, slot, sub_index):
+        self.index.add(slot, 1)
+        self.RowInserted(self.row_of(slot, sub_index))
+
+    def subtask_removed(self, slot, sub_index):
+        row = self.row_of(slot, sub_index)
+        self.index.add(slot, -1)
+        self.RowDeleted(row)
+
+    def compact(self):
+        # Rows are unchanged, so the control does not need to be told.
+        self.slots = [t for t in self.slots if t is not None]
+        self.slot_map = {t: slot for slot, t in enumerate(self.slots)}
+        self.dead_slots = 0
+        self.index.rebuild([len(t.subtasks) + 1 for t in self.slots])
+        self.live.rebuild([1] * len(self.slots))
+
+    # -- DataViewVirtualListModel interface --------------------------------
+    def GetColumnCount(self):
+        return len(self.COLUMN_TYPES)
+
+    def GetColumnType(self, col):
+        return self.COLUMN_TYPES[col]
+
+    def GetValueByRow(self, row, col):
+        ref = self.ref(row)
+        if ref is None:
+            return False if col == 0 else ""
+        st = ref.subtask
+        obj = st or ref.task
+        if col == 0:
+            return bool(obj.completed)
+        if col == 1:
+            return f"    ↳ {st.title}" if st else obj.title
+        if col == 2:
+            return str(obj.duration)
+        if col == 3:
+            return "" if st else obj.assignee
+        if col == 4:
+            return str(obj.id) if obj.id is not None else ""
+        if col == 5:
+            return format_dependencies(obj.dependencies)
+        schedule = self.schedule
+        if schedule is None or obj not in schedule:
+            return ""
+        if col == 6:
+            return self.dates.start_of(obj).isoformat() if self.dates else f"{schedule.start(obj):g}"
+        if col == 7:
+            return self.dates.finish_of(obj).isoformat() if self.dates else f"{schedule.finish(obj):g}"
+        return f"{schedule.total_float(obj):g}"
+
+    def GetAttrByRow(self, row, col, attr):
+        if self.schedule is None:
+            return False
+        ref = self.ref(row)
+        if ref is None or not self.schedule.is_critical(ref.subtask or ref.task):
+            return False
+        attr.SetColour(self.CRITICAL_COLOUR)
+        attr.SetBold(True)
+        return True
+
+    def SetValueByRow(self, value, row, col):
+        ref = self.ref(row)
+        if ref is None or col != 0:
+            return False
+        (ref.subtask or ref.task).completed = bool(value)
+        return True
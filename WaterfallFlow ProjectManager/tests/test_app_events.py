@@ -0,0 +1,78 @@
+"""Every observed task and subtask field goes through MainFrame.on_model_changed."""
+
+import pytest
+
+pytest.importorskip("wx.dataview")
+
+from app6 import MainFrame
+from task_list_model import TaskListModel
+from waterfallflow import Dependency, Estimate, Phase, Project, Subtask, Task
+
+NEW_VALUES = {
+    "title": "Renamed", "duration": 7, "assignee": "QA", "completed": True,
+    "dependencies": (Dependency(1, "FS", 0),), "delay": 2, "estimate": Estimate(1, 2, 4),
+}
+
+
+class FakeTaskModel:
+    FIELD_COLUMNS = TaskListModel.FIELD_COLUMNS
+    SCHEDULE_COLUMNS = TaskListModel.SCHEDULE_COLUMNS
+
+    def __init__(self, phase):
+        self.slots = list(phase.tasks)
+        self.changed = []
+
+    def slot_of(self, task):
+        return self.slots.index(task)
+
+    def row_of(self, slot, sub_index=-1):
+        return slot + 1 + sub_index
+
+    def RowValueChanged(self, row, col):
+        self.changed.append((row, col))
+
+
+class FakeFrame:
+    on_model_changed = MainFrame.on_model_changed
+
+    def __init__(self, phase):
+        self.current_phase = phase
+        self.task_model = FakeTaskModel(phase)
+
+    def update_rollup_labels(self, event):
+        pass
+
+    def tree_label(self, obj):
+        return ""
+
+    def tree_label_changed(self, obj, label):
+        pass
+
+
+@pytest.mark.parametrize("cls", [Task, Subtask])
+def test_every_observed_field_is_handled(cls):
+    project = Project()
+    phase = Phase("Build", "")
+    project.add_phase(phase)
+    task = Task("Write", 3)
+    phase.add_task(task)
+    subtask = Subtask("Draft", 1)
+    task.add_subtask(subtask)
+    frame = FakeFrame(phase)
+    project.subscribe(frame.on_model_changed)
+    node = task if cls is Task else subtask
+    for field in cls.OBSERVED:
+        setattr(node, field, NEW_VALUES[field])
+    assert frame.task_model.changed
+
+
+def test_leveling_delay_refreshes_schedule_columns():
+    project = Project()
+    phase = Phase("Build", "")
+    project.add_phase(phase)
+    task = Task("Write", 3)
+    phase.add_task(task)
+    frame = FakeFrame(phase)
+    project.subscribe(frame.on_model_changed)
+    task.delay = 2
+    assert frame.task_model.changed == [(0, column) for column in TaskListModel.SCHEDULE_COLUMNS]
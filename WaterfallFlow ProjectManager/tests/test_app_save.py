@@ -0,0 +1,116 @@
+"""A save that fails leaves the frame with the file and journal it had."""
+
+import gc
+import os
+
+import pytest
+
+wx = pytest.importorskip("wx")
+
+import app6
+from app6 import MainFrame
+from waterfallflow import SnapshotBuilder, open_journal, save_json_atomic
+
+PLAN = {"name": "Plan", "nextId": 10, "phases": [
+    {"id": 1, "name": "Design", "description": "", "tasks": [
+        {"id": 2, "title": "Sketch", "durationDays": 2, "assignee": "Ann", "completed": True, "subtasks": []}]},
+]}
+
+
+def reopened(path):
+    journal = open_journal(path)
+    journal.close()
+    return journal.project
+
+
+class FakeFrame:
+    write_snapshot = MainFrame.write_snapshot
+    write_checkpoint = MainFrame.write_checkpoint
+    finish_save = MainFrame.finish_save
+    save_failed = MainFrame.save_failed
+    pause_gc = MainFrame.pause_gc
+    resume_gc = MainFrame.resume_gc
+
+    def __init__(self, journal):
+        self.project = journal.project
+        self.journal = journal
+        self.save_journal = None
+        self.save_snapshot = None
+        self.save_worker = None
+        self.store = None
+        self.gc_pauses = 0
+        self.project_path = journal.path
+        self.edited = True
+        self.status = None
+
+    def SetStatusText(self, text):
+        self.status = text
+
+
+@pytest.fixture
+def frame(tmp_path, monkeypatch):
+    monkeypatch.setattr(app6.wx, "MessageBox", lambda *args, **kwargs: None, raising=False)
+    monkeypatch.setattr(app6.wx, "CallAfter", lambda *args, **kwargs: None, raising=False)
+    path = os.path.join(tmp_path, "plan.json")
+    save_json_atomic(path, PLAN)
+    frame = FakeFrame(open_journal(path))
+    yield frame
+    gc.enable()
+    frame.journal.close()
+
+
+def test_journal_that_cannot_start_leaves_the_old_one(frame, tmp_path):
+    old = frame.journal
+    frame.pause_gc()
+    frame.write_snapshot(SnapshotBuilder(frame.project), os.path.join(tmp_path, "missing", "plan.json"))
+    assert gc.isenabled()
+    assert frame.status == "Save failed."
+    assert frame.journal is old and frame.save_journal is None and frame.save_worker is None
+    frame.project.phases[0].name = "Kept"
+    old.sync()
+    assert reopened(old.path).phases[0].name == "Kept"
+
+
+def test_checkpoint_that_cannot_start_a_segment(frame, monkeypatch):
+    journal = frame.journal
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(journal, "_open_segment", fail)
+    frame.pause_gc()
+    frame.write_checkpoint(journal, SnapshotBuilder(frame.project))
+    assert gc.isenabled()
+    assert "disk full" in frame.status
+    assert frame.journal is journal and frame.save_worker is None
+
+
+def test_failed_save_to_a_new_path_keeps_the_old_journal(frame, tmp_path):
+    old = frame.journal
+    new_path = os.path.join(tmp_path, "copy.json")
+    frame.pause_gc()
+    frame.write_snapshot(SnapshotBuilder(frame.project), new_path)
+    frame.save_worker.join()
+    stamp = {"id": frame.save_journal.id, "seq": 0}
+    frame.finish_save(frame.project, new_path, "disk full", stamp)
+    assert gc.isenabled()
+    assert frame.journal is old and frame.save_journal is None
+    assert not os.path.exists(new_path + ".0.wfj")
+    frame.project.phases[0].name = "Kept"
+    old.sync()
+    assert reopened(old.path).phases[0].name == "Kept"
+
+
+def test_save_to_a_new_path_moves_to_its_journal(frame, tmp_path):
+    old = frame.journal
+    new_path = os.path.join(tmp_path, "copy.json")
+    frame.pause_gc()
+    frame.write_snapshot(SnapshotBuilder(frame.project), new_path)
+    frame.save_worker.join()
+    new = frame.save_journal
+    frame.finish_save(frame.project, new_path, None, {"id": new.id, "seq": 0})
+    assert frame.journal is new and frame.project_path == new_path
+    assert old.file.closed
+    frame.project.phases[0].name = "Moved"
+    new.sync()
+    assert reopened(new_path).to_dict() == frame.project.to_dict()
@@ -0,0 +1,166 @@
+"""The project tree only creates items for nodes whose parent was expanded."""
+
+import pytest
+
+pytest.importorskip("wx")
+
+from app6 import MainFrame
+from waterfallflow import Phase, Rollups, Subtask, Task, build_project
+
+PLAN = {"name": "Plan", "nextId": 10, "phases": [
+    {"id": 1, "name": "Design", "description": "", "tasks": [
+        {"id": 2, "title": "Sketch", "durationDays": 2, "assignee": "Ann", "completed": True, "subtasks": []}]},
+    {"id": 3, "name": "Build", "description": "", "tasks": [
+        {"id": 4, "title": "Code", "durationDays": 5, "assignee": "Bob", "completed": False,
+         "subtasks": [{"id": 5, "title": "Tests", "durationDays": 1, "completed": True}]}]},
+    {"id": 6, "name": "Ship", "description": "", "tasks": []},
+]}
+
+
+class Item:
+    def __init__(self, parent, label, data):
+        self.parent = parent
+        self.label = label
+        self.data = data
+        self.children = []
+        self.has_children = False
+
+    def IsOk(self):
+        return True
+
+
+class FakeTree:
+    def __init__(self):
+        self.root = None
+
+    def Freeze(self):
+        pass
+
+    def Thaw(self):
+        pass
+
+    def DeleteAllItems(self):
+        self.root = None
+
+    def AddRoot(self, label):
+        self.root = Item(None, label, None)
+        return self.root
+
+    def AppendItem(self, parent, label, data=None):
+        item = Item(parent, label, data)
+        parent.children.append(item)
+        return item
+
+    def SetItemHasChildren(self, item, has=True):
+        item.has_children = has
+
+    def GetChildrenCount(self, item, recursively=True):
+        return len(item.children)
+
+    def GetItemData(self, item):
+        return item.data
+
+    def GetItemParent(self, item):
+        return item.parent
+
+    def Delete(self, item):
+        item.parent.children.remove(item)
+
+    def SetItemText(self, item, label):
+        item.label = label
+
+
+class ExpandEvent:
+    def __init__(self, item):
+        self.item = item
+
+    def GetItem(self):
+        return self.item
+
+
+class FakeFrame:
+    refresh_tree = MainFrame.refresh_tree
+    add_tree_node = MainFrame.add_tree_node
+    on_tree_expanding = MainFrame.on_tree_expanding
+    tree_child_added = MainFrame.tree_child_added
+    tree_child_removed = MainFrame.tree_child_removed
+    tree_label_changed = MainFrame.tree_label_changed
+    tree_label = MainFrame.tree_label
+
+    def __init__(self, project):
+        self.project = project
+        self.rollups = Rollups(project)
+        self.tree = FakeTree()
+        self.refresh_tree()
+
+    def expand(self, obj):
+        self.on_tree_expanding(ExpandEvent(self.tree_items[obj]))
+
+
+def labels(item):
+    return [child.label for child in item.children]
+
+
+def test_only_phases_are_created_up_front():
+    project = build_project(PLAN)
+    frame = FakeFrame(project)
+    assert labels(frame.tree.root) == ["Design  (100%)", "Build  (0%)", "Ship  (0%)"]
+    assert [child.has_children for child in frame.tree.root.children] == [True, True, False]
+    assert set(frame.tree_items) == {project, *project.phases}
+
+
+def test_expanding_adds_one_level():
+    project = build_project(PLAN)
+    frame = FakeFrame(project)
+    build = project.phases[1]
+    frame.expand(build)
+    code = build.tasks[0]
+    assert labels(frame.tree_items[build]) == ["Code  (100%)"]
+    assert frame.tree_items[code].has_children and code.subtasks[0] not in frame.tree_items
+    frame.expand(code)
+    assert labels(frame.tree_items[code]) == ["Tests"]
+    # A second expansion does not add the children again.
+    frame.expand(build)
+    assert len(frame.tree_items[build].children) == 1
+
+
+def test_children_of_collapsed_parents_wait_for_expansion():
+    project = build_project(PLAN)
+    frame = FakeFrame(project)
+    ship, design = project.phases[2], project.phases[0]
+    task = Task("Release", 1)
+    ship.add_task(task)
+    frame.tree_child_added(ship, task, task.title)
+    assert task not in frame.tree_items and frame.tree_items[ship].has_children
+    frame.expand(ship)
+    assert labels(frame.tree_items[ship]) == ["Release"]
+
+    frame.expand(design)
+    task = Task("Review", 1)
+    design.add_task(task)
+    frame.tree_child_added(design, task, task.title)
+    assert labels(frame.tree_items[design]) == ["Sketch", "Review"]
+
+    phase = Phase("Support", "")
+    project.add_phase(phase)
+    frame.tree_child_added(project, phase, frame.tree_label(phase))
+    assert labels(frame.tree.root)[-1] == "Support  (0%)"
+
+
+def test_removal_forgets_the_whole_branch():
+    project = build_project(PLAN)
+    frame = FakeFrame(project)
+    build = project.phases[1]
+    code = build.tasks[0]
+    frame.expand(build)
+    frame.expand(code)
+    subtask = code.subtasks[0]
+    frame.tree_child_removed(subtask)
+    assert subtask not in frame.tree_items and not frame.tree_items[code].has_children
+    code.add_subtask(Subtask("Docs", 1))
+    frame.tree_child_removed(build)
+    assert set(frame.tree_items) == {project, project.phases[0], project.phases[2]}
+    assert labels(frame.tree.root) == ["Design  (100%)", "Ship  (0%)"]
+    # Nodes that never got an item are ignored.
+    frame.tree_child_removed(Task("Stray", 1))
+    frame.tree_label_changed(Task("Stray", 1), "x")
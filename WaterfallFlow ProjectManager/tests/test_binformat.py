@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+from waterfallflow import Dependency, Estimate, Rollups, Totals, build_project, load_binary, write_binary
+from waterfallflow.binformat import Archive
+
+PLAN = {"name": "Plan", "nextId": 10, "phases": [
+    {"id": 1, "name": "Design", "description": "", "tasks": [
+        {"id": 2, "title": "Sketch", "durationDays": 2, "assignee": "Ann", "completed": True, "subtasks": []}]},
+    {"id": 3, "name": "Build", "description": "Main work", "tasks": [
+        {"id": 4, "title": "Code", "durationDays": 5.5, "assignee": "Bob", "completed": False,
+         "dependencies": [{"id": 2, "type": "FS", "lag": 1}],
+         "subtasks": [{"id": 5, "title": "Tests", "durationDays": 1, "completed": False}]}]},
+]}
+
+
+def test_archive_closes_once_every_phase_is_loaded(tmp_path):
+    path = os.path.join(tmp_path, "plan.wfb")
+    write_binary(path, PLAN)
+    project = load_binary(path)
+    archive = project.phases[0].loader.archive
+    project.phases[0].tasks
+    assert not archive.mapped.closed
+    project.phases[1].tasks
+    assert archive.mapped.closed
+    assert project.to_dict() == build_project(PLAN).to_dict()
+
+
+def test_saving_over_the_source_archive(tmp_path):
+    path = os.path.join(tmp_path, "plan.wfb")
+    write_binary(path, PLAN)
+    project = load_binary(path)
+    project.phases[1].tasks[0].title = "Code more"
+    write_binary(path, project.to_dict())
+    assert load_binary(path).to_dict() == project.to_dict()
+
+
+@pytest.mark.parametrize("keep", [0.3, 0.6, 0.9])
+def test_truncated_archive_raises_value_error(tmp_path, keep):
+    path = os.path.join(tmp_path, "plan.wfb")
+    write_binary(path, PLAN)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:int(len(data) * keep)])
+    with pytest.raises(ValueError):
+        Archive(path)
+
+
+def test_round_trip_keeps_ints_floats_and_missing_values(tmp_path):
+    project = build_project(PLAN)
+    design, build = project.phases
+    design.name = None
+    build.description = None
+    sketch, code = design.tasks[0], build.tasks[0]
+    sketch.title = None
+    sketch.duration = 3.0  # a float that happens to be whole stays a float
+    sketch.delay = 1.5
+    code.delay = 2
+    code.estimate = Estimate(1, 2.5, 4)
+    code.subtasks[0].dependencies = (Dependency(2, "FF", -1.5),)
+    want = project.to_dict()
+    path = os.path.join(tmp_path, "plan.wfb")
+    write_binary(path, want)
+    got = load_binary(path).to_dict()
+    assert got == want
+    # == treats 3 and 3.0 alike; the JSON text does not.
+    assert json.dumps(got, sort_keys=True) == json.dumps(want, sort_keys=True)
+
+
+def test_empty_project_round_trip(tmp_path):
+    path = os.path.join(tmp_path, "plan.wfb")
+    write_binary(path, {"name": "Empty", "phases": []})
+    assert load_binary(path).to_dict() == build_project({"name": "Empty", "phases": []}).to_dict()
+
+
+def test_rollups_come_from_the_archive_without_loading(tmp_path):
+    path = os.path.join(tmp_path, "plan.wfb")
+    write_binary(path, PLAN)
+    project = load_binary(path)
+    rollups = Rollups(project)
+    for phase, original in zip(project.phases, build_project(PLAN).phases):
+        assert rollups.of(phase).as_tuple() == Totals.of_items(original.tasks).as_tuple()
+        assert phase.loader is not None
+
+
+@pytest.mark.parametrize("data", [b"", b"xyz", b"WFPROJ" + b"\0" * 100])
+def test_not_an_archive_raises_value_error(tmp_path, data):
+    path = os.path.join(tmp_path, "plan.wfb")
+    with open(path, "wb") as f:
+        f.write(data)
+    with pytest.raises(ValueError):
+        load_binary(path)
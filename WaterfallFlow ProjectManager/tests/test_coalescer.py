@@ -0,0 +1,121 @@
+import pytest
+
+wx = pytest.importorskip("wx")
+
+import app6
+from app6 import UpdateCoalescer
+from waterfallflow import ADDED, REMOVED, Phase, Project, Task
+
+
+class FakeTimer:
+    def __init__(self, interval_ms, callback):
+        self.interval_ms = interval_ms
+        self.callback = callback
+        self.stopped = False
+
+    def Stop(self):
+        self.stopped = True
+
+
+class FakeWindow:
+    def __init__(self):
+        self.frozen = 0
+        self.calls = []
+
+    def Freeze(self):
+        self.frozen += 1
+
+    def Thaw(self):
+        self.frozen -= 1
+
+
+@pytest.fixture
+def timers(monkeypatch):
+    timers = []
+
+    def call_later(interval_ms, callback):
+        timers.append(FakeTimer(interval_ms, callback))
+        return timers[-1]
+
+    monkeypatch.setattr(app6.wx, "CallLater", call_later, raising=False)
+    return timers
+
+
+def make_coalescer():
+    window = FakeWindow()
+
+    def apply(structural, changes):
+        assert window.frozen == 1
+        window.calls.append(([e.kind for e in structural], [(e.field, e.new) for e in changes]))
+
+    project = Project()
+    phase = Phase("Build", "")
+    project.add_phase(phase)
+    coalescer = UpdateCoalescer(window, apply)
+    project.subscribe(coalescer.push)
+    return coalescer, window, phase
+
+
+def test_one_pass_per_tick(timers):
+    coalescer, window, phase = make_coalescer()
+    task = phase.add_task(Task("Code", 1))
+    for duration in range(2, 12):
+        task.duration = duration
+    task.title = "Write"
+    phase.remove_task(task)
+    assert len(timers) == 1 and timers[0].interval_ms == coalescer.interval_ms
+    assert window.calls == []
+    timers[0].callback()
+    assert window.calls == [([ADDED, REMOVED], [("duration", 11), ("title", "Write")])]
+    assert window.frozen == 0
+    assert coalescer.stats() == {"received": 13, "coalesced": 9, "flushes": 1}
+
+
+def test_next_event_arms_a_new_timer(timers):
+    coalescer, window, phase = make_coalescer()
+    task = phase.add_task(Task("Code", 1))
+    coalescer.flush()
+    assert timers[0].stopped
+    task.completed = True
+    assert len(timers) == 2
+    timers[1].callback()
+    assert window.calls[-1] == ([], [("completed", True)])
+    # Nothing pending: no pass at all.
+    coalescer.flush()
+    assert coalescer.flushes == 2
+
+
+def test_same_field_on_different_nodes_is_kept(timers):
+    coalescer, window, phase = make_coalescer()
+    first = phase.add_task(Task("A", 1))
+    second = phase.add_task(Task("B", 1))
+    coalescer.flush()
+    first.duration = 2
+    second.duration = 3
+    coalescer.flush()
+    assert window.calls[-1] == ([], [("duration", 2), ("duration", 3)])
+
+
+def test_clear_drops_pending_events(timers):
+    coalescer, window, phase = make_coalescer()
+    phase.add_task(Task("Code", 1))
+    coalescer.clear()
+    assert timers[0].stopped
+    coalescer.flush()
+    assert window.calls == []
+
+
+def test_thaws_when_apply_fails(timers):
+    window = FakeWindow()
+
+    def apply(structural, changes):
+        raise RuntimeError("boom")
+
+    coalescer = UpdateCoalescer(window, apply)
+    task = Task("Code", 1)
+    task.subscribe(coalescer.push)
+    task.duration = 2
+    with pytest.raises(RuntimeError):
+        coalescer.flush()
+    assert window.frozen == 0
+    assert coalescer.changes == {} and coalescer.timer is None
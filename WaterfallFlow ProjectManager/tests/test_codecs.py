@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from waterfallflow import (
+    AVAILABLE_CODECS, CODECS, build_project, load_project, open_journal, read_project_file, save_json_atomic,
+)
+from waterfallflow import persistence
+
+PLAN = {"name": "Plan ü", "nextId": 10, "phases": [
+    {"id": 1, "name": "Design", "description": "", "tasks": [
+        {"id": 2, "title": "Sketch", "durationDays": 2, "assignee": "Ann", "completed": True, "subtasks": []}]},
+    {"id": 3, "name": "Build", "description": "Main work", "tasks": [
+        {"id": 4, "title": "Code", "durationDays": 5.5, "assignee": "Bob", "completed": False,
+         "dependencies": [{"id": 2, "type": "FS", "lag": 1}],
+         "subtasks": [{"id": 5, "title": "Tests", "durationDays": 1, "completed": False}]}]},
+]}
+
+
+@pytest.mark.parametrize("suffix", AVAILABLE_CODECS)
+def test_save_load_round_trip(tmp_path, suffix):
+    path = os.path.join(tmp_path, f"plan.json{suffix}")
+    save_json_atomic(path, PLAN)
+    with open(path, "rb") as f:
+        assert b"Sketch" not in f.read()  # really compressed
+    assert load_project(path).to_dict() == build_project(PLAN).to_dict()
+
+
+@pytest.mark.parametrize("suffix", AVAILABLE_CODECS)
+def test_progress_is_in_file_bytes(tmp_path, suffix):
+    path = os.path.join(tmp_path, f"plan.json{suffix}")
+    save_json_atomic(path, PLAN)
+    calls = []
+    read_project_file(path, lambda done, total: calls.append((done, total)))
+    size = os.path.getsize(path)
+    assert calls and all(total == size and done <= size for done, total in calls)
+
+
+def test_standard_codecs_are_always_available():
+    assert {".gz", ".bz2", ".xz"} <= set(AVAILABLE_CODECS)
+    assert (".zst" in AVAILABLE_CODECS) == (persistence.zstd is not None)
+
+
+def test_missing_zstd_gives_a_clear_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, "zstd", None)
+    path = os.path.join(tmp_path, "plan.json.zst")
+    with pytest.raises(ValueError, match="Python 3.14"):
+        save_json_atomic(path, PLAN)
+    assert os.listdir(tmp_path) == []  # the temporary file is gone too
+    with open(path, "wb") as f:
+        f.write(b"(\xb5/\xfd")
+    with pytest.raises(ValueError, match="Python 3.14"):
+        load_project(path)
+    assert ".zst" in CODECS
+
+
+def test_journal_replays_on_a_compressed_file(tmp_path):
+    path = os.path.join(tmp_path, "plan.json.gz")
+    save_json_atomic(path, PLAN)
+    journal = open_journal(path)
+    journal.project.phases[0].name = "Plan it"
+    snapshot = journal.checkpoint()
+    save_json_atomic(path, snapshot)
+    journal.discard_segments(snapshot["journal"]["seq"])
+    journal.project.phases[1].tasks[0].completed = True
+    want = journal.project.to_dict()
+    # Stop without closing, as a crash would, once the change is on disk.
+    journal.sync()
+    journal.project.unsubscribe(journal.on_model_changed)
+    journal.stopped.set()
+    journal.flusher.join()
+    journal.file.close()
+
+    recovered = open_journal(path)
+    assert recovered.recovered == 1
+    assert recovered.project.to_dict() == want
+    recovered.close()
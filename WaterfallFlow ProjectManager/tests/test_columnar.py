@@ -0,0 +1,74 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from waterfallflow import Dependency, Estimate, build_project
+from waterfallflow.columnar import ColumnarProject
+
+PLAN = {"name": "Plan", "description": "", "nextId": 10, "phases": [
+    {"id": 1, "name": "Design", "description": "", "tasks": [
+        {"id": 2, "title": "Sketch", "durationDays": 2, "assignee": "Ann", "completed": True, "subtasks": []},
+        {"id": 6, "title": "Review", "durationDays": 2, "assignee": "Bob", "completed": False, "subtasks": []}]},
+    {"id": 3, "name": "Build", "description": "Main work", "tasks": [
+        {"id": 4, "title": "Code", "durationDays": 6, "assignee": "Bob", "completed": False,
+         "dependencies": [{"id": 2, "type": "FS", "lag": 1}], "levelingDelay": 1,
+         "estimate": {"optimistic": 4, "mostLikely": 6, "pessimistic": 10},
+         "subtasks": [{"id": 5, "title": "Tests", "durationDays": 1, "completed": True},
+                      {"id": 7, "title": "Docs", "durationDays": 3, "completed": False}]}]},
+    {"id": 8, "name": "Ship", "description": "", "tasks": []},
+]}
+
+
+def test_round_trip_matches_the_object_model():
+    store = ColumnarProject.from_dict(PLAN)
+    assert store.to_project().to_dict() == build_project(PLAN).to_dict()
+    assert ColumnarProject.from_project(build_project(PLAN)).to_dict() == store.to_dict()
+
+
+def test_rollups():
+    store = ColumnarProject.from_dict(PLAN)
+    assert store.total_duration() == 10
+    assert store.completed_duration() == 2
+    assert store.percent_complete() == 20.0
+    assert store.phase_durations().tolist() == [4, 6, 0]
+    assert store.phase_percent_complete().tolist() == [50.0, 0.0, 0.0]
+    assert store.assignee_load() == {"Ann": 2, "Bob": 8}
+    assert store.assignee_load(open_only=True) == {"Ann": 0, "Bob": 8}
+    assert store.subtask_durations().tolist() == [0, 0, 4]
+    assert store.subtask_percent_complete().tolist() == [0.0, 0.0, 25.0]
+
+
+@pytest.mark.parametrize("data", [
+    {"name": "Empty", "phases": []},
+    {"name": "No tasks", "phases": [{"name": "A", "tasks": []}]},
+    {"name": "No subtasks", "phases": [{"name": "A", "tasks": [{"title": "T", "durationDays": 2}]}]},
+])
+def test_percentages_of_plans_without_rows(data):
+    store = ColumnarProject.from_dict(data)
+    assert store.percent_complete() == 0.0
+    assert store.phase_percent_complete().dtype == np.float64
+    assert store.subtask_percent_complete().tolist() == [0.0] * store.task_count
+
+
+def test_views_write_back_into_the_arrays():
+    store = ColumnarProject.from_dict(PLAN)
+    code = store.phase_tasks(1)[0]
+    assert (code.id, code.title, code.assignee, code.delay) == (4, "Code", "Bob", 1)
+    assert code.dependencies == (Dependency(2, "FS", 1),)
+    code.assignee = "Cy"
+    code.completed = True
+    code.duration = 2.5  # widens the whole column to float
+    code.dependencies = ()
+    code.delay = 0
+    code.estimate = Estimate(1, 2, 3)
+    assert store.task_duration.dtype == np.float64
+    assert store.assignee_load() == {"Ann": 2, "Bob": 2, "Cy": 2.5}
+    code.subtasks[1].completed = True
+    assert store.subtask_percent_complete().tolist() == [0.0, 0.0, 100.0]
+
+    project = build_project(PLAN)
+    task = project.find(4)
+    task.assignee, task.completed, task.duration = "Cy", True, 2.5
+    task.dependencies, task.delay, task.estimate = (), 0, Estimate(1, 2, 3)
+    task.subtasks[1].completed = True
+    assert store.to_project().to_dict() == project.to_dict()
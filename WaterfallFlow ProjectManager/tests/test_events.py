@@ -0,0 +1,100 @@
+"""ChangeEvents published by the model and their propagation to ancestors."""
+
+from waterfallflow import ADDED, CHANGED, REMOVED, ChangeEvent, Phase, Project, Subtask, Task
+
+
+def make_project():
+    project = Project()
+    phase = Phase("Build", "")
+    project.add_phase(phase)
+    task = Task("Code", 3)
+    phase.add_task(task)
+    return project, phase, task
+
+
+def recorder(node):
+    events = []
+    node.subscribe(events.append)
+    return events
+
+
+def test_field_changes_reach_every_ancestor():
+    project, phase, task = make_project()
+    on_project, on_phase, on_task = recorder(project), recorder(phase), recorder(task)
+    task.duration = 5
+    event = ChangeEvent(CHANGED, task, "duration", 3, 5, -1)
+    assert on_task == on_phase == on_project == [event]
+    phase.name = "Make"
+    assert on_project[-1] == ChangeEvent(CHANGED, phase, "name", "Build", "Make", -1)
+    assert len(on_task) == 1  # never sent down
+
+
+def test_assigning_the_same_value_is_silent():
+    project, phase, task = make_project()
+    events = recorder(project)
+    task.title = "Code"
+    task.duration = 3.0
+    assert events == []
+
+
+def test_unobserved_and_detached_nodes_are_silent():
+    project, phase, task = make_project()
+    events = recorder(project)
+    task.id = task.id  # not observed
+    loose = Task("Loose", 1)
+    loose.title = "Still loose"
+    assert events == []
+
+
+def test_child_edits_carry_their_index():
+    project, phase, task = make_project()
+    events = recorder(project)
+    first = Subtask("First", 1)
+    second = Subtask("Second", 1)
+    task.add_subtask(second)
+    task.add_subtask(first, 0)
+    assert events == [ChangeEvent(ADDED, task, "subtasks", None, second, 0),
+                      ChangeEvent(ADDED, task, "subtasks", None, first, 0)]
+    del events[:]
+    assert task.remove_subtask(second) == 1
+    assert events == [ChangeEvent(REMOVED, task, "subtasks", second, None, 1)]
+    del events[:]
+    phase.remove_task(task)
+    assert events == [ChangeEvent(REMOVED, phase, "tasks", task, None, 0)]
+    # A removed branch no longer reports to its old parents.
+    first.title = "Gone"
+    assert len(events) == 1
+
+
+def test_a_wrong_index_hint_still_removes_the_right_child():
+    project, phase, task = make_project()
+    other = phase.add_task(Task("Test", 1))
+    events = recorder(phase)
+    assert phase.remove_task(other, 0) == 1
+    assert phase.tasks == [task]
+    assert events[0].index == 1
+
+
+def test_unsubscribe():
+    project, phase, task = make_project()
+    events = []
+    project.subscribe(events.append)
+    project.unsubscribe(events.append)
+    project.unsubscribe(events.append)  # a second time is harmless
+    task.completed = True
+    assert events == []
+
+
+def test_listener_may_unsubscribe_while_called():
+    project, phase, task = make_project()
+    calls = []
+
+    def once(event):
+        calls.append(event)
+        project.unsubscribe(once)
+
+    project.subscribe(once)
+    project.subscribe(calls.append)
+    task.completed = True
+    task.completed = False
+    assert len(calls) == 3
@@ -0,0 +1,171 @@
+import os
+
+import pytest
+
+from waterfallflow import Phase, Subtask, Task, build_project, open_journal, save_json_atomic
+from waterfallflow.journal import _segment_paths, segment_path
+
+PLAN = {"name": "Plan", "nextId": 10, "phases": [
+    {"id": 1, "name": "Design", "description": "", "tasks": [
+        {"id": 2, "title": "Sketch", "durationDays": 2, "assignee": "Ann", "completed": True, "subtasks": []}]},
+    {"id": 3, "name": "Build", "description": "Main work", "tasks": [
+        {"id": 4, "title": "Code", "durationDays": 5, "assignee": "Bob", "completed": False,
+         "dependencies": [{"id": 2, "type": "FS", "lag": 1}],
+         "subtasks": [{"id": 5, "title": "Tests", "durationDays": 1, "completed": False}]}]},
+]}
+
+
+def crash(journal):
+    """Stop `journal` the way a killed process would, after its last flush."""
+    journal.sync()
+    journal.project.unsubscribe(journal.on_model_changed)
+    journal.stopped.set()
+    journal.flusher.join()
+    journal.file.close()
+
+
+def edit(project, step):
+    design, build = project.phases[0], project.phases[-1]
+    design.name = f"Design {step}"
+    task = Task(f"Review {step}", step % 4 + 1, "Cy")
+    build.add_task(task, 0)
+    task.add_subtask(Subtask("Notes", 1))
+    build.tasks[-1].completed = step % 2 == 0
+    if len(build.tasks) > 3:
+        build.remove_task(build.tasks[-2])
+
+
+def start(tmp_path):
+    path = os.path.join(tmp_path, "plan.json")
+    save_json_atomic(path, PLAN)
+    return path, open_journal(path)
+
+
+def test_replay_after_crash(tmp_path):
+    path, journal = start(tmp_path)
+    for step in range(5):
+        edit(journal.project, step)
+    journal.project.add_phase(Phase("Ship", ""))
+    want = journal.project.to_dict()
+    crash(journal)
+
+    recovered = open_journal(path)
+    assert recovered.recovered > 0
+    assert recovered.project.to_dict() == want
+    recovered.close()
+
+
+def test_torn_record_is_cut_off(tmp_path):
+    path, journal = start(tmp_path)
+    edit(journal.project, 0)
+    journal.sync()
+    want = journal.project.to_dict()
+    journal.project.phases[0].name = "Lost"
+    crash(journal)
+    segment = segment_path(path, 0)
+    size = os.path.getsize(segment)
+    with open(segment, "r+b") as f:
+        f.truncate(size - 5)
+
+    recovered = open_journal(path)
+    assert recovered.project.to_dict() == want
+    # The torn tail is gone, so the next change lands on a clean line.
+    recovered.project.phases[0].name = "Kept"
+    want = recovered.project.to_dict()
+    recovered.close()
+    reopened = open_journal(path)
+    assert reopened.project.to_dict() == want
+    reopened.close()
+
+
+def test_corrupt_record_stops_replay(tmp_path):
+    path, journal = start(tmp_path)
+    journal.project.phases[0].name = "First"
+    journal.sync()
+    want = journal.project.to_dict()
+    journal.project.phases[0].name = "Second"
+    crash(journal)
+    segment = segment_path(path, 0)
+    with open(segment, "rb") as f:
+        data = f.read()
+    with open(segment, "wb") as f:
+        f.write(data.replace(b"Second", b"Secand"))
+
+    recovered = open_journal(path)
+    assert recovered.project.to_dict() == want
+    recovered.close()
+
+
+def test_segment_chain_replays_across_checkpoint(tmp_path):
+    path, journal = start(tmp_path)
+    edit(journal.project, 0)
+    journal.checkpoint()  # never written: segment 0 still belongs to the file
+    edit(journal.project, 1)
+    want = journal.project.to_dict()
+    crash(journal)
+    assert sorted(_segment_paths(path)) == [0, 1]
+
+    recovered = open_journal(path)
+    assert recovered.project.to_dict() == want
+    recovered.close()
+
+
+def test_crash_between_checkpoint_and_discard(tmp_path):
+    path, journal = start(tmp_path)
+    edit(journal.project, 0)
+    snapshot = journal.checkpoint()
+    save_json_atomic(path, snapshot)
+    edit(journal.project, 1)
+    want = journal.project.to_dict()
+    crash(journal)
+
+    recovered = open_journal(path)
+    assert recovered.project.to_dict() == want
+    # The folded-in segment is no longer part of the chain.
+    assert sorted(_segment_paths(path)) == [1]
+    recovered.close()
+
+
+def test_checkpoint_that_cannot_start_a_segment_keeps_journaling(tmp_path):
+    path, journal = start(tmp_path)
+    os.mkdir(segment_path(path, 1))  # in the way of the next segment
+    with pytest.raises(OSError):
+        journal.checkpoint()
+    assert journal.seq == 0
+    edit(journal.project, 0)
+    want = journal.project.to_dict()
+    crash(journal)
+    os.rmdir(segment_path(path, 1))
+
+    recovered = open_journal(path)
+    assert recovered.project.to_dict() == want
+    recovered.close()
+
+
+def test_discard_segments_after_checkpoint(tmp_path):
+    path, journal = start(tmp_path)
+    edit(journal.project, 0)
+    snapshot = journal.checkpoint()
+    save_json_atomic(path, snapshot)
+    journal.discard_segments(snapshot["journal"]["seq"])
+    edit(journal.project, 1)
+    want = journal.project.to_dict()
+    journal.close()
+    assert sorted(_segment_paths(path)) == [1]
+
+    reopened = open_journal(path)
+    assert reopened.project.to_dict() == want
+    reopened.close()
+
+
+def test_overwritten_file_ignores_stale_journal(tmp_path):
+    path, journal = start(tmp_path)
+    edit(journal.project, 0)
+    journal.close()
+    other = dict(PLAN, name="Other")
+    save_json_atomic(path, other)
+
+    reopened = open_journal(path)
+    assert reopened.recovered == 0
+    assert reopened.project.to_dict() == build_project(other).to_dict()
+    reopened.close()
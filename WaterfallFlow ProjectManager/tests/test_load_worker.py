@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from waterfallflow import LoadCancelled, ProjectLoadWorker, build_project, save_json_atomic
+
+# Enough tasks to pass the every-5000-tasks progress and cancel points.
+COUNT = 12000
+
+
+def big_plan():
+    tasks = [{"id": i, "title": f"Task {i}", "durationDays": 1, "assignee": "Ann", "subtasks": []}
+             for i in range(2, COUNT + 2)]
+    return {"name": "Big", "nextId": COUNT + 2, "phases": [{"id": 1, "name": "Build", "description": "",
+                                                           "tasks": tasks}]}
+
+
+def run(worker):
+    results = []
+    worker.callback = lambda project, error: results.append((project, error))
+    worker.start()
+    worker.join(30)
+    assert not worker.is_alive()
+    assert len(results) == 1  # exactly one callback
+    return results[0]
+
+
+def test_build_project_reports_progress():
+    calls = []
+    project = build_project(big_plan(), lambda done, total: calls.append((done, total)))
+    assert calls == [(5000, COUNT), (10000, COUNT), (COUNT, COUNT)]
+    assert len(project.phases[0].tasks) == COUNT
+
+
+def test_build_project_can_be_cancelled():
+    polls = []
+
+    def cancelled():
+        polls.append(1)
+        return True
+
+    with pytest.raises(LoadCancelled):
+        build_project(big_plan(), cancelled=cancelled)
+    assert len(polls) == 1
+
+
+def test_worker_loads_with_progress(tmp_path):
+    path = os.path.join(tmp_path, "big.json")
+    save_json_atomic(path, big_plan())
+    calls = []
+    project, error = run(ProjectLoadWorker(path, lambda done, total: calls.append((done, total)), None))
+    assert error is None
+    assert len(project.phases[0].tasks) == COUNT
+    size = os.path.getsize(path)
+    assert len(calls) == 3 and calls[-1] == (size, size)
+    assert [done for done, total in calls] == sorted(done for done, total in calls)
+
+
+def test_cancelled_worker_reports_nothing(tmp_path):
+    path = os.path.join(tmp_path, "big.json")
+    save_json_atomic(path, big_plan())
+    worker = ProjectLoadWorker(path, None, None)
+    worker.cancel()
+    assert run(worker) == (None, None)
+
+
+def test_worker_reports_errors(tmp_path):
+    project, error = run(ProjectLoadWorker(os.path.join(tmp_path, "missing.json"), None, None))
+    assert project is None and "missing.json" in error
+
+
+def test_worker_uses_the_given_loader():
+    seen = []
+
+    def load(path, progress, cancelled):
+        seen.append((path, cancelled()))
+        return "journal"
+
+    assert run(ProjectLoadWorker("plan.json", None, None, load=load)) == ("journal", None)
+    assert seen == [("plan.json", False)]
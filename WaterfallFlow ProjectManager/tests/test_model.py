@@ -0,0 +1,82 @@
+import pytest
+
+from waterfallflow import Phase, Project, Subtask, Task, build_project
+
+
+class CountingLoader:
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return [Task.from_dict(data) for data in self.tasks]
+
+
+def lazy_project():
+    project = Project.from_info({"name": "Plan", "nextId": 10})
+    loaders = []
+    for p, ids in enumerate(((1, 2), (3, 4), (5, 6))):
+        phase = Phase(f"P{p}", "")
+        phase.id = 100 + p
+        loader = CountingLoader([{"id": i, "title": f"T{i}"} for i in ids])
+        phase.set_loader(loader)
+        project.add_phase(phase)
+        loaders.append(loader)
+    return project, loaders
+
+
+def test_find_does_not_load_phases_by_default():
+    project, loaders = lazy_project()
+    assert project.find(42) is None
+    assert project.find(5) is None
+    assert [loader.calls for loader in loaders] == [0, 0, 0]
+
+
+def test_find_with_load_stops_at_the_phase_holding_the_id():
+    project, loaders = lazy_project()
+    assert project.find(3, load=True).title == "T3"
+    assert [loader.calls for loader in loaders] == [1, 1, 0]
+    assert project.find(4).title == "T4"
+
+
+def test_new_nodes_get_fresh_ids():
+    project = build_project({"name": "Plan", "phases": [{"name": "P", "tasks": [{"title": "A"}]}]})
+    task = project.phases[0].add_task(Task("B", 1))
+    subtask = task.add_subtask(Subtask("B1", 1))
+    assert len({project.phases[0].id, project.phases[0].tasks[0].id, task.id, subtask.id}) == 4
+    assert project.find(subtask.id) is subtask
+
+
+def test_clashing_id_raises_and_leaves_project_unchanged():
+    project = build_project({"name": "Plan", "phases": [{"name": "P", "id": 1, "tasks": [
+        {"id": 2, "title": "A", "subtasks": [{"id": 3, "title": "A1"}]}]}]})
+    phase = project.phases[0]
+    next_id = project.next_id
+    task = Task("B", 1)
+    task.add_subtask(Subtask("B1", 1))
+    clash = Subtask("B2", 1)
+    object.__setattr__(clash, "id", 3)
+    task.add_subtask(clash)
+    with pytest.raises(ValueError):
+        phase.add_task(task)
+    assert [t.title for t in phase.tasks] == ["A"]
+    assert task.parent is None and task.id is None and task.subtasks[0].id is None
+    assert project.next_id == next_id
+    assert project.find(3).title == "A1"
+
+
+def test_duplicate_ids_in_a_file_are_rejected():
+    with pytest.raises(ValueError):
+        build_project({"name": "Plan", "phases": [{"name": "P", "tasks": [
+            {"id": 1, "title": "A"}, {"id": 1, "title": "B"}]}]})
+
+
+def test_file_mixing_nodes_with_and_without_ids_loads():
+    project = build_project({"name": "Plan", "phases": [{"name": "P", "tasks": [
+        {"title": "A"}, {"id": 1, "title": "B", "subtasks": [{"title": "B1"}]}]}]})
+    phase = project.phases[0]
+    nodes = [phase, *phase.tasks, *phase.tasks[1].subtasks]
+    assert phase.tasks[1].id == 1
+    assert len({node.id for node in nodes}) == 4
+    assert all(project.find(node.id) is node for node in nodes)
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from waterfallflow import Estimate, Schedule, build_project
+from waterfallflow.montecarlo import TRIANGULAR, Network, simulate
+
+
+def link(pred, kind="FS", lag=0):
+    return {"id": pred, "type": kind, "lag": lag}
+
+
+def random_project(seed, count=40):
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(1, count + 1):
+        task = {"id": i, "title": f"T{i}", "durationDays": rng.randint(1, 6),
+                "dependencies": [link(j, rng.choice(["FS", "SS", "FF"]), rng.choice([0, 1, -1, 2.5]))
+                                 for j in rng.sample(range(max(1, i - 8), i), min(i - 1, rng.randint(0, 3)))]}
+        if rng.random() < 0.2:
+            task["levelingDelay"] = rng.randint(1, 3)
+        if rng.random() < 0.6:
+            task["estimate"] = {"optimistic": 1, "mostLikely": task["durationDays"], "pessimistic": 9}
+        tasks.append(task)
+    return build_project({"name": "Plan", "nextId": count + 1, "phases": [{"name": "Build", "tasks": tasks}]})
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_every_iteration_matches_schedule(seed):
+    project = random_project(seed)
+    schedule = Schedule(project)
+    network = Network(schedule)
+    durations = network.sample(np.random.default_rng(seed), 6)
+    lengths, critical = network.run(durations)
+    expected_critical = np.zeros(len(schedule.nodes), dtype=np.int64)
+    for iteration in range(6):
+        for i, node in enumerate(schedule.nodes):
+            node.duration = float(durations[network.position[i], iteration])
+        reference = Schedule(project)
+        assert lengths[iteration] == pytest.approx(reference.length, abs=1e-9)
+        expected_critical += [reference.is_critical(node) for node in reference.nodes]
+    assert critical[network.position].tolist() == expected_critical.tolist()
+
+
+def test_without_estimates_every_iteration_is_the_plan():
+    project = random_project(7)
+    for task in project.phases[0].tasks:
+        task.estimate = None
+    schedule = Schedule(project)
+    result = simulate(schedule, 50, seed=1, workers=1)
+    assert result.lengths.tolist() == [schedule.length] * 50
+    for node in schedule.nodes:
+        assert result.criticality_of(node) == float(schedule.is_critical(node))
+
+
+def test_samples_stay_within_the_estimate():
+    project = random_project(3)
+    schedule = Schedule(project)
+    network = Network(schedule, TRIANGULAR)
+    durations = network.sample(np.random.default_rng(0), 200)
+    for i, node in enumerate(schedule.nodes):
+        if node.estimate is not None:
+            row = durations[network.position[i]]
+            assert row.min() >= node.estimate.optimistic - 1e-6
+            assert row.max() <= node.estimate.pessimistic + 1e-6
+
+
+def test_seeded_results_do_not_depend_on_the_worker_count():
+    schedule = Schedule(random_project(11))
+    one = simulate(schedule, 900, seed=5, workers=1, batch=200)
+    two = simulate(schedule, 900, seed=5, workers=2, batch=200)
+    assert one.lengths.tolist() == two.lengths.tolist()
+    assert one.criticality.tolist() == two.criticality.tolist()
+    assert one.percentiles() == two.percentiles()
+
+
+def test_inconsistent_estimate_raises_value_error():
+    project = random_project(2)
+    project.phases[0].tasks[0].estimate = Estimate(5, 2, 9)
+    with pytest.raises(ValueError):
+        simulate(Schedule(project), 10, workers=1)
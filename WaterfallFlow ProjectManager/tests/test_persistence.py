@@ -0,0 +1,82 @@
+import io
+import json
+
+import pytest
+
+from waterfallflow import build_project, read_project
+from waterfallflow import persistence
+
+PLAN = {"name": "Plan", "nextId": 10, "startDate": "2026-01-05",
+        "calendars": {"QA": {"weekmask": "1111110", "holidays": ["2026-01-01"]}},
+        "phases": [
+            {"id": 1, "name": "Design", "description": "", "tasks": [
+                {"id": 2, "title": "Sketch ü", "durationDays": 2, "assignee": "Ann", "completed": True,
+                 "subtasks": []}]},
+            {"id": 3, "name": "Build", "description": "Main work \U0001F600", "tasks": [
+                {"id": 4, "title": "Code", "durationDays": 12.25, "assignee": "Bob", "completed": False,
+                 "dependencies": [{"id": 2, "type": "FS", "lag": 1}],
+                 "subtasks": [{"id": 5, "title": "Tests", "durationDays": 1000, "completed": False}]}]},
+        ]}
+
+
+def read(text, chunk_size, monkeypatch):
+    monkeypatch.setattr(persistence, "CHUNK_SIZE", chunk_size)
+    raw = text.encode("utf-8")
+    return read_project(io.BytesIO(raw), len(raw))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2, "\t"])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_matches_build_project(monkeypatch, chunk_size, indent, ensure_ascii):
+    text = json.dumps(PLAN, indent=indent, ensure_ascii=ensure_ascii) + "\n"
+    project, info = read(text, chunk_size, monkeypatch)
+    assert project.to_dict() == build_project(PLAN).to_dict()
+    assert info["calendars"] == PLAN["calendars"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5])
+def test_numbers_split_across_chunks(monkeypatch, chunk_size):
+    # "nextId" is a bare number before the closing brace: a chunk ending inside
+    # it must not cut it short.
+    text = ('{"phases": [{"tasks": [{"title": "a", "completed": false, "durationDays": 12345}, '
+            '{"title": "b", "completed": false, "durationDays": 2.5e1}]}], "nextId": 1000}')
+    project, _ = read(text, chunk_size, monkeypatch)
+    assert [task.duration for task in project.phases[0].tasks] == [12345, 25.0]
+    assert project.next_id >= 1000
+    assert project.to_dict() == build_project(json.loads(text)).to_dict()
+
+
+def test_phases_before_next_id_number_like_build_project(monkeypatch):
+    data = {"phases": [{"id": 7, "name": "A", "tasks": [{"title": "no id", "durationDays": 1}]}],
+            "name": "Plan", "nextId": 20}
+    project, _ = read(json.dumps(data), 4, monkeypatch)
+    assert project.to_dict() == build_project(data).to_dict()
+
+
+def test_missing_next_id_numbers_above_explicit_ids(monkeypatch):
+    data = {"phases": [{"name": "A", "tasks": [{"title": "no id", "durationDays": 1},
+                                               {"id": 40, "title": "has id", "durationDays": 1}]}]}
+    project, _ = read(json.dumps(data), 3, monkeypatch)
+    ids = [task.id for task in project.phases[0].tasks]
+    assert ids[1] == 40 and ids[0] > 40
+    assert project.to_dict() == build_project(data).to_dict()
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1 << 20])
+def test_stale_next_id_numbers_above_explicit_ids(monkeypatch, chunk_size):
+    data = {"nextId": 2, "phases": [{"name": "A", "tasks": [{"title": "a", "durationDays": 1},
+                                                            {"id": 2, "title": "b", "durationDays": 1}]}]}
+    project, _ = read(json.dumps(data), chunk_size, monkeypatch)
+    ids = [task.id for task in project.phases[0].tasks]
+    assert ids[1] == 2 and ids[0] > 2
+    assert project.next_id > max(ids)
+    assert project.to_dict() == build_project(data).to_dict()
+
+
+@pytest.mark.parametrize("text", [
+    '', '{"phases": [', '{"phases": []} x', '{"a": 1,}', '{"phases": [{"tasks": [{"title": "a"]}]}',
+])
+def test_malformed_json_raises_value_error(monkeypatch, text):
+    with pytest.raises(ValueError):
+        read(text, 2, monkeypatch)
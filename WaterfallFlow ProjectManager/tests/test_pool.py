@@ -0,0 +1,35 @@
+from waterfallflow import AssigneeIndex, build_project
+
+
+def make_project():
+    return build_project({"name": "Plan", "phases": [
+        {"name": "Build", "tasks": [
+            {"title": "Code", "assignee": "Dev"},
+            {"title": "Check", "assignee": "QA"},
+            {"title": "Retest", "assignee": "QA"},
+        ]},
+    ]})
+
+
+def test_fresh_index_finds_existing_assignee():
+    project = make_project()
+    index = AssigneeIndex(project)
+    assert [t.title for t in index.tasks_for("QA")] == ["Check", "Retest"]
+    assert index.tasks_for("Nobody") == []
+
+
+def test_fresh_index_reassigns():
+    project = make_project()
+    index = AssigneeIndex(project)
+    assert index.reassign("QA", "Dev") == 2
+    assert index.assignees() == {"Dev": 3}
+
+
+def test_index_follows_edits():
+    project = make_project()
+    index = AssigneeIndex(project)
+    index.assignees()
+    task = project.phases[0].tasks[0]
+    task.assignee = "Ops"
+    project.phases[0].remove_task(project.phases[0].tasks[1])
+    assert index.assignees() == {"QA": 1, "Ops": 1}
@@ -0,0 +1,154 @@
+import random
+
+import pytest
+
+from waterfallflow import (
+    Overallocation, Schedule, apply_leveling, build_project, clear_leveling, find_overallocations, level_resources,
+)
+from waterfallflow.model import FF, FS, SS
+from waterfallflow.resources import task_bookings
+
+
+def link(pred, kind="FS", lag=0):
+    return {"id": pred, "type": kind, "lag": lag}
+
+
+def make_project(tasks):
+    return build_project({"name": "Plan", "nextId": 100, "phases": [{"name": "Build", "tasks": tasks}]})
+
+
+# Bob's C (5d) sets the length; Ann's A (3d) and B (2d) both start on day 0.
+PLAN = [
+    {"id": 1, "title": "A", "durationDays": 3, "assignee": "Ann"},
+    {"id": 2, "title": "B", "durationDays": 2, "assignee": "Ann"},
+    {"id": 3, "title": "C", "durationDays": 5, "assignee": "Bob"},
+]
+
+
+def by_title(project):
+    return {task.title: task for task in project.phases[0].tasks}
+
+
+def test_overlap_is_reported():
+    project = make_project(PLAN)
+    tasks = by_title(project)
+    assert find_overallocations(Schedule(project)) == [
+        Overallocation("Ann", 0, 2, 2, (tasks["A"], tasks["B"]))]
+
+
+def test_capacity_allows_parallel_work():
+    assert find_overallocations(Schedule(make_project(PLAN)), {"Ann": 2}) == []
+
+
+def test_touching_tasks_milestones_and_unassigned_do_not_overlap():
+    project = make_project([
+        {"id": 1, "title": "A", "durationDays": 3, "assignee": "Ann"},
+        {"id": 2, "title": "B", "durationDays": 2, "assignee": "Ann", "dependencies": [link(1)]},
+        {"id": 3, "title": "M", "durationDays": 0, "assignee": "Ann"},
+        {"id": 4, "title": "U", "durationDays": 4, "assignee": "Unassigned"},
+        {"id": 5, "title": "V", "durationDays": 4, "assignee": "Unassigned"},
+        {"id": 6, "title": "S", "durationDays": 1, "assignee": "Cy",
+         "subtasks": [{"id": 7, "title": "S1", "durationDays": 1}]},
+    ])
+    assert find_overallocations(Schedule(project)) == []
+
+
+def test_leveling_removes_the_overlap_within_float():
+    project = make_project(PLAN)
+    schedule = Schedule(project)
+    delays = level_resources(schedule)
+    tasks = by_title(project)
+    assert delays == {tasks["B"]: 3}
+    apply_leveling(delays)
+    leveled = Schedule(project)
+    assert leveled.length == schedule.length == 5
+    assert leveled.start(tasks["B"]) == 3
+    assert find_overallocations(leveled) == []
+    assert clear_leveling(project) == 1
+    assert tasks["B"].delay == 0
+
+
+def test_leveling_clears_a_chain_with_enough_float():
+    # Ann's six tasks, some linked, fit one after another in Bob's 20 days.
+    project = make_project([
+        {"id": 1, "title": "Long", "durationDays": 20, "assignee": "Bob"},
+        {"id": 2, "title": "A1", "durationDays": 2, "assignee": "Ann"},
+        {"id": 3, "title": "A2", "durationDays": 3, "assignee": "Ann"},
+        {"id": 4, "title": "A3", "durationDays": 1, "assignee": "Ann", "dependencies": [link(2)]},
+        {"id": 5, "title": "A4", "durationDays": 2, "assignee": "Ann", "dependencies": [link(2, "SS", 1)]},
+        {"id": 6, "title": "A5", "durationDays": 3, "assignee": "Ann"},
+        {"id": 7, "title": "A6", "durationDays": 1, "assignee": "Ann", "dependencies": [link(3)]},
+    ])
+    schedule = Schedule(project)
+    assert find_overallocations(schedule)
+    apply_leveling(level_resources(schedule))
+    leveled = Schedule(project)
+    assert find_overallocations(leveled) == []
+    assert leveled.length == 20
+
+
+def test_conflicts_between_critical_tasks_stay():
+    project = make_project([
+        {"id": 1, "title": "A", "durationDays": 3, "assignee": "Ann"},
+        {"id": 2, "title": "B", "durationDays": 3, "assignee": "Ann"},
+    ])
+    schedule = Schedule(project)
+    assert level_resources(schedule) == {}
+    assert len(find_overallocations(schedule)) == 1
+
+
+def overbooked_days(schedule):
+    """{assignee: sorted days with more than one task}, counted day by day."""
+    result = {}
+    for assignee, slots in task_bookings(schedule).items():
+        load = {}
+        for i in slots:
+            for day in range(schedule.early_start[i], schedule.early_finish[i]):
+                load[day] = load.get(day, 0) + 1
+        days = sorted(day for day, count in load.items() if count > 1)
+        if days:
+            result[assignee] = days
+    return result
+
+
+def random_project(seed):
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(1, 61):
+        tasks.append({"id": i, "title": f"T{i}", "durationDays": rng.choice([0, 1, 2, 3, 5]),
+                      "assignee": rng.choice(["A", "B", "C", "Unassigned"]),
+                      "dependencies": [link(j, rng.choice(["FS", "SS", "FF"]), rng.choice([0, 0, 1, -1]))
+                                       for j in rng.sample(range(max(1, i - 10), i), min(i - 1, rng.randint(0, 2)))]})
+    return make_project(tasks)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_sweep_matches_a_day_by_day_count(seed):
+    schedule = Schedule(random_project(seed))
+    found = {}
+    for overallocation in find_overallocations(schedule):
+        found.setdefault(overallocation.assignee, []).extend(range(overallocation.start, overallocation.finish))
+    assert found == overbooked_days(schedule)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_leveling_keeps_length_and_dependencies(seed):
+    project = random_project(seed)
+    schedule = Schedule(project)
+    delays = level_resources(schedule)
+    apply_leveling(delays)
+    leveled = Schedule(project)
+    assert leveled.length == schedule.length
+    for task, delay in delays.items():
+        # Moved within its float, never earlier than planned.
+        assert delay > 0
+        assert leveled.start(task) <= schedule.late_start(task) + 1e-9
+    for task in project.phases[0].tasks:
+        for dep in task.dependencies:
+            pred = project.find(dep.pred)
+            if dep.kind == FS:
+                assert leveled.start(task) >= leveled.finish(pred) + dep.lag
+            elif dep.kind == SS:
+                assert leveled.start(task) >= leveled.start(pred) + dep.lag
+            elif dep.kind == FF:
+                assert leveled.finish(task) >= leveled.finish(pred) + dep.lag
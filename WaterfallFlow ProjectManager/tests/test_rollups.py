@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from waterfallflow import Phase, Rollups, Subtask, Task, Totals, build_project
+
+PLAN = {"name": "Plan", "nextId": 10, "phases": [
+    {"id": 1, "name": "Design", "description": "", "tasks": [
+        {"id": 2, "title": "Sketch", "durationDays": 2, "assignee": "Ann", "completed": True, "subtasks": []}]},
+    {"id": 3, "name": "Build", "description": "", "tasks": [
+        {"id": 4, "title": "Code", "durationDays": 5.5, "assignee": "Bob", "completed": False,
+         "subtasks": [{"id": 5, "title": "Tests", "durationDays": 1, "completed": True},
+                      {"id": 6, "title": "Docs", "durationDays": 2, "completed": False}]}]},
+]}
+
+
+def recount(node):
+    """Totals counted from scratch, as (total, done, open, closed)."""
+    if hasattr(node, "phases"):
+        totals = Totals()
+        for phase in node.phases:
+            totals.merge(Totals.of_items(phase.tasks))
+        return totals.as_tuple()
+    return Totals.of_items(node.tasks if isinstance(node, Phase) else node.subtasks).as_tuple()
+
+
+def every_node(project):
+    yield project
+    for phase in project.phases:
+        yield phase
+        yield from phase.tasks
+
+
+def test_totals():
+    project = build_project(PLAN)
+    rollups = Rollups(project)
+    assert rollups.of(project).as_tuple() == (7.5, 2, 1, 1)
+    assert rollups.of(project.phases[1].tasks[0]).as_tuple() == (3, 1, 1, 1)
+    assert rollups.of(project.phases[0]).percent == 100.0
+    assert rollups.of(project.phases[1]).count == 1
+    assert Totals().percent == 0.0
+
+
+def random_edit(project, rng, step):
+    phase = rng.choice(project.phases)
+    choice = rng.random()
+    if choice < 0.2:
+        phase.add_task(Task(f"New {step}", rng.randint(0, 5), "Cy"), rng.randint(0, len(phase.tasks)))
+    elif choice < 0.3 and phase.tasks:
+        phase.remove_task(rng.choice(phase.tasks))
+    elif choice < 0.4 and phase.tasks:
+        rng.choice(phase.tasks).add_subtask(Subtask(f"Sub {step}", rng.randint(1, 3), rng.random() < 0.5))
+    elif choice < 0.5 and phase.tasks:
+        task = rng.choice(phase.tasks)
+        if task.subtasks:
+            task.remove_subtask(rng.choice(task.subtasks))
+    elif choice < 0.6 and phase.tasks:
+        # Moved to another phase.
+        task = rng.choice(phase.tasks)
+        phase.remove_task(task)
+        rng.choice(project.phases).add_task(task, 0)
+    elif choice < 0.65:
+        project.add_phase(Phase(f"Phase {step}", ""), rng.randint(0, len(project.phases)))
+    elif choice < 0.7 and len(project.phases) > 1:
+        project.remove_phase(phase)
+    elif phase.tasks:
+        task = rng.choice(phase.tasks)
+        node = rng.choice(task.subtasks) if task.subtasks and rng.random() < 0.4 else task
+        if rng.random() < 0.5:
+            node.completed = not node.completed
+        else:
+            node.duration = rng.choice([0, 1, 2.5, 4])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_rollups_match_a_recount(seed):
+    rng = random.Random(seed)
+    project = build_project(PLAN)
+    rollups = Rollups(project)
+    for step in range(300):
+        random_edit(project, rng, step)
+        # Ask for some nodes only now and then, so edits meet both cached
+        # and uncached ancestors.
+        if rng.random() < 0.3:
+            node = rng.choice(list(every_node(project)))
+            assert rollups.of(node).as_tuple() == pytest.approx(recount(node))
+    for node in every_node(project):
+        assert rollups.of(node).as_tuple() == pytest.approx(recount(node))
+
+
+def test_detach_stops_following():
+    project = build_project(PLAN)
+    rollups = Rollups(project)
+    before = rollups.of(project).as_tuple()
+    rollups.detach()
+    project.phases[0].tasks[0].completed = False
+    assert rollups.of(project).as_tuple() == before
@@ -0,0 +1,138 @@
+import random
+
+import pytest
+
+from waterfallflow import Schedule, ScheduleError, build_project, schedule as schedule_module
+
+
+def link(pred, kind="FS", lag=0):
+    return {"id": pred, "type": kind, "lag": lag}
+
+
+def make_project(tasks):
+    return build_project({"name": "Plan", "nextId": 100, "phases": [{"name": "Build", "tasks": tasks}]})
+
+
+# A 3d, B 2d FS A+1, C 4d SS A+2, D 2d FF C+1, E 1d after B and D.
+PLAN = [
+    {"id": 1, "title": "A", "durationDays": 3},
+    {"id": 2, "title": "B", "durationDays": 2, "dependencies": [link(1, "FS", 1)]},
+    {"id": 3, "title": "C", "durationDays": 4, "dependencies": [link(1, "SS", 2)]},
+    {"id": 4, "title": "D", "durationDays": 2, "dependencies": [link(3, "FF", 1)]},
+    {"id": 5, "title": "E", "durationDays": 1, "dependencies": [link(2), link(4)]},
+]
+
+
+def dates(schedule, project):
+    return {t.title: (schedule.start(t), schedule.finish(t), schedule.late_start(t), schedule.late_finish(t),
+                      schedule.total_float(t))
+            for t in project.phases[0].tasks}
+
+
+def test_early_and_late_dates():
+    project = make_project(PLAN)
+    schedule = Schedule(project)
+    assert schedule.length == 8
+    assert dates(schedule, project) == {
+        "A": (0, 3, 0, 3, 0),
+        "B": (4, 6, 5, 7, 1),
+        "C": (2, 6, 2, 6, 0),
+        "D": (5, 7, 5, 7, 0),
+        "E": (7, 8, 7, 8, 0),
+    }
+    assert [t.title for t in schedule.critical_path()] == ["A", "C", "D", "E"]
+
+
+def test_leveling_delay_pushes_start():
+    project = make_project(PLAN)
+    project.phases[0].tasks[1].delay = 3
+    schedule = Schedule(project)
+    # B starts at 4 + 3, so E waits for it and B becomes critical.
+    assert schedule.start(project.phases[0].tasks[1]) == 7
+    assert schedule.length == 10
+    assert [t.title for t in schedule.critical_path()] == ["A", "B", "E"]
+
+
+def test_subtasks_are_activities():
+    project = make_project([
+        {"id": 1, "title": "A", "durationDays": 2,
+         "subtasks": [{"id": 2, "title": "A1", "durationDays": 5, "dependencies": [link(1, "SS")]}]},
+        {"id": 3, "title": "B", "durationDays": 1, "dependencies": [link(2)]},
+    ])
+    schedule = Schedule(project)
+    task_b = project.phases[0].tasks[1]
+    assert schedule.start(task_b) == 5
+    assert schedule.length == 6
+
+
+def test_unknown_predecessor_is_ignored():
+    project = make_project([{"id": 1, "title": "A", "durationDays": 2, "dependencies": [link(42)]}])
+    assert Schedule(project).length == 2
+
+
+def test_cycle_raises():
+    project = make_project([
+        {"id": 1, "title": "A", "durationDays": 1, "dependencies": [link(2)]},
+        {"id": 2, "title": "B", "durationDays": 1, "dependencies": [link(1)]},
+    ])
+    with pytest.raises(ScheduleError):
+        Schedule(project)
+
+
+def random_plan(rng, tasks):
+    """Tasks and subtasks linked to earlier activities by FS/SS/FF links with lags."""
+    data = []
+    ids = []
+    next_id = 1
+
+    def links():
+        return [link(pred, rng.choice(("FS", "SS", "FF")), rng.randint(-2, 3))
+                for pred in rng.sample(ids, min(len(ids), rng.randint(0, 3)))]
+
+    for _ in range(tasks):
+        task_id = next_id
+        subtasks = []
+        for _ in range(rng.randint(0, 2)):
+            subtasks.append({"id": next_id + 1 + len(subtasks), "title": "S", "durationDays": rng.randint(1, 5),
+                             "dependencies": links()})
+        next_id += 1 + len(subtasks)
+        data.append({"id": task_id, "title": "T", "durationDays": rng.randint(1, 8), "subtasks": subtasks,
+                     "dependencies": links()})
+        ids.extend(s["id"] for s in subtasks)
+        ids.append(task_id)
+    return build_project({"name": "Plan", "nextId": next_id, "phases": [{"name": "P", "tasks": data}]})
+
+
+def check_incremental_matches_full(seeds):
+    for seed in range(seeds):
+        rng = random.Random(seed)
+        project = random_plan(rng, rng.randint(2, 40))
+        schedule = Schedule(project)
+        schedule.watch()
+        tasks = project.phases[0].tasks
+        for _ in range(20):
+            for _ in range(rng.randint(1, 2)):
+                if rng.random() < 0.3:
+                    rng.choice(tasks).delay = rng.randint(0, 4)
+                else:
+                    rng.choice(schedule.nodes).duration = rng.randint(0, 9)
+            schedule.update()
+            full = Schedule(project)
+            assert (schedule.early_start, schedule.early_finish, schedule.tail, schedule.length) == \
+                (full.early_start, full.early_finish, full.tail, full.length), seed
+
+
+def test_incremental_update_matches_full_pass():
+    check_incremental_matches_full(200)
+
+
+def test_large_cone_falls_back_to_full_pass(monkeypatch):
+    monkeypatch.setattr(schedule_module, "MIN_CONE_LIMIT", 3)
+    check_incremental_matches_full(100)
+    project = make_project(PLAN)
+    schedule = Schedule(project)
+    schedule.watch()
+    project.phases[0].tasks[0].duration = 5
+    schedule.update()
+    assert schedule.last_update[0] == "full"
+    assert schedule.length == 9
@@ -0,0 +1,42 @@
+import pytest
+
+from waterfallflow import Phase, Project, Subtask, Task, build_project
+
+NODES = [Subtask("Draft", 1), Task("Write", 3), Phase("Build", ""), Project()]
+
+
+@pytest.mark.parametrize("node", NODES, ids=lambda node: type(node).__name__)
+def test_nodes_have_no_instance_dict(node):
+    assert not hasattr(node, "__dict__")
+    for cls in type(node).__mro__[:-1]:
+        assert "__slots__" in vars(cls), cls
+    with pytest.raises(AttributeError):
+        node.misspelled = 1
+
+
+@pytest.mark.parametrize("cls", [Subtask, Task, Phase, Project])
+def test_observed_fields_have_slots(cls):
+    slots = {name for klass in cls.__mro__ for name in vars(klass).get("__slots__", ())}
+    assert set(cls.OBSERVED) <= slots
+    assert {"parent", "listeners", "id"} <= slots
+
+
+def test_fresh_nodes_have_every_slot_filled():
+    for node in NODES:
+        for klass in type(node).__mro__[:-1]:
+            for name in klass.__slots__:
+                getattr(node, name)  # AttributeError if the constructor missed it
+
+
+def test_round_trip_keeps_every_field():
+    data = {"name": "Plan", "description": "d", "nextId": 10, "phases": [
+        {"id": 1, "name": "Build", "description": "Main", "tasks": [
+            {"id": 2, "title": "Code", "durationDays": 5, "assignee": "Bob", "completed": True,
+             "levelingDelay": 1, "estimate": {"optimistic": 3, "mostLikely": 5, "pessimistic": 9},
+             "dependencies": [{"id": 4, "type": "SS", "lag": 1}],
+             "subtasks": [{"id": 3, "title": "Tests", "durationDays": 1, "completed": False}]},
+            {"id": 4, "title": "Design", "durationDays": 2, "assignee": "Ann"}]}]}
+    project = build_project(data)
+    assert build_project(project.to_dict()).to_dict() == project.to_dict()
+    task = project.phases[0].tasks[0]
+    assert (task.delay, task.estimate.likely, task.dependencies[0].lag) == (1, 5, 1)
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from waterfallflow import (
+    CHANGED, ChangeEvent, Dependency, Estimate, Phase, SqlStore, Subtask, Task, Totals, build_project,
+)
+
+PLAN = {"name": "Plan", "nextId": 10, "startDate": "2026-01-05", "phases": [
+    {"id": 1, "name": "Design", "description": "", "tasks": [
+        {"id": 2, "title": "Sketch", "durationDays": 2, "assignee": "Ann", "completed": True, "subtasks": []}]},
+    {"id": 3, "name": "Build", "description": "Main work", "tasks": [
+        {"id": 4, "title": "Code", "durationDays": 5.5, "assignee": "Bob", "completed": False,
+         "dependencies": [{"id": 2, "type": "FS", "lag": 1}],
+         "subtasks": [{"id": 5, "title": "Tests", "durationDays": 1, "completed": False}]}]},
+]}
+
+
+def create(tmp_path):
+    path = os.path.join(tmp_path, "plan.wfdb")
+    project = build_project(PLAN)
+    return path, SqlStore.create(path, project)
+
+
+def test_round_trip(tmp_path):
+    path, store = create(tmp_path)
+    want = store.project.to_dict()
+    store.close()
+    reopened = SqlStore.open(path)
+    assert reopened.project.to_dict() == want
+    reopened.close()
+
+
+def test_totals_come_from_the_phases_table(tmp_path):
+    path, store = create(tmp_path)
+    store.close()
+    reopened = SqlStore.open(path)
+    for phase, original in zip(reopened.project.phases, build_project(PLAN).phases):
+        assert phase.loader.totals == Totals.of_items(original.tasks).as_tuple()
+    reopened.close()
+
+
+def test_committed_edits_persist(tmp_path):
+    path, store = create(tmp_path)
+    project = store.project
+    design, build = project.phases
+    design.name = "Plan it"
+    build.description = None
+    code = build.tasks[0]
+    code.duration = 8
+    code.completed = True
+    code.delay = 2
+    code.estimate = Estimate(1, 2, 4)
+    code.dependencies = (Dependency(2, "SS", 0),)
+    code.subtasks[0].title = "Unit tests"
+    code.add_subtask(Subtask("Docs", 1), 0)
+    design.add_task(Task("Review", 1, "Cy"), 0)
+    design.remove_task(design.tasks[1])
+    build.remove_task(code)
+    design.add_task(code)
+    project.add_phase(Phase("Ship", "Release"), 1)
+    project.name = "Renamed"
+    store.commit()
+    want = project.to_dict()
+    store.close()
+
+    reopened = SqlStore.open(path)
+    # The rollup totals were kept up to date row by row.
+    for phase in reopened.project.phases:
+        assert phase.loader.totals == Totals.of_items(project.find(phase.id).tasks).as_tuple()
+    assert reopened.project.to_dict() == want
+    reopened.close()
+
+
+def test_detach_drops_uncommitted_edits(tmp_path):
+    path, store = create(tmp_path)
+    store.commit()
+    store.project.phases[0].name = "Lost"
+    store.detach()
+    reopened = SqlStore.open(path)
+    assert reopened.project.phases[0].name == "Design"
+    reopened.close()
+
+
+def test_unknown_phase_field_is_not_written(tmp_path):
+    path, store = create(tmp_path)
+    phase = store.project.phases[0]
+    store.on_model_changed(ChangeEvent(CHANGED, phase, "name = 'x', total", 0, 99, None))
+    store.close()
+    reopened = SqlStore.open(path)
+    assert reopened.project.phases[0].name == "Design"
+    totals = Totals.of_items(build_project(PLAN).phases[0].tasks).as_tuple()
+    assert reopened.project.phases[0].loader.totals == totals
+    reopened.close()
+
+
+def test_open_rejects_other_files(tmp_path):
+    missing = os.path.join(tmp_path, "missing.wfdb")
+    with pytest.raises(ValueError):
+        SqlStore.open(missing)
+    other = os.path.join(tmp_path, "plan.json")
+    with open(other, "w") as f:
+        f.write("{}")
+    with pytest.raises(ValueError):
+        SqlStore.open(other)
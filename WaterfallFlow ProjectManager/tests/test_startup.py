@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("wx")
+
+from app6 import StartupTimer
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_report_lists_marks_with_their_gaps():
+    timer = StartupTimer(10.0)
+    assert timer.elapsed_ms() == 0
+    timer.marks = [("import", 10.25), ("frame build", 10.5), ("first data", 11.0)]
+    assert timer.elapsed_ms() == pytest.approx(1000)
+    lines = timer.report().splitlines()
+    assert lines[0] == "Startup timing:"
+    assert lines[1].split() == ["import", "250.0", "ms", "(+250.0", "ms)"]
+    assert lines[3].split() == ["first", "data", "1000.0", "ms", "(+500.0", "ms)"]
+
+
+def test_mark_uses_the_same_clock_as_t0():
+    timer = StartupTimer(time.perf_counter())
+    timer.mark("import")
+    assert 0 <= timer.elapsed_ms() < 1000
+    assert [name for name, t in timer.marks] == ["import"]
+
+
+def test_task_list_is_not_imported_at_startup():
+    # A fresh interpreter, since other tests import the task list model.
+    code = ("import sys, app6; "
+            "print(sorted(m for m in ('wx.dataview', 'task_list_model') if m in sys.modules))")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    out = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, env=env, capture_output=True, text=True,
+                         check=True).stdout
+    assert out.strip() == "[]"
@@ -0,0 +1,179 @@
+import random
+
+import pytest
+
+pytest.importorskip("wx.dataview")
+
+from task_list_model import TaskListModel
+from waterfallflow import Phase, Project, Subtask, Task
+
+
+def make_phase(count):
+    project = Project()
+    phase = Phase("Build", "")
+    project.add_phase(phase)
+    for i in range(count):
+        task = Task(f"Task {i}", 1)
+        for j in range(i % 3):
+            task.add_subtask(Subtask(f"Sub {i}.{j}", 1))
+        phase.add_task(task)
+    return phase
+
+
+class RecordingModel(TaskListModel):
+    """Records the row notifications instead of sending them to a control."""
+
+    def __init__(self):
+        self.sent = []
+        super().__init__()
+
+    def Reset(self, count):
+        self.sent.append(("Reset", count))
+
+    def RowAppended(self):
+        self.sent.append(("RowAppended",))
+
+    def RowInserted(self, row):
+        self.sent.append(("RowInserted", row))
+
+    def RowDeleted(self, row):
+        self.sent.append(("RowDeleted", row))
+
+    def RowsDeleted(self, rows):
+        self.sent.append(("RowsDeleted", rows))
+
+
+def flat_rows(phase):
+    return [(task, sub) for task in phase.tasks for sub in [None] + task.subtasks]
+
+
+def remove(model, phase, task):
+    """Delete `task` the way MainFrame does: by the position the model knows."""
+    slot = model.slot_of(task)
+    phase.remove_task(task, model.task_index(slot))
+    model.task_removed(slot)
+
+
+def test_task_index_follows_removals():
+    phase = make_phase(150)
+    model = TaskListModel()
+    model.set_phase(phase)
+    for i, task in enumerate(list(phase.tasks)):
+        if i % 3:
+            remove(model, phase, task)
+    assert len(model.slots) < 150  # compacted on the way
+    for position, task in enumerate(phase.tasks):
+        assert model.task_index(model.slot_of(task)) == position
+
+
+def test_task_index_of_appended_tasks():
+    phase = make_phase(5)
+    model = TaskListModel()
+    model.set_phase(phase)
+    remove(model, phase, phase.tasks[1])
+    task = Task("New", 2)
+    phase.add_task(task)
+    model.task_appended(task)
+    assert model.task_index(model.slot_of(task)) == len(phase.tasks) - 1
+
+
+def test_rows_follow_tasks_then_their_subtasks():
+    phase = make_phase(3)
+    model = TaskListModel()
+    model.set_phase(phase)
+    task0, task1, task2 = phase.tasks
+    assert model.index.total() == 6
+    rows = [(ref.task, ref.subtask, ref.sub_index) for ref in map(model.ref, range(6))]
+    assert rows == [(task0, None, -1), (task1, None, -1), (task1, task1.subtasks[0], 0),
+                    (task2, None, -1), (task2, task2.subtasks[0], 0), (task2, task2.subtasks[1], 1)]
+    assert model.ref(6) is None and model.ref(-1) is None
+    assert model.row_of(model.slot_of(task2), 1) == 5
+
+
+def test_values_by_row():
+    phase = make_phase(2)
+    model = TaskListModel()
+    model.set_phase(phase)
+    task = phase.tasks[1]
+    task.assignee = "Ann"
+    assert [model.GetValueByRow(1, col) for col in range(6)] == [False, "Task 1", "1", "Ann", str(task.id), ""]
+    assert model.GetValueByRow(2, 1) == "    ↳ Sub 1.0"
+    assert model.GetValueByRow(2, 3) == ""
+    assert model.GetValueByRow(99, 0) is False and model.GetValueByRow(99, 1) == ""
+    assert model.GetColumnCount() == len(TaskListModel.COLUMN_TYPES)
+    assert model.GetValueByRow(1, 6) == ""  # no schedule
+
+
+def test_checkbox_edits_the_node():
+    phase = make_phase(2)
+    model = TaskListModel()
+    model.set_phase(phase)
+    assert model.SetValueByRow(True, 2, 0)
+    assert phase.tasks[1].subtasks[0].completed and not phase.tasks[1].completed
+    assert not model.SetValueByRow("x", 1, 1)
+
+
+def test_no_phase_has_no_rows():
+    model = TaskListModel()
+    model.set_phase(None)
+    assert model.index.total() == 0
+    assert model.ref(0) is None
+    assert model.GetValueByRow(0, 1) == ""
+
+
+def test_edits_notify_only_the_affected_rows():
+    phase = make_phase(3)
+    model = RecordingModel()
+    model.set_phase(phase)
+    assert model.sent == [("Reset", 6)]
+    del model.sent[:]
+
+    task = Task("New", 2)
+    task.add_subtask(Subtask("New sub", 1))
+    phase.add_task(task)
+    model.task_appended(task)
+    assert model.sent == [("RowAppended",), ("RowAppended",)]
+
+    del model.sent[:]
+    remove(model, phase, phase.tasks[2])
+    assert model.sent == [("RowsDeleted", [3, 4, 5])]
+
+    del model.sent[:]
+    target = phase.tasks[1]
+    target.add_subtask(Subtask("Late", 1), 0)
+    model.subtask_inserted(model.slot_of(target), 0)
+    assert model.sent == [("RowInserted", 2)]
+
+    del model.sent[:]
+    target.remove_subtask(target.subtasks[1])
+    model.subtask_removed(model.slot_of(target), 1)
+    assert model.sent == [("RowDeleted", 3)]
+    assert [(ref.task, ref.subtask) for ref in map(model.ref, range(model.index.total()))] == flat_rows(phase)
+
+
+def test_rows_match_the_phase_after_many_edits():
+    rng = random.Random(4)
+    phase = make_phase(40)
+    model = RecordingModel()
+    model.set_phase(phase)
+    for step in range(400):
+        choice = rng.random()
+        if choice < 0.3 or not phase.tasks:
+            task = Task(f"New {step}", 1)
+            phase.add_task(task)
+            model.task_appended(task)
+        elif choice < 0.6:
+            remove(model, phase, rng.choice(phase.tasks))
+        elif choice < 0.8:
+            task = rng.choice(phase.tasks)
+            position = rng.randint(0, len(task.subtasks))
+            task.add_subtask(Subtask(f"Sub {step}", 1), position)
+            model.subtask_inserted(model.slot_of(task), position)
+        else:
+            task = rng.choice(phase.tasks)
+            if task.subtasks:
+                position = rng.randrange(len(task.subtasks))
+                task.remove_subtask(task.subtasks[position])
+                model.subtask_removed(model.slot_of(task), position)
+    assert model.index.total() == len(flat_rows(phase))
+    assert [(ref.task, ref.subtask) for ref in map(model.ref, range(model.index.total()))] == flat_rows(phase)
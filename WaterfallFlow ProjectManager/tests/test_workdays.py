@@ -0,0 +1,80 @@
+import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from waterfallflow import Schedule, build_project
+from waterfallflow.workdays import ProjectDates, busday_calendar, compute_dates
+
+
+def link(pred, kind="FS", lag=0):
+    return {"id": pred, "type": kind, "lag": lag}
+
+
+# Monday 2 March 2026. A 3d; B 2d two days after A; C a milestone after B;
+# D 2d after A for Bob, with a 1d subtask starting with it.
+PLAN = [
+    {"id": 1, "title": "A", "durationDays": 3, "assignee": "Ann"},
+    {"id": 2, "title": "B", "durationDays": 2, "assignee": "Ann", "dependencies": [link(1, "FS", 2)]},
+    {"id": 3, "title": "C", "durationDays": 0, "assignee": "Ann", "dependencies": [link(2)]},
+    {"id": 4, "title": "D", "durationDays": 2, "assignee": "Bob", "dependencies": [link(1)],
+     "subtasks": [{"id": 5, "title": "D1", "durationDays": 1, "dependencies": [link(4, "SS")]}]},
+]
+
+
+def make_dates(start="2026-03-02", calendars=None):
+    data = {"name": "Plan", "nextId": 10, "startDate": start, "phases": [{"name": "Build", "tasks": PLAN}]}
+    if calendars:
+        data["calendars"] = calendars
+    project = build_project(data)
+    return project, ProjectDates(project, Schedule(project))
+
+
+def dates_of(dates, title):
+    node = next(n for n in dates.schedule.nodes if n.title == title)
+    return dates.start_of(node).isoformat(), dates.finish_of(node).isoformat()
+
+
+def test_lag_skips_the_weekend():
+    project, dates = make_dates()
+    assert dates_of(dates, "A") == ("2026-03-02", "2026-03-04")
+    # Two days of lag are Thursday and Friday, so B starts on Monday.
+    assert dates_of(dates, "B") == ("2026-03-09", "2026-03-10")
+    assert dates_of(dates, "C") == ("2026-03-11", "2026-03-11")
+    assert dates.project_finish() == datetime.date(2026, 3, 11)
+
+
+def test_holidays_are_skipped():
+    project, dates = make_dates(calendars={"default": {"weekmask": "1111100", "holidays": ["2026-03-09"]}})
+    assert dates_of(dates, "B") == ("2026-03-10", "2026-03-11")
+    assert dates_of(dates, "C") == ("2026-03-12", "2026-03-12")
+
+
+def test_start_on_a_weekend_rolls_forward():
+    project, dates = make_dates(start="2026-03-07")
+    assert dates_of(dates, "A") == ("2026-03-09", "2026-03-11")
+
+
+def test_assignee_calendar_and_subtasks_follow_it():
+    project, dates = make_dates(calendars={"Bob": {"weekmask": "1111000", "holidays": []}})
+    # D starts on Thursday; Bob does not work Fridays, so it ends on Monday.
+    assert dates_of(dates, "D") == ("2026-03-05", "2026-03-09")
+    assert dates_of(dates, "D1") == ("2026-03-05", "2026-03-05")
+    assert dates_of(dates, "A") == ("2026-03-02", "2026-03-04")
+
+
+def test_refresh_picks_up_calendar_edits():
+    project, dates = make_dates()
+    project.calendars = {"default": {"weekmask": "1111100", "holidays": ["2026-03-02"]}}
+    dates.refresh()
+    assert dates_of(dates, "A") == ("2026-03-03", "2026-03-05")
+
+
+def test_compute_dates_with_fractional_offsets():
+    calendar = busday_calendar(None)
+    starts, finishes = compute_dates("2026-03-02", [0.5, 4.0], [1.5, 6.0], np.zeros(2, dtype=np.int32),
+                                     [calendar])
+    # 0.5..1.5 touches Monday and Tuesday; 4..6 is Friday and the next Monday.
+    assert starts.astype(str).tolist() == ["2026-03-02", "2026-03-06"]
+    assert finishes.astype(str).tolist() == ["2026-03-03", "2026-03-09"]
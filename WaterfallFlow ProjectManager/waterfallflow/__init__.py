@@ -0,0 +1,56 @@
+"""Headless core of WaterfallFlow: data model, templates, persistence.
+
+Nothing in this package imports wx, so scripts and batch jobs can load,
+transform and save projects without a GUI toolkit or a display.
+
+waterfallflow.columnar offers a NumPy-backed store for analytics over very
+large plans, waterfallflow.workdays maps schedules onto calendar dates and
+waterfallflow.montecarlo simulates schedule risk; none is imported here so
+NumPy stays optional. waterfallflow.sqlstore keeps a project in a SQLite
+file that opens phase by phase and saves edit by edit; waterfallflow.journal
+does the same for JSON files with an append-only journal of changes.
+waterfallflow.binformat reads and writes compact, memory-mapped .wfb files.
+SnapshotBuilder serializes a live project in slices, so a GUI can hand a
+background save its copy of the plan without a long pause.
+"""
+
+from .binformat import load_binary, write_binary
+from .journal import Journal, open_journal
+from .model import (
+    ADDED, CHANGED, DEPENDENCY_KINDS, FF, FS, REMOVED, SS, ChangeEvent, Dependency, Estimate, ModelNode, Phase,
+    Project, Subtask, Task,
+)
+from .persistence import (
+    AVAILABLE_CODECS, CODECS, LoadCancelled, atomic_open, build_project, codec_of, load_project, read_project,
+    read_project_file, save_json_atomic, save_project,
+)
+from .pool import AssigneeIndex, StringPool
+from .resources import Overallocation, apply_leveling, clear_leveling, find_overallocations, level_resources
+from .rollups import Rollups, Totals
+from .rowindex import RowIndex
+from .schedule import Schedule, ScheduleError, format_dependencies, parse_dependencies
+from .session import load_session, snapshot_session, write_session
+from .snapshot import SnapshotBuilder
+from .sqlstore import SqlStore
+from .templates import TEMPLATES, generate_offline_plan
+from .workers import OfflineWorker, ProjectLoadWorker, ProjectSaveWorker, SimulationWorker
+
+__all__ = [
+    "ADDED", "CHANGED", "REMOVED", "ChangeEvent", "ModelNode",
+    "Phase", "Project", "Subtask", "Task",
+    "Journal", "open_journal",
+    "load_binary", "write_binary",
+    "DEPENDENCY_KINDS", "Dependency", "Estimate", "FF", "FS", "SS",
+    "AVAILABLE_CODECS", "CODECS", "LoadCancelled", "atomic_open", "build_project", "codec_of", "load_project", "read_project",
+    "read_project_file", "save_json_atomic", "save_project",
+    "AssigneeIndex", "StringPool",
+    "Overallocation", "apply_leveling", "clear_leveling", "find_overallocations", "level_resources",
+    "Rollups", "Totals",
+    "RowIndex",
+    "Schedule", "ScheduleError", "format_dependencies", "parse_dependencies",
+    "load_session", "snapshot_session", "write_session",
+    "SnapshotBuilder",
+    "SqlStore",
+    "TEMPLATES", "generate_offline_plan",
+    "OfflineWorker", "ProjectLoadWorker", "ProjectSaveWorker", "SimulationWorker",
+]
@@ -0,0 +1,81 @@
+"""Command-line access to projects without starting the GUI.
+
+    python -m waterfallflow info myproject.json
+    python -m waterfallflow show myproject.json 42
+    python -m waterfallflow generate "web app" -o plan.json
+    python -m waterfallflow convert plan.json plan.wfb
+
+Paths ending in .wfb are binary projects (see waterfallflow.binformat);
+anything else is JSON.
+"""
+
+import argparse
+import json
+import sys
+
+from .binformat import load_binary, write_binary
+from .persistence import build_project, load_project, save_json_atomic, save_project
+from .templates import generate_offline_plan
+
+
+def _load(path):
+    return load_binary(path) if path.lower().endswith('.wfb') else load_project(path)
+
+
+def cmd_info(args):
+    project = _load(args.path)
+    tasks = sum(len(p.tasks) for p in project.phases)
+    subtasks = sum(len(t.subtasks) for p in project.phases for t in p.tasks)
+    print(f"{project.name}: {len(project.phases)} phases, {tasks} tasks, {subtasks} subtasks")
+
+
+def cmd_show(args):
+    node = _load(args.path).find(args.id, load=True)
+    if node is None:
+        print(f"No phase, task or subtask with id {args.id}", file=sys.stderr)
+        return 1
+    print(json.dumps(node.to_dict(), indent=4))
+
+
+def cmd_generate(args):
+    project = build_project(generate_offline_plan(args.prompt))
+    save_project(project, args.output)
+    print(f"Wrote {project.name} to {args.output}")
+
+
+def cmd_convert(args):
+    project = _load(args.source)
+    write = write_binary if args.target.lower().endswith('.wfb') else save_json_atomic
+    write(args.target, project.to_dict())
+    print(f"Wrote {project.name} to {args.target}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="waterfallflow")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    info = commands.add_parser("info", help="summarise a project file")
+    info.add_argument("path")
+    info.set_defaults(func=cmd_info)
+
+    show = commands.add_parser("show", help="print the phase, task or subtask with an id")
+    show.add_argument("path")
+    show.add_argument("id", type=int)
+    show.set_defaults(func=cmd_show)
+
+    generate = commands.add_parser("generate", help="generate a plan from a description")
+    generate.add_argument("prompt")
+    generate.add_argument("-o", "--output", default="myproject.json")
+    generate.set_defaults(func=cmd_generate)
+
+    convert = commands.add_parser("convert", help="convert between JSON and binary (.wfb) project files")
+    convert.add_argument("source")
+    convert.add_argument("target")
+    convert.set_defaults(func=cmd_convert)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
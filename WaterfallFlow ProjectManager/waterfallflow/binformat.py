@@ -0,0 +1,316 @@
+"""Compact binary project files (.wfb), read in place through mmap.
+
+File layout (little endian, sections 8-byte aligned)::
+
+    header    magic, format version, then the count and offset of each
+              section below, and the string holding the project info
+    phases    one fixed-width record per phase: id, name, description,
+              its range of task records and its rollup totals
+    tasks     one fixed-width record per task, grouped by phase: id,
+              title, assignee, duration, completed, leveling delay, its
+              ranges of subtask and link records and an "extra" string
+    subtasks  one fixed-width record per subtask, grouped by task, with
+              its range of link records
+    links     one fixed-width record per dependency: predecessor id,
+              kind and lag
+    strings   count + 1 offsets into the UTF-8 data that follows them
+
+Titles, assignees and other text are indices into the string table, so a
+string repeated across the plan is stored once. Whatever else a node's
+to_dict() carries (the estimate) is kept as compact JSON in its "extra"
+string; the project's info_dict() is one JSON string too, so
+JSON -> .wfb -> JSON is lossless. Numbers remember whether they were ints.
+
+Archive memory-maps the file and reads records and strings through
+memoryview slices of the mapping. load_binary() only reads the header and
+the phase records; each phase's tasks are decoded from their pages the
+first time they are accessed, and until then its totals come from its
+phase record, as with session snapshots. Once every phase is decoded the
+mapping is closed, so the file can be replaced; saving a project walks
+all its phases first, so saving over the file it came from works too.
+"""
+
+import json
+import mmap
+import struct
+
+from .model import DEPENDENCY_KINDS, Dependency, Phase, Project, Subtask, Task, estimate_from_dict
+from .persistence import atomic_open
+
+MAGIC = b"WFPROJ"
+VERSION = 1
+NO_STRING = 0xFFFFFFFF
+NO_ID = -1
+
+# Record flags: the number was an int in the JSON form.
+_INT_DURATION = 1
+_INT_DELAY = 2
+_INT_LAG = 4
+
+_HEADER = struct.Struct("<6sH11QI4x")
+_PHASE = struct.Struct("<qIIQQddQQ")
+_TASK = struct.Struct("<qIIdBBdQIQII")
+_SUBTASK = struct.Struct("<qIdBBQII")
+_LINK = struct.Struct("<qBBd")
+
+_TASK_KEYS = frozenset(("id", "title", "durationDays", "assignee", "completed", "levelingDelay", "subtasks",
+                        "dependencies"))
+_SUBTASK_KEYS = frozenset(("id", "title", "durationDays", "completed", "dependencies"))
+_KIND_CODES = {kind: code for code, kind in enumerate(DEPENDENCY_KINDS)}
+
+
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+        self.offsets = [0]
+        self.data = bytearray()
+
+    def add(self, value):
+        if value is None:
+            return NO_STRING
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.offsets) - 1
+            self.data += value.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return code
+
+    def extra(self, data, core):
+        extra = {key: value for key, value in data.items() if key not in core}
+        return self.add(json.dumps(extra, ensure_ascii=False, separators=(",", ":"))) if extra else NO_STRING
+
+
+def _number(value, flag):
+    return float(value), flag if type(value) is int else 0
+
+
+def write_binary(path, data):
+    """Write a project in its to_dict() form to `path` atomically."""
+    strings = _StringTable()
+    phases = bytearray()
+    tasks = bytearray()
+    subtasks = bytearray()
+    links = bytearray()
+    task_count = subtask_count = link_count = 0
+
+    def add_links(items):
+        nonlocal links, link_count
+        for d in items:
+            lag, flags = _number(d.get('lag', 0), _INT_LAG)
+            links += _LINK.pack(d['id'], _KIND_CODES[d.get('type', 'FS')], flags, lag)
+        link_count += len(items)
+        return link_count - len(items), len(items)
+
+    for p_data in data.get("phases", []):
+        first_task = task_count
+        totals = [0, 0, 0, 0]
+        for t_data in p_data.get("tasks", []):
+            duration, flags = _number(t_data.get("durationDays", 1), _INT_DURATION)
+            delay, delay_flag = _number(t_data.get("levelingDelay", 0), _INT_DELAY)
+            completed = bool(t_data.get("completed", False))
+            totals[0] += duration
+            if completed:
+                totals[1] += duration
+                totals[3] += 1
+            else:
+                totals[2] += 1
+            subs = t_data.get("subtasks", [])
+            tasks += _TASK.pack(t_data.get("id", NO_ID), strings.add(t_data.get("title")),
+                                strings.add(t_data.get("assignee")), duration, completed,
+                                flags | delay_flag, delay, subtask_count, len(subs),
+                                *add_links(t_data.get("dependencies", ())), strings.extra(t_data, _TASK_KEYS))
+            task_count += 1
+            for s_data in subs:
+                duration, flags = _number(s_data.get("durationDays", 1), _INT_DURATION)
+                subtasks += _SUBTASK.pack(s_data.get("id", NO_ID), strings.add(s_data.get("title")), duration,
+                                          bool(s_data.get("completed", False)), flags,
+                                          *add_links(s_data.get("dependencies", ())),
+                                          strings.extra(s_data, _SUBTASK_KEYS))
+                subtask_count += 1
+        phases += _PHASE.pack(p_data.get("id", NO_ID), strings.add(p_data.get("name")),
+                              strings.add(p_data.get("description")), first_task, task_count - first_task,
+                              *totals)
+    info = {key: value for key, value in data.items() if key != "phases"}
+    info_code = strings.add(json.dumps(info, ensure_ascii=False, separators=(",", ":")))
+    offsets = struct.pack(f"<{len(strings.offsets)}Q", *strings.offsets)
+
+    sections = [phases, tasks, subtasks, links, offsets, strings.data]
+    starts = []
+    position = _HEADER.size
+    for section in sections:
+        starts.append(position)
+        position = (position + len(section) + 7) & ~7
+    header = _HEADER.pack(MAGIC, VERSION, len(phases) // _PHASE.size, task_count, subtask_count, link_count,
+                          len(strings.offsets) - 1, *starts, info_code)
+    with atomic_open(path, 'wb') as f:
+        f.write(header)
+        for start, section in zip(starts, sections):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(section)
+
+
+class Archive:
+    """Read access to a .wfb file through a read-only memory mapping."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            try:
+                self.mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError("empty project archive")
+        self.view = memoryview(self.mapped)
+        try:
+            self._read_header()
+        except ValueError:
+            # Unmap now rather than whenever the archive is collected.
+            self.view.release()
+            self.mapped.close()
+            raise
+        self.strings = {}  # code -> str, so repeated strings are decoded (and kept) once
+        self.estimates = {}  # code -> Estimate, shared like strings
+        self.unread = self.phase_count  # phases not decoded yet; see phase_read()
+
+    def _read_header(self):
+        view = self.view
+        if len(view) < _HEADER.size:
+            raise ValueError("truncated project archive")
+        (magic, version, self.phase_count, self.task_count, self.subtask_count, self.link_count, string_count,
+         self.phases_at, self.tasks_at, self.subtasks_at, self.links_at, offsets_at, data_at,
+         self.info_code) = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("not a WaterfallFlow project archive")
+        if version != VERSION:
+            raise ValueError(f"unsupported project archive version {version}")
+        if (offsets_at + 8 * (string_count + 1) > data_at or data_at > len(view)
+                or self.phases_at + _PHASE.size * self.phase_count > len(view)
+                or self.tasks_at + _TASK.size * self.task_count > len(view)
+                or self.subtasks_at + _SUBTASK.size * self.subtask_count > len(view)
+                or self.links_at + _LINK.size * self.link_count > len(view)
+                or data_at + struct.unpack_from("<Q", view, offsets_at + 8 * string_count)[0] > len(view)):
+            raise ValueError("truncated project archive")
+        self.string_offsets = view[offsets_at:offsets_at + 8 * (string_count + 1)].cast("Q")
+        self.string_data = view[data_at:]
+
+    def string(self, code):
+        if code == NO_STRING:
+            return None
+        value = self.strings.get(code)
+        if value is None:
+            offsets = self.string_offsets
+            value = self.strings[code] = str(self.string_data[offsets[code]:offsets[code + 1]], "utf-8")
+        return value
+
+    def info(self):
+        return json.loads(self.string(self.info_code))
+
+    def phase(self, index):
+        """(id, name, description, first task, task count, totals) of phase `index`."""
+        (node_id, name, description, first, count,
+         *totals) = _PHASE.unpack_from(self.view, self.phases_at + index * _PHASE.size)
+        return (None if node_id == NO_ID else node_id, self.string(name), self.string(description), first, count,
+                tuple(totals))
+
+    def _records(self, struct_, at, first, count):
+        start = at + first * struct_.size
+        return struct_.iter_unpack(self.view[start:start + count * struct_.size])
+
+    def tasks(self, first, count):
+        """Task objects for `count` task records from `first`, with their subtasks."""
+        records = list(self._records(_TASK, self.tasks_at, first, count))
+        if not records:
+            return []
+        # A phase's subtask and link records are contiguous too.
+        sub_first = records[0][7]
+        sub_records = list(self._records(_SUBTASK, self.subtasks_at, sub_first,
+                                         records[-1][7] + records[-1][8] - sub_first))
+        link_first = min(records[0][9], sub_records[0][5] if sub_records else records[0][9])
+        link_end = max(records[-1][9] + records[-1][10], sub_records[-1][5] + sub_records[-1][6] if sub_records else 0)
+        kinds = DEPENDENCY_KINDS
+        links = [Dependency(pred, kinds[kind], int(lag) if flags & _INT_LAG else lag)
+                 for pred, kind, flags, lag in self._records(_LINK, self.links_at, link_first, link_end - link_first)]
+        string = self.string
+        init = object.__setattr__
+        tasks = []
+        sub_iter = iter(sub_records)
+        for (node_id, title, assignee, duration, completed, flags, delay, _, sub_count, link_at, link_count,
+             extra) in records:
+            task = Task(string(title), int(duration) if flags & _INT_DURATION else duration, string(assignee),
+                        bool(completed))
+            if node_id != NO_ID:
+                init(task, "id", node_id)
+            if delay:
+                init(task, "delay", int(delay) if flags & _INT_DELAY else delay)
+            if link_count:
+                init(task, "dependencies", tuple(links[link_at - link_first:link_at - link_first + link_count]))
+            if extra != NO_STRING:
+                init(task, "estimate", self._estimate(extra))
+            for _ in range(sub_count):
+                s_id, s_title, s_duration, s_completed, s_flags, s_link_at, s_link_count, s_extra = next(sub_iter)
+                subtask = Subtask(string(s_title), int(s_duration) if s_flags & _INT_DURATION else s_duration,
+                                  bool(s_completed))
+                if s_id != NO_ID:
+                    init(subtask, "id", s_id)
+                if s_link_count:
+                    init(subtask, "dependencies",
+                         tuple(links[s_link_at - link_first:s_link_at - link_first + s_link_count]))
+                if s_extra != NO_STRING:
+                    init(subtask, "estimate", self._estimate(s_extra))
+                task.add_subtask(subtask)
+            tasks.append(task)
+        return tasks
+
+    def _estimate(self, code):
+        estimate = self.estimates.get(code)
+        if estimate is None:
+            data = json.loads(self.string(code))
+            estimate = self.estimates[code] = estimate_from_dict(data['estimate']) if 'estimate' in data else None
+        return estimate
+
+    def phase_read(self):
+        """Note that a phase was decoded; closes the archive after the last one."""
+        self.unread -= 1
+        if not self.unread:
+            self.close()
+
+    def close(self):
+        self.string_offsets.release()
+        self.string_data.release()
+        self.view.release()
+        self.mapped.close()
+
+
+class ArchivePhaseLoader:
+    """Phase loader that decodes the phase's records from an Archive."""
+
+    def __init__(self, archive, first, count, totals):
+        self.archive = archive
+        self.first = first
+        self.count = count
+        self.totals = totals
+
+    def __call__(self):
+        tasks = self.archive.tasks(self.first, self.count)
+        self.archive.phase_read()
+        return tasks
+
+
+def load_binary(path):
+    """Open a .wfb file; phases are decoded from the mapping when first accessed.
+
+    Raises ValueError if the file is not a project archive.
+    """
+    archive = Archive(path)
+    try:
+        project = Project.from_info(archive.info())
+        for index in range(archive.phase_count):
+            node_id, name, description, first, count, totals = archive.phase(index)
+            phase = Phase(name, description)
+            phase.id = node_id
+            phase.set_loader(ArchivePhaseLoader(archive, first, count, totals))
+            project.add_phase(phase)
+    except BaseException:
+        archive.close()
+        raise
+    if not archive.phase_count:
+        archive.close()
+    return project
@@ -0,0 +1,448 @@
+"""Columnar project store: one NumPy array per field instead of one object per node.
+
+ColumnarProject keeps a plan as struct-of-arrays so analytics (totals,
+percent complete, per-assignee load) are vectorised reductions rather than
+walks over nested Task/Subtask lists. Tasks are stored phase by phase and
+subtasks task by task, so each parent owns a contiguous range described by
+an offsets array:
+
+    tasks of phase p      task_start[p]:task_start[p + 1]
+    subtasks of task t    subtask_start[t]:subtask_start[t + 1]
+
+Durations are int64 for whole-day plans and float64 otherwise. Node ids
+are kept in `phase_ids`, `task_id` and `subtask_id`, with -1 for none;
+dependencies, leveling delays and estimates, which few nodes have, in
+dicts keyed by row.
+Assignees are dictionary encoded: `task_assignee` holds a code from
+`assignee_pool`, a StringPool. TaskView/SubtaskView expose the familiar attribute API over a
+single row and write field edits straight back into the arrays. The layout
+is fixed once built; structural edits go through to_project(), which
+returns a regular observable Project.
+
+Requires NumPy, which the rest of the package does not.
+"""
+
+import numpy as np
+
+from .model import dependencies_from_list, dependencies_to_list, estimate_from_dict, estimate_to_dict
+from .persistence import build_project
+from .pool import StringPool
+
+
+class SubtaskView:
+    """A Subtask-like view of one row of a ColumnarProject."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def task(self):
+        return TaskView(self.store, int(self.store.subtask_parent[self.index]))
+
+    @property
+    def id(self):
+        return _node_id(self.store.subtask_id[self.index])
+
+    @property
+    def title(self):
+        return self.store.subtask_titles[self.index]
+
+    @title.setter
+    def title(self, value):
+        self.store.subtask_titles[self.index] = value
+
+    @property
+    def duration(self):
+        return self.store.subtask_duration[self.index].item()
+
+    @duration.setter
+    def duration(self, value):
+        self.store.set_duration("subtask_duration", self.index, value)
+
+    @property
+    def completed(self):
+        return bool(self.store.subtask_completed[self.index])
+
+    @completed.setter
+    def completed(self, value):
+        self.store.subtask_completed[self.index] = value
+
+    @property
+    def dependencies(self):
+        return self.store.subtask_dependencies.get(self.index, ())
+
+    @dependencies.setter
+    def dependencies(self, value):
+        _set_sparse(self.store.subtask_dependencies, self.index, tuple(value))
+
+    @property
+    def estimate(self):
+        return self.store.subtask_estimates.get(self.index)
+
+    @estimate.setter
+    def estimate(self, value):
+        _set_sparse(self.store.subtask_estimates, self.index, value)
+
+    def to_dict(self):
+        data = {
+            "title": self.title,
+            "durationDays": self.duration,
+            "completed": self.completed
+        }
+        if self.id is not None:
+            data["id"] = self.id
+        if self.dependencies:
+            data["dependencies"] = dependencies_to_list(self.dependencies)
+        if self.estimate is not None:
+            data["estimate"] = estimate_to_dict(self.estimate)
+        return data
+
+
+class TaskView:
+    """A Task-like view of one row of a ColumnarProject."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def phase_index(self):
+        return int(self.store.task_phase[self.index])
+
+    @property
+    def id(self):
+        return _node_id(self.store.task_id[self.index])
+
+    @property
+    def title(self):
+        return self.store.task_titles[self.index]
+
+    @title.setter
+    def title(self, value):
+        self.store.task_titles[self.index] = value
+
+    @property
+    def duration(self):
+        return self.store.task_duration[self.index].item()
+
+    @duration.setter
+    def duration(self, value):
+        self.store.set_duration("task_duration", self.index, value)
+
+    @property
+    def assignee(self):
+        return self.store.assignees[self.store.task_assignee[self.index]]
+
+    @assignee.setter
+    def assignee(self, value):
+        self.store.task_assignee[self.index] = self.store.assignee_pool.id(value)
+
+    @property
+    def completed(self):
+        return bool(self.store.task_completed[self.index])
+
+    @completed.setter
+    def completed(self, value):
+        self.store.task_completed[self.index] = value
+
+    @property
+    def dependencies(self):
+        return self.store.task_dependencies.get(self.index, ())
+
+    @dependencies.setter
+    def dependencies(self, value):
+        _set_sparse(self.store.task_dependencies, self.index, tuple(value))
+
+    @property
+    def delay(self):
+        return self.store.task_delays.get(self.index, 0)
+
+    @delay.setter
+    def delay(self, value):
+        _set_sparse(self.store.task_delays, self.index, value)
+
+    @property
+    def estimate(self):
+        return self.store.task_estimates.get(self.index)
+
+    @estimate.setter
+    def estimate(self, value):
+        _set_sparse(self.store.task_estimates, self.index, value)
+
+    @property
+    def subtasks(self):
+        start, stop = self.store.subtask_start[self.index:self.index + 2]
+        return [SubtaskView(self.store, i) for i in range(start, stop)]
+
+    def to_dict(self):
+        data = {
+            "title": self.title,
+            "durationDays": self.duration,
+            "assignee": self.assignee,
+            "completed": self.completed,
+            "subtasks": [s.to_dict() for s in self.subtasks]
+        }
+        if self.id is not None:
+            data["id"] = self.id
+        if self.dependencies:
+            data["dependencies"] = dependencies_to_list(self.dependencies)
+        if self.delay:
+            data["levelingDelay"] = self.delay
+        if self.estimate is not None:
+            data["estimate"] = estimate_to_dict(self.estimate)
+        return data
+
+
+class ColumnarProject:
+    def __init__(self, name="New Project", description=""):
+        self.name = name
+        self.description = description
+        self.next_id = 1
+        self.info = {}  # other project-level fields (start date, calendars)
+        self.phase_names = []
+        self.phase_descriptions = []
+        self.phase_ids = []
+        self.assignee_pool = StringPool()
+
+        self.task_start = np.zeros(1, dtype=np.int64)
+        self.task_id = np.zeros(0, dtype=np.int64)
+        self.task_phase = np.zeros(0, dtype=np.int32)
+        self.task_duration = np.zeros(0, dtype=np.int64)
+        self.task_completed = np.zeros(0, dtype=np.bool_)
+        self.task_assignee = np.zeros(0, dtype=np.int32)
+        self.task_titles = []
+        self.task_dependencies = {}
+        self.task_delays = {}
+        self.task_estimates = {}
+
+        self.subtask_start = np.zeros(1, dtype=np.int64)
+        self.subtask_id = np.zeros(0, dtype=np.int64)
+        self.subtask_parent = np.zeros(0, dtype=np.int32)
+        self.subtask_duration = np.zeros(0, dtype=np.int64)
+        self.subtask_completed = np.zeros(0, dtype=np.bool_)
+        self.subtask_titles = []
+        self.subtask_dependencies = {}
+        self.subtask_estimates = {}
+
+    # ------------------------------------------------------------------
+    # Building and converting
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_dict(cls, data):
+        """Build from the JSON project structure used by save_project()."""
+        phases = [(p.get('name', 'Untitled Phase'), p.get('description', ''), p.get('id'), p.get('tasks', []))
+                  for p in data.get('phases', [])]
+        info = {key: value for key, value in data.items() if key != 'phases'}
+        return cls._build(info, phases, _task_fields_from_dict)
+
+    @classmethod
+    def from_project(cls, project):
+        phases = [(p.name, p.description, p.id, p.tasks) for p in project.phases]
+        return cls._build(project.info_dict(), phases, _task_fields_from_task)
+
+    @classmethod
+    def _build(cls, info, phases, task_fields):
+        store = cls(info.get('name', 'Untitled Project'), info.get('description', ''))
+        store.next_id = info.get('nextId', 1)
+        store.info = info
+        assignee_id = store.assignee_pool.id
+        task_start, task_id, task_phase, task_duration, task_completed, task_assignee = [0], [], [], [], [], []
+        subtask_start, subtask_id, subtask_parent, subtask_duration, subtask_completed = [0], [], [], [], []
+        task_titles, subtask_titles = store.task_titles, store.subtask_titles
+
+        for phase_index, (phase_name, phase_description, phase_id, tasks) in enumerate(phases):
+            store.phase_names.append(phase_name)
+            store.phase_descriptions.append(phase_description)
+            store.phase_ids.append(phase_id)
+            for task in tasks:
+                node_id, title, duration, assignee, completed, deps, delay, estimate, subtasks = task_fields(task)
+                task_index = len(task_titles)
+                if deps:
+                    store.task_dependencies[task_index] = deps
+                if delay:
+                    store.task_delays[task_index] = delay
+                if estimate is not None:
+                    store.task_estimates[task_index] = estimate
+                task_id.append(-1 if node_id is None else node_id)
+                task_titles.append(title)
+                task_phase.append(phase_index)
+                task_duration.append(duration)
+                task_completed.append(completed)
+                task_assignee.append(assignee_id(assignee))
+                for st_id, st_title, st_duration, st_completed, st_deps, st_estimate in subtasks:
+                    if st_deps:
+                        store.subtask_dependencies[len(subtask_titles)] = st_deps
+                    if st_estimate is not None:
+                        store.subtask_estimates[len(subtask_titles)] = st_estimate
+                    subtask_id.append(-1 if st_id is None else st_id)
+                    subtask_titles.append(st_title)
+                    subtask_parent.append(task_index)
+                    subtask_duration.append(st_duration)
+                    subtask_completed.append(st_completed)
+                subtask_start.append(len(subtask_titles))
+            task_start.append(len(task_titles))
+
+        store.task_start = np.array(task_start, dtype=np.int64)
+        store.task_id = np.array(task_id, dtype=np.int64)
+        store.task_phase = np.array(task_phase, dtype=np.int32)
+        store.task_duration = _durations(task_duration)
+        store.task_completed = np.array(task_completed, dtype=np.bool_)
+        store.task_assignee = np.array(task_assignee, dtype=np.int32)
+        store.subtask_start = np.array(subtask_start, dtype=np.int64)
+        store.subtask_id = np.array(subtask_id, dtype=np.int64)
+        store.subtask_parent = np.array(subtask_parent, dtype=np.int32)
+        store.subtask_duration = _durations(subtask_duration)
+        store.subtask_completed = np.array(subtask_completed, dtype=np.bool_)
+        return store
+
+    def to_dict(self):
+        phases = []
+        for p in range(len(self.phase_names)):
+            phase = {
+                "name": self.phase_names[p],
+                "description": self.phase_descriptions[p],
+                "tasks": [t.to_dict() for t in self.phase_tasks(p)]
+            }
+            if self.phase_ids[p] is not None:
+                phase["id"] = self.phase_ids[p]
+            phases.append(phase)
+        data = dict(self.info, name=self.name, description=self.description, nextId=self.next_id)
+        data["phases"] = phases
+        return data
+
+    def to_project(self):
+        """Return an equivalent observable Project for editing in the GUI."""
+        return build_project(self.to_dict())
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+    @property
+    def assignees(self):
+        """Assignee names, indexed by their code in `task_assignee`."""
+        return self.assignee_pool.strings
+
+    def set_duration(self, column, index, value):
+        """Store `value` in a duration column, widening it to float if needed."""
+        array = getattr(self, column)
+        if array.dtype.kind in "iu" and value != int(value):
+            array = array.astype(np.float64)
+            setattr(self, column, array)
+        array[index] = value
+
+    @property
+    def task_count(self):
+        return len(self.task_titles)
+
+    @property
+    def subtask_count(self):
+        return len(self.subtask_titles)
+
+    def task(self, index):
+        return TaskView(self, index)
+
+    def subtask(self, index):
+        return SubtaskView(self, index)
+
+    def phase_tasks(self, phase_index):
+        start, stop = self.task_start[phase_index:phase_index + 2]
+        return [TaskView(self, i) for i in range(start, stop)]
+
+    # ------------------------------------------------------------------
+    # Rollups
+    # ------------------------------------------------------------------
+    def total_duration(self):
+        return float(self.task_duration.sum())
+
+    def completed_duration(self):
+        return float(self.task_duration[self.task_completed].sum())
+
+    def percent_complete(self):
+        """Share of task duration marked completed, 0-100."""
+        total = self.total_duration()
+        return 100.0 * self.completed_duration() / total if total else 0.0
+
+    def phase_durations(self):
+        """Total task duration per phase, indexed like phase_names."""
+        return np.bincount(self.task_phase, weights=self.task_duration,
+                           minlength=len(self.phase_names))
+
+    def phase_percent_complete(self):
+        totals = self.phase_durations()
+        done = np.bincount(self.task_phase, weights=self.task_duration * self.task_completed,
+                           minlength=len(self.phase_names))
+        return np.divide(100.0 * done, totals, out=np.zeros(len(totals)), where=totals > 0)
+
+    def assignee_load(self, open_only=False):
+        """Map each assignee to their summed task duration."""
+        weights = self.task_duration
+        if open_only:
+            weights = weights * ~self.task_completed
+        load = np.bincount(self.task_assignee, weights=weights, minlength=len(self.assignees))
+        return dict(zip(self.assignees, load.tolist()))
+
+    def subtask_durations(self):
+        """Summed subtask duration for every task."""
+        return np.bincount(self.subtask_parent, weights=self.subtask_duration,
+                           minlength=self.task_count)
+
+    def subtask_percent_complete(self):
+        """Per-task share of subtask duration completed; 0 where a task has none."""
+        totals = self.subtask_durations()
+        done = np.bincount(self.subtask_parent, weights=self.subtask_duration * self.subtask_completed,
+                           minlength=self.task_count)
+        return np.divide(100.0 * done, totals, out=np.zeros(len(totals)), where=totals > 0)
+
+
+def _durations(values):
+    # Whole-day plans stay integer so to_dict() round-trips exactly.
+    array = np.array(values) if values else np.zeros(0, dtype=np.int64)
+    if array.dtype.kind not in "iuf":
+        array = array.astype(np.float64)
+    return array
+
+
+def _node_id(value):
+    return None if value < 0 else int(value)
+
+
+def _set_sparse(mapping, index, value):
+    if value:
+        mapping[index] = value
+    else:
+        mapping.pop(index, None)
+
+
+def _task_fields_from_dict(data):
+    subtasks = [(st.get('id'),
+                 st.get('title', 'Untitled Subtask'),
+                 st.get('durationDays', st.get('duration', 1)),
+                 st.get('completed', False),
+                 dependencies_from_list(st.get('dependencies', ())),
+                 _estimate(st))
+                for st in data.get('subtasks', [])]
+    return (data.get('id'),
+            data.get('title', 'Untitled Task'),
+            data.get('durationDays', data.get('duration', 1)),
+            data.get('assignee', 'Unassigned'),
+            data.get('completed', False),
+            dependencies_from_list(data.get('dependencies', ())),
+            data.get('levelingDelay', 0),
+            _estimate(data),
+            subtasks)
+
+
+def _task_fields_from_task(task):
+    subtasks = [(st.id, st.title, st.duration, st.completed, st.dependencies, st.estimate)
+                for st in task.subtasks]
+    return (task.id, task.title, task.duration, task.assignee, task.completed, task.dependencies, task.delay,
+            task.estimate, subtasks)
+
+
+def _estimate(data):
+    return estimate_from_dict(data['estimate']) if 'estimate' in data else None
@@ -0,0 +1,330 @@
+"""Append-only edit journal for JSON project files.
+
+Saving a JSON project rewrites the whole document. A Journal instead
+appends each model change to a segment file next to it ("plan.json.0.wfj",
+"plan.json.1.wfj", ...), one line per change::
+
+    <CRC-32 of the record, 8 hex digits> <record as compact JSON>
+
+The first line of a segment is a header {"magic", "format", "id", "seq"};
+the records after it are::
+
+    ["c", node id, field, value]           field assignment
+    ["a", parent id, field, index, dict]   child added, as its to_dict()
+    ["r", parent id, field, child id]      child removed
+
+where the project itself has id null. Recording a change only encodes it
+into memory; a background thread writes and fsyncs what has accumulated
+every `interval` seconds, so a crash loses at most that much.
+
+The JSON file is the checkpoint. It carries a "journal" entry {"id", "seq"}
+naming its journal and the first segment not folded into it, and
+open_journal() replays the segments from there. checkpoint() starts the
+next segment and returns a stamped snapshot to save in the background --
+the compaction; once it is written, discard_segments() deletes the
+segments it folded in. A crash at any point leaves either the old
+checkpoint with all its segments or the new one with the new segment.
+
+A file saved without a journal has no stamp; a journal started on it
+records the file's size and mtime in its first header ("base") instead.
+A record torn by a crash is cut off when the file is next opened.
+"""
+
+import json
+import os
+import threading
+import uuid
+import zlib
+from collections import namedtuple
+
+from .model import (
+    ADDED, CHANGED, Phase, Subtask, Task, dependencies_from_list, dependencies_to_list, estimate_from_dict,
+    estimate_to_dict,
+)
+from .persistence import read_project_file
+from .pool import StringPool
+
+MAGIC = "WFJOURNAL"
+FORMAT = 1
+SUFFIX = ".wfj"
+FLUSH_INTERVAL = 0.05
+COMPACT_BYTES = 4 * 2**20
+
+# Fields whose values are not plain JSON, as (encode, decode).
+_CODECS = {
+    "dependencies": (dependencies_to_list, dependencies_from_list),
+    "estimate": (lambda e: None if e is None else estimate_to_dict(e),
+                 lambda d: None if d is None else estimate_from_dict(d)),
+}
+
+_ADD = {"phases": "add_phase", "tasks": "add_task", "subtasks": "add_subtask"}
+_REMOVE = {"phases": "remove_phase", "tasks": "remove_task", "subtasks": "remove_subtask"}
+
+# ends[k] is the file offset just after the header and k records.
+Segment = namedtuple("Segment", "path header records ends torn")
+
+
+def segment_path(path, seq):
+    return f"{path}.{seq}{SUFFIX}"
+
+
+def _identity(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _segment_paths(path):
+    """{seq: file path} of the journal segments next to `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    prefix = os.path.basename(path) + "."
+    found = {}
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(SUFFIX):
+            seq = name[len(prefix):-len(SUFFIX)]
+            if seq.isdigit():
+                found[int(seq)] = os.path.join(directory, name)
+    return found
+
+
+def _encode(record):
+    payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+
+def _read_segment(path):
+    """Segment of the records up to the first torn or corrupt line."""
+    with open(path, "rb") as f:
+        data = f.read()
+    header = None
+    records = []
+    ends = []
+    end = 0
+    while end < len(data):
+        newline = data.find(b"\n", end)
+        if newline < 0:
+            break
+        line = data[end:newline]
+        try:
+            if line[8:9] != b" " or int(line[:8], 16) != zlib.crc32(line[9:]):
+                break
+            record = json.loads(line[9:])
+        except ValueError:
+            break
+        if header is None:
+            if not isinstance(record, dict) or record.get("magic") != MAGIC or record.get("format") != FORMAT:
+                break
+            header = record
+        else:
+            records.append(record)
+        end = newline + 1
+        ends.append(end)
+    return Segment(path, header, records, ends, end < len(data))
+
+
+def _phase_from_dict(data, pool):
+    phase = Phase(data.get('name'), data.get('description'))
+    phase.id = data.get('id')
+    for t_data in data.get('tasks', []):
+        phase.add_task(Task.from_dict(t_data, pool))
+    return phase
+
+
+_BUILD = {"phases": _phase_from_dict, "tasks": Task.from_dict, "subtasks": Subtask.from_dict}
+
+
+def _apply(project, record, pool):
+    kind, node_id, field = record[:3]
+    node = project if node_id is None else project.find(node_id)
+    if node is None:
+        raise ValueError(f"journal refers to unknown node {node_id}")
+    if kind == "c":
+        codec = _CODECS.get(field)
+        setattr(node, field, codec[1](record[3]) if codec else record[3])
+    elif kind == "a":
+        getattr(node, _ADD[field])(_BUILD[field](record[4], pool), record[3])
+    elif kind == "r":
+        child = project.find(record[3])
+        if child is None or child.parent is not node:
+            raise ValueError(f"journal removes unknown node {record[3]}")
+        getattr(node, _REMOVE[field])(child)
+    else:
+        raise ValueError(f"unknown journal record {kind!r}")
+
+
+def open_journal(path, progress=None, cancelled=None):
+    """Load the checkpoint at `path`, replay its journal and keep journaling.
+
+    Returns the Journal; its `project` is the recovered project and
+    `recovered` the number of changes replayed. See read_project for the
+    callbacks.
+    """
+    identity = _identity(path)
+    project, info = read_project_file(path, progress, cancelled)
+    stamp = info.get("journal")
+
+    segments = {seq: _read_segment(p) for seq, p in _segment_paths(path).items()}
+    if stamp:
+        journal_id, first = stamp["id"], stamp["seq"]
+    else:
+        journal_id, first = None, 0
+        for seq, segment in sorted(segments.items()):
+            if segment.header and segment.header.get("base") == identity:
+                journal_id, first = segment.header["id"], seq
+                break
+
+    pool = StringPool()
+    recovered = 0
+    seq = first
+    chain = []
+    while journal_id is not None and seq in segments:
+        segment = segments[seq]
+        if not segment.header or segment.header["id"] != journal_id:
+            break
+        chain.append(seq)
+        applied = 0
+        try:
+            for record in segment.records:
+                _apply(project, record, pool)
+                applied += 1
+        except (ValueError, LookupError, TypeError):
+            pass
+        recovered += applied
+        if segment.torn or applied < len(segment.records):
+            # Cut the segment after its last good change; anything after
+            # it depended on what was lost.
+            with open(segment.path, "r+b") as f:
+                f.truncate(segment.ends[applied])
+            break
+        seq += 1
+    for stale in segments.keys() - set(chain):
+        os.unlink(segments[stale].path)
+
+    if journal_id is None:
+        journal = Journal(project, path, uuid.uuid4().hex, 0, base=identity)
+    elif chain:
+        journal = Journal(project, path, journal_id, chain[-1], append=True)
+    else:
+        journal = Journal(project, path, journal_id, first)
+    journal.recovered = recovered
+    return journal
+
+
+class Journal:
+    """Records every change of `project` in the journal of the file at `path`."""
+
+    def __init__(self, project, path, journal_id, seq, base=None, append=False, interval=FLUSH_INTERVAL):
+        self.project = project
+        self.path = path
+        self.id = journal_id
+        self.recovered = 0
+        self.lock = threading.Lock()  # guards `pending`, taken by every change
+        self.io_lock = threading.Lock()  # guards the segment file
+        self.pending = []
+        self._open_segment(seq, base, append)
+        self.stopped = threading.Event()
+        self.flusher = threading.Thread(target=self._flush_loop, args=(interval,), daemon=True)
+        self.flusher.start()
+        project.subscribe(self.on_model_changed)
+
+    @classmethod
+    def start(cls, project, path):
+        """New journal for saving `project` to `path`; save snapshot() there."""
+        return cls(project, path, uuid.uuid4().hex, 0)
+
+    def _open_segment(self, seq, base=None, append=False):
+        # The journal only moves to the new segment once it is on disk, so
+        # an OSError here leaves it writing where it was.
+        if append:
+            file = open(segment_path(self.path, seq), "ab")
+        else:
+            file = open(segment_path(self.path, seq), "wb")
+            header = {"magic": MAGIC, "format": FORMAT, "id": self.id, "seq": seq}
+            if base is not None:
+                header["base"] = base
+            try:
+                file.write(_encode(header))
+                file.flush()
+                os.fsync(file.fileno())
+            except OSError:
+                file.close()
+                raise
+        self.seq, self.file, self.size = seq, file, file.tell()
+
+    def on_model_changed(self, event):
+        node = event.node
+        if event.kind == CHANGED:
+            codec = _CODECS.get(event.field)
+            record = ["c", node.id, event.field, codec[0](event.new) if codec else event.new]
+        elif event.kind == ADDED:
+            record = ["a", node.id, event.field, event.index, event.new.to_dict()]
+        else:
+            record = ["r", node.id, event.field, event.old.id]
+        line = _encode(record)
+        with self.lock:
+            self.pending.append(line)
+
+    def _write_pending(self):
+        # Caller holds io_lock.
+        with self.lock:
+            lines, self.pending = self.pending, []
+        if lines:
+            data = b"".join(lines)
+            self.file.write(data)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.size += len(data)
+
+    def _flush_loop(self, interval):
+        while not self.stopped.wait(interval):
+            with self.io_lock:
+                if not self.file.closed:
+                    self._write_pending()
+
+    def sync(self):
+        """Write and fsync every change recorded so far."""
+        with self.io_lock:
+            self._write_pending()
+
+    def should_compact(self):
+        return self.size >= COMPACT_BYTES
+
+    def snapshot(self, data=None):
+        """project.to_dict() stamped as the checkpoint of the current segment.
+
+        `data` is that dict if the caller already built it, e.g. with a
+        SnapshotBuilder that finished since the last change.
+        """
+        data = self.project.to_dict() if data is None else data
+        data["journal"] = {"id": self.id, "seq": self.seq}
+        return data
+
+    def checkpoint(self, data=None):
+        """Start the next segment and return the snapshot that folds in the earlier ones.
+
+        Must run on the thread that owns the project, with no change since
+        `data` was built (see snapshot()). Write the snapshot to `path`
+        (e.g. with a ProjectSaveWorker), then call
+        discard_segments(snapshot["journal"]["seq"]). Raises OSError if the
+        next segment cannot be created; journaling then goes on in the
+        current one.
+        """
+        with self.io_lock:
+            self._write_pending()
+            previous = self.file
+            self._open_segment(self.seq + 1)
+            previous.close()
+        return self.snapshot(data)
+
+    def discard_segments(self, before):
+        """Delete the segments a written checkpoint folded in."""
+        for seq, file_path in _segment_paths(self.path).items():
+            if seq < before:
+                os.unlink(file_path)
+
+    def close(self):
+        self.project.unsubscribe(self.on_model_changed)
+        self.stopped.set()
+        self.flusher.join()
+        with self.io_lock:
+            self._write_pending()
+            self.file.close()
@@ -0,0 +1,436 @@
+"""Observable project data model: Project > Phase > Task > Subtask."""
+
+from collections import namedtuple
+
+# Change notifications. `kind` is CHANGED for a field assignment (`field`,
+# `old`, `new`), ADDED/REMOVED for a child list edit (`field` is the list
+# name, the child is `new`/`old`, `index` its position).
+CHANGED, ADDED, REMOVED = "changed", "added", "removed"
+ChangeEvent = namedtuple("ChangeEvent", "kind node field old new index")
+
+# A scheduling link from the node with id `pred` to the node holding it.
+# FS: start after pred finishes, SS: start after pred starts, FF: finish
+# after pred finishes; `lag` days are added to the constraint. Tasks and
+# subtasks keep a tuple of these in `dependencies`, replaced as a whole.
+FS, SS, FF = "FS", "SS", "FF"
+DEPENDENCY_KINDS = (FS, SS, FF)
+Dependency = namedtuple("Dependency", "pred kind lag")
+
+
+def dependencies_from_list(items):
+    return tuple(Dependency(d['id'], d.get('type', FS), d.get('lag', 0)) for d in items)
+
+
+def dependencies_to_list(dependencies):
+    return [{"id": d.pred, "type": d.kind, "lag": d.lag} for d in dependencies]
+
+
+# An optional three-point duration estimate for risk simulation (see
+# waterfallflow.montecarlo); `duration` stays the planned value.
+Estimate = namedtuple("Estimate", "optimistic likely pessimistic")
+
+
+def estimate_from_dict(data):
+    return Estimate(data['optimistic'], data['mostLikely'], data['pessimistic'])
+
+
+def estimate_to_dict(estimate):
+    return {"optimistic": estimate.optimistic, "mostLikely": estimate.likely,
+            "pessimistic": estimate.pessimistic}
+
+
+class ModelNode:
+    """Base class for model objects that publish their changes.
+
+    Assigning one of OBSERVED, or going through the add_*/remove_* child
+    methods, emits a ChangeEvent to the node's subscribers and then to each
+    ancestor's, so subscribing to the Project sees every edit in the plan.
+
+    Every node has an `id`, unique within its Project and saved with it.
+    Nodes get one when first attached to a project if they have none yet;
+    attaching a node whose id another node already has raises ValueError,
+    since links and stored rows refer to nodes by id. Project.find()
+    resolves an id in O(1).
+
+    All model classes use __slots__ to keep large plans compact (see
+    benchmarks/bench_memory.py). Constructors fill their slots with
+    object.__setattr__, since a fresh node has nobody to notify.
+    """
+
+    __slots__ = ("parent", "listeners", "id")
+
+    OBSERVED = ()
+
+    def __setattr__(self, name, value):
+        # Detached nodes without subscribers (e.g. while being built) have
+        # nobody to notify, so they skip change tracking entirely.
+        if name in self.OBSERVED and (self.parent is not None or self.listeners):
+            old = getattr(self, name, value)
+            object.__setattr__(self, name, value)
+            if old != value:
+                self.emit(ChangeEvent(CHANGED, self, name, old, value, -1))
+        else:
+            object.__setattr__(self, name, value)
+
+    def subscribe(self, callback):
+        if self.listeners is None:
+            self.listeners = []
+        self.listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if self.listeners and callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def emit(self, event):
+        node = self
+        while node is not None:
+            if node.listeners:
+                for callback in tuple(node.listeners):
+                    callback(event)
+            node = node.parent
+
+    def _add_child(self, field, child, index=None):
+        children = getattr(self, field)
+        if index is None:
+            index = len(children)
+            children.append(child)
+        else:
+            children.insert(index, child)
+        object.__setattr__(child, "parent", self)
+        try:
+            self._attached(child)
+        except ValueError:
+            del children[index]
+            object.__setattr__(child, "parent", None)
+            raise
+        if self.parent is not None or self.listeners:
+            self.emit(ChangeEvent(ADDED, self, field, None, child, index))
+        return child
+
+    def _remove_child(self, field, child, index=None):
+        children = getattr(self, field)
+        if index is None or children[index] is not child:
+            index = children.index(child)
+        del children[index]
+        object.__setattr__(child, "parent", None)
+        self._detached(child)
+        self.emit(ChangeEvent(REMOVED, self, field, child, None, index))
+        return index
+
+    def _attached(self, node):
+        # Passed up to the Project, which indexes `node` and its children.
+        if self.parent is not None:
+            self.parent._attached(node)
+
+    def _detached(self, node):
+        if self.parent is not None:
+            self.parent._detached(node)
+
+    def children(self):
+        """Child nodes already in memory (never triggers a lazy load)."""
+        return ()
+
+
+class Subtask(ModelNode):
+    __slots__ = ("title", "duration", "completed", "dependencies", "estimate")
+
+    OBSERVED = ("title", "duration", "completed", "dependencies", "estimate")
+
+    def __init__(self, title, duration, completed=False):
+        init = object.__setattr__
+        init(self, "parent", None)
+        init(self, "listeners", None)
+        init(self, "id", None)
+        init(self, "title", title)
+        init(self, "duration", duration)
+        init(self, "completed", completed)
+        init(self, "dependencies", ())
+        init(self, "estimate", None)
+
+    @classmethod
+    def from_dict(cls, data, pool=None):
+        title = data.get('title', 'Untitled Subtask')
+        if pool is not None:
+            title = pool.intern(title)
+        subtask = cls(
+            title=title,
+            duration=data.get('durationDays', data.get('duration', 1)),
+            completed=data.get('completed', False)
+        )
+        object.__setattr__(subtask, "id", data.get('id'))
+        if 'dependencies' in data:
+            object.__setattr__(subtask, "dependencies", dependencies_from_list(data['dependencies']))
+        if 'estimate' in data:
+            object.__setattr__(subtask, "estimate", estimate_from_dict(data['estimate']))
+        return subtask
+
+    def to_dict(self):
+        data = {
+            "title": self.title,
+            "durationDays": self.duration,
+            "completed": self.completed
+        }
+        if self.id is not None:
+            data["id"] = self.id
+        if self.dependencies:
+            data["dependencies"] = dependencies_to_list(self.dependencies)
+        if self.estimate is not None:
+            data["estimate"] = estimate_to_dict(self.estimate)
+        return data
+
+
+class Task(ModelNode):
+    __slots__ = ("title", "duration", "assignee", "completed", "dependencies", "delay", "estimate", "subtasks")
+
+    # `delay` is the leveling delay: days the task starts after its
+    # dependencies allow (see waterfallflow.resources).
+    OBSERVED = ("title", "duration", "assignee", "completed", "dependencies", "delay", "estimate")
+
+    def __init__(self, title, duration, assignee="Unassigned", completed=False):
+        init = object.__setattr__
+        init(self, "parent", None)
+        init(self, "listeners", None)
+        init(self, "id", None)
+        init(self, "title", title)
+        init(self, "duration", duration)
+        init(self, "assignee", assignee)
+        init(self, "completed", completed)
+        init(self, "dependencies", ())
+        init(self, "delay", 0)
+        init(self, "estimate", None)
+        init(self, "subtasks", [])
+
+    def add_subtask(self, subtask, index=None):
+        return self._add_child("subtasks", subtask, index)
+
+    def remove_subtask(self, subtask, index=None):
+        return self._remove_child("subtasks", subtask, index)
+
+    def children(self):
+        return self.subtasks
+
+    @classmethod
+    def from_dict(cls, data, pool=None):
+        """Build a task; with a StringPool, repeated titles and assignees are shared."""
+        title = data.get('title', 'Untitled Task')
+        assignee = data.get('assignee', 'Unassigned')
+        if pool is not None:
+            title = pool.intern(title)
+            assignee = pool.intern(assignee)
+        task = cls(
+            title=title,
+            duration=data.get('durationDays', data.get('duration', 1)),
+            assignee=assignee,
+            completed=data.get('completed', False)
+        )
+        object.__setattr__(task, "id", data.get('id'))
+        if 'dependencies' in data:
+            object.__setattr__(task, "dependencies", dependencies_from_list(data['dependencies']))
+        if 'levelingDelay' in data:
+            object.__setattr__(task, "delay", data['levelingDelay'])
+        if 'estimate' in data:
+            object.__setattr__(task, "estimate", estimate_from_dict(data['estimate']))
+        for st_data in data.get('subtasks', []):
+            task.add_subtask(Subtask.from_dict(st_data, pool))
+        return task
+
+    def to_dict(self):
+        data = {
+            "title": self.title,
+            "durationDays": self.duration,
+            "assignee": self.assignee,
+            "completed": self.completed,
+            "subtasks": [s.to_dict() for s in self.subtasks]
+        }
+        if self.id is not None:
+            data["id"] = self.id
+        if self.dependencies:
+            data["dependencies"] = dependencies_to_list(self.dependencies)
+        if self.delay:
+            data["levelingDelay"] = self.delay
+        if self.estimate is not None:
+            data["estimate"] = estimate_to_dict(self.estimate)
+        return data
+
+
+class Phase(ModelNode):
+    __slots__ = ("name", "description", "_tasks", "loader")
+
+    OBSERVED = ("name", "description")
+
+    def __init__(self, name, description):
+        init = object.__setattr__
+        init(self, "parent", None)
+        init(self, "listeners", None)
+        init(self, "id", None)
+        init(self, "name", name)
+        init(self, "description", description)
+        init(self, "_tasks", [])
+        init(self, "loader", None)
+
+    @property
+    def tasks(self):
+        if self.loader is not None:
+            self._load()
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks):
+        self.loader = None
+        self._tasks = tasks
+
+    def set_loader(self, loader):
+        """Defer building the task list until `tasks` is first accessed.
+
+        `loader()` returns the list of Task objects; they are attached to
+        this phase without emitting events.
+        """
+        self._tasks = []
+        self.loader = loader
+
+    def _load(self):
+        loader, self.loader = self.loader, None
+        tasks = loader()
+        for task in tasks:
+            object.__setattr__(task, "parent", self)
+        self._tasks = tasks
+        if self.parent is not None:
+            for task in tasks:
+                self.parent._attached(task)
+
+    def add_task(self, task, index=None):
+        return self._add_child("tasks", task, index)
+
+    def remove_task(self, task, index=None):
+        return self._remove_child("tasks", task, index)
+
+    def children(self):
+        return self._tasks
+
+    def to_dict(self, tasks=None):
+        """Plain-data form; `tasks` is the tasks' to_dict() list if already built."""
+        data = {
+            "name": self.name,
+            "description": self.description,
+            "tasks": [t.to_dict() for t in self.tasks] if tasks is None else tasks
+        }
+        if self.id is not None:
+            data["id"] = self.id
+        return data
+
+
+class Project(ModelNode):
+    """Root of the plan.
+
+    `start_date` is an ISO date ("2026-03-02") or None. `calendars` maps an
+    assignee name, or "default" for everyone else, to a working calendar
+    {"weekmask": "1111100", "holidays": ["2026-12-25", ...]}; both are
+    plain data here and interpreted by waterfallflow.workdays. Replace the
+    dict rather than editing it in place so the change is published.
+    """
+
+    __slots__ = ("name", "description", "start_date", "calendars", "phases", "nodes", "next_id")
+
+    OBSERVED = ("name", "description", "start_date", "calendars")
+
+    def __init__(self, name="New Project", description=""):
+        init = object.__setattr__
+        init(self, "parent", None)
+        init(self, "listeners", None)
+        init(self, "id", None)
+        init(self, "name", name)
+        init(self, "description", description)
+        init(self, "start_date", None)
+        init(self, "calendars", {})
+        init(self, "phases", [])
+        init(self, "nodes", {})  # id -> phase, task or subtask
+        init(self, "next_id", 1)
+
+    @classmethod
+    def from_info(cls, data):
+        """Project with the fields of info_dict(), and no phases yet."""
+        project = cls(data.get('name', 'Untitled'), data.get('description', ''))
+        project.next_id = data.get('nextId', 1)
+        project.start_date = data.get('startDate')
+        project.calendars = data.get('calendars', {})
+        return project
+
+    def add_phase(self, phase, index=None):
+        return self._add_child("phases", phase, index)
+
+    def remove_phase(self, phase, index=None):
+        return self._remove_child("phases", phase, index)
+
+    def children(self):
+        return self.phases
+
+    def find(self, node_id, load=False):
+        """Return the phase, task or subtask with `node_id`, or None.
+
+        Only nodes in memory are looked up, in O(1). Phases that were never
+        opened are searched, loading them one by one, only with `load`; a
+        stale or dangling id would otherwise load the whole plan.
+        """
+        node = self.nodes.get(node_id)
+        if node is None and load:
+            for phase in self.phases:
+                if phase.loader is not None:
+                    phase.tasks  # loading indexes the new tasks
+                    node = self.nodes.get(node_id)
+                    if node is not None:
+                        break
+        return node
+
+    def _attached(self, node):
+        nodes = self.nodes
+        next_id = self.next_id
+        indexed = []
+        numbered = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            node_id = node.id
+            if type(node_id) is not int:
+                node_id = self.next_id
+                object.__setattr__(node, "id", node_id)
+                numbered.append(node)
+            elif nodes.get(node_id, node) is not node:
+                # Undo the indexing so far; the caller detaches the subtree.
+                for other in indexed:
+                    del nodes[other.id]
+                for other in numbered:
+                    object.__setattr__(other, "id", None)
+                self.next_id = next_id
+                raise ValueError(f"{type(node).__name__} id {node_id} is already used by another node")
+            if node_id >= self.next_id:
+                self.next_id = node_id + 1
+            nodes[node_id] = node
+            indexed.append(node)
+            stack.extend(reversed(node.children()))
+
+    def _detached(self, node):
+        nodes = self.nodes
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if nodes.get(node.id) is node:
+                del nodes[node.id]
+            stack.extend(reversed(node.children()))
+
+    def info_dict(self):
+        """The project-level fields of to_dict(), without the phases."""
+        data = {
+            "name": self.name,
+            "description": self.description,
+            "nextId": self.next_id
+        }
+        if self.start_date is not None:
+            data["startDate"] = self.start_date
+        if self.calendars:
+            data["calendars"] = self.calendars
+        return data
+
+    def to_dict(self):
+        data = self.info_dict()
+        data["phases"] = [p.to_dict() for p in self.phases]
+        return data
@@ -0,0 +1,324 @@
+"""Monte Carlo schedule risk: sampled durations, many CPM passes at once.
+
+Tasks and subtasks with a three-point `estimate` (see model.Estimate) get a
+random duration in every iteration, drawn from a PERT (scaled beta) or a
+triangular distribution; the others keep their planned `duration`.
+Sampling is by inverse transform: each distinct distribution shape gets a
+table of its quantile function, so a draw is one uniform number and a
+table lookup instead of two gamma variates.
+
+simulate() compiles a Schedule's graph into index arrays grouped by
+dependency level, then runs the forward and backward passes for a whole
+batch of iterations as NumPy operations on (activity x iteration) arrays,
+so the Python loop runs over levels, not activities or iterations.
+Batches are spread over a pool of spawned processes; each batch has its
+own seed from one SeedSequence, so a seeded run gives the same numbers
+whatever the number of workers.
+
+The result holds the project length of every iteration, from which come
+the P50/P80/P95 finish, and each activity's criticality index: the share
+of iterations in which it lay on a critical path.
+
+Requires NumPy, like waterfallflow.columnar.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .model import FF, SS
+from .workdays import DEFAULT_CALENDAR, busday_calendar, compute_dates
+
+PERT, TRIANGULAR = "pert", "triangular"
+DISTRIBUTIONS = (PERT, TRIANGULAR)
+
+# Sampled durations are real numbers, so "zero float" allows for rounding
+# between the forward and backward sums.
+CRITICAL_TOLERANCE = 1e-6
+
+DEFAULT_PERCENTILES = (50, 80, 95)
+
+# Points in each quantile table, and in the grid its CDF is integrated on.
+QUANTILE_POINTS = 1025
+CDF_POINTS = 8193
+
+
+class Network:
+    """The arrays simulate() needs from a Schedule; small and picklable.
+
+    Activities are renumbered level by level (a level holds the activities
+    whose longest chain of predecessors has the same length), so each level
+    is a contiguous block of rows, ordered by falling in-degree. The forward
+    step for a level then takes the k-th incoming link of every activity
+    that has one -- a prefix of the block -- as one gather from the stacked
+    [early start; early finish] array, and folds it in with np.maximum.
+    Backward steps do the same over [tail; tail + duration], with each
+    level's activities ordered by falling out-degree in `order`.
+    `position` maps schedule slots to rows.
+    """
+
+    def __init__(self, schedule, distribution=PERT):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution {distribution!r}; expected one of {DISTRIBUTIONS}")
+        count = len(schedule.nodes)
+        preds, succs, delay = schedule.preds, schedule.succs, schedule.delay
+        level = [0] * count
+        for i in schedule.order:
+            for j, _, _ in preds[i]:
+                if level[j] >= level[i]:
+                    level[i] = level[j] + 1
+        levels = [[] for _ in range(max(level, default=-1) + 1)]
+        for i in range(count):
+            levels[level[i]].append(i)
+        for nodes in levels:
+            nodes.sort(key=lambda i: -len(preds[i]))
+        slots = [i for nodes in levels for i in nodes]
+        row = [0] * count
+        for r, i in enumerate(slots):
+            row[i] = r
+        bounds = [0]
+        for nodes in levels:
+            bounds.append(bounds[-1] + len(nodes))
+
+        self.count = count
+        self.position = np.array(row, dtype=np.int64)
+        self.duration = np.array([schedule.duration[i] for i in slots], dtype=np.float64)
+        self.delay = np.array([delay[i] for i in slots], dtype=np.float64)[:, None]
+        self.delayed = bool(self.delay.any())
+        self.roots = bounds[1] if levels else 0
+
+        estimated, low, likely, high = [], [], [], []
+        for r, i in enumerate(slots):
+            node = schedule.nodes[i]
+            if node.estimate is None:
+                continue
+            o, m, p = node.estimate
+            if not o <= m <= p:
+                raise ValueError(f"{node.title}: estimate must be optimistic <= most likely <= pessimistic")
+            if o == p:
+                self.duration[r] = o
+                continue
+            estimated.append(r)
+            low.append(o)
+            likely.append(m)
+            high.append(p)
+        self.estimated = np.array(estimated, dtype=np.int64)
+        low = np.array(low, dtype=np.float64)
+        span = np.array(high, dtype=np.float64) - low
+        mode = (np.array(likely, dtype=np.float64) - low) / span if estimated else low
+        shapes, shape_of = np.unique(mode, return_inverse=True)
+        self.low = low[:, None]
+        self.span = span[:, None]
+        self.table_offset = (shape_of.reshape(-1) * QUANTILE_POINTS)[:, None]
+        tables = [_quantile_table(distribution, c) for c in shapes]
+        self.quantiles = np.concatenate(tables) if estimated else None
+        self.slopes = np.concatenate([np.append(np.diff(t), 0.0) for t in tables]) if estimated else None
+
+        def forward_link(i, link):
+            j, kind, lag = link
+            return row[j] if kind == SS else count + row[j], lag, kind == FF
+
+        def backward_link(i, link):
+            k, kind, lag = link
+            return row[k] if kind == FF else count + row[k], lag + delay[k], kind == SS
+
+        self.forward = [(bounds[k], bounds[k + 1], _columns(levels[k], preds, row, forward_link))
+                        for k in range(1, len(levels))]
+        self.backward = []
+        for k in reversed(range(len(levels))):
+            nodes = sorted(levels[k], key=lambda i: -len(succs[i]))
+            order = np.array([row[i] for i in nodes], dtype=np.int64)
+            self.backward.append((order, _columns(nodes, succs, row, backward_link)))
+
+    def sample(self, rng, size):
+        """Durations for `size` iterations, as a (rows, size) array."""
+        durations = np.repeat(self.duration[:, None], size, axis=1)
+        if len(self.estimated):
+            # Linear interpolation in the quantile table at a uniform
+            # position; u < 1, so the index stays below the last point.
+            u = rng.random((len(self.low), size), dtype=np.float32)
+            u *= QUANTILE_POINTS - 1
+            index = u.astype(np.intp)
+            u -= index
+            index += self.table_offset
+            samples = self.slopes[index]
+            samples *= u
+            samples += self.quantiles[index]
+            samples *= self.span
+            samples += self.low
+            durations[self.estimated] = samples
+        return durations
+
+    def run(self, durations):
+        """Both passes over a batch; returns (project lengths, critical counts per row)."""
+        count, size = durations.shape
+        delay = self.delay
+
+        times = np.empty((2 * count, size))  # early start; early finish
+        roots = self.roots
+        times[:roots] = delay[:roots]
+        np.add(times[:roots], durations[:roots], out=times[count:count + roots])
+        for first, last, columns in self.forward:
+            start = times[first:last]
+            start[:] = 0
+            _fold(start, times, durations, columns)
+            if self.delayed:
+                start += delay[first:last]
+            np.add(start, durations[first:last], out=times[count + first:count + last])
+        length = times[count:].max(axis=0, initial=0)
+
+        back = np.empty((2 * count, size))  # tail; tail + duration
+        for order, columns in self.backward:
+            tail = np.zeros((len(order), size))
+            _fold(tail, back, durations, columns)
+            back[order] = tail
+            back[count + order] = tail + durations[order]
+
+        slack = length - back[count:]
+        slack -= times[:count]
+        return length, np.count_nonzero(slack <= CRITICAL_TOLERANCE, axis=1)
+
+
+def _quantile_table(distribution, mode):
+    """Quantile function on [0, 1] of a unit-range distribution peaking at `mode`."""
+    u = np.linspace(0.0, 1.0, QUANTILE_POINTS)
+    if distribution == TRIANGULAR:
+        return np.where(u < mode, np.sqrt(u * mode), 1 - np.sqrt((1 - u) * (1 - mode)))
+    # PERT: beta with alpha = 1 + 4 * mode, beta = 1 + 4 * (1 - mode).
+    x = np.linspace(0.0, 1.0, CDF_POINTS)
+    density = x ** (4 * mode) * (1 - x) ** (4 * (1 - mode))
+    cdf = np.concatenate(([0.0], np.cumsum((density[1:] + density[:-1]) / 2)))
+    cdf /= cdf[-1]
+    return np.interp(u, cdf, x)
+
+
+def _columns(nodes, links, row, convert):
+    """Per link position k: (prefix length, source rows, constants, adjusted positions, their rows).
+
+    `nodes` must be sorted by falling len(links[i]); `convert` maps a link
+    to (source row, constant, whether to subtract the node's duration).
+    """
+    columns = []
+    for k in range(len(links[nodes[0]]) if nodes else 0):
+        sources, constants, adjust = [], [], []
+        for n, i in enumerate(nodes):
+            if len(links[i]) <= k:
+                break
+            source, constant, adjusted = convert(i, links[i][k])
+            sources.append(source)
+            constants.append(constant)
+            if adjusted:
+                adjust.append(n)
+        constants = np.array(constants, dtype=np.float64)[:, None]
+        columns.append((len(sources), np.array(sources, dtype=np.int64),
+                        constants if constants.any() else None,
+                        np.array(adjust, dtype=np.int64) if adjust else None,
+                        np.array([row[nodes[n]] for n in adjust], dtype=np.int64)))
+    return columns
+
+
+def _fold(target, values, durations, columns):
+    # target[:n] = max(target[:n], values[sources] + constants - adjustments), column by column.
+    for n, sources, constants, adjust, adjust_rows in columns:
+        candidates = values[sources]
+        if constants is not None:
+            candidates += constants
+        if adjust is not None:
+            candidates[adjust] -= durations[adjust_rows]
+        head = target[:n]
+        np.maximum(head, candidates, out=head)
+
+
+def _run_batches(network, batches):
+    """Worker entry point: run (seed, size) batches; returns ([lengths per batch], critical counts)."""
+    lengths = []
+    critical = np.zeros(network.count, dtype=np.int64)
+    for seed, size in batches:
+        rng = np.random.default_rng(seed)
+        length, counts = network.run(network.sample(rng, size))
+        lengths.append(length)
+        critical += counts
+    return lengths, critical
+
+
+class SimulationResult:
+    """Outcome of simulate(): per-iteration lengths and criticality."""
+
+    def __init__(self, nodes, lengths, critical):
+        self.nodes = nodes
+        self.lengths = lengths  # project length in working days, per iteration
+        self.criticality = critical / len(lengths)
+        self.slot = {node: i for i, node in enumerate(nodes)}
+
+    @property
+    def iterations(self):
+        return len(self.lengths)
+
+    def percentiles(self, percentiles=DEFAULT_PERCENTILES):
+        """{percentile: project length in working days}."""
+        values = np.percentile(self.lengths, percentiles)
+        return dict(zip(percentiles, values.tolist()))
+
+    def finish_dates(self, project, percentiles=DEFAULT_PERCENTILES):
+        """{percentile: finish date} on the project calendar, or None without a start date."""
+        if project.start_date is None:
+            return None
+        values = np.percentile(self.lengths, percentiles)
+        calendar = busday_calendar(project.calendars.get(DEFAULT_CALENDAR))
+        _, finishes = compute_dates(project.start_date, np.zeros(len(values)), values,
+                                    np.zeros(len(values), dtype=np.int32), [calendar])
+        return dict(zip(percentiles, finishes.tolist()))
+
+    def criticality_of(self, node):
+        return float(self.criticality[self.slot[node]])
+
+    def most_critical(self, count=10):
+        """The `count` activities most often critical, with their index."""
+        order = np.argsort(-self.criticality, kind="stable")[:count]
+        return [(self.nodes[i], float(self.criticality[i])) for i in order]
+
+
+def run_simulation(network, iterations=10000, workers=None, batch=1000, seed=None):
+    """Run `iterations` sampled schedules of a Network.
+
+    Returns (project length per iteration, critical count per schedule
+    slot). `workers` defaults to the CPU count; with one worker (or one
+    batch) the passes run in this process.
+    """
+    if iterations < 1:
+        raise ValueError("The number of iterations must be positive")
+    sizes = [batch] * (iterations // batch)
+    if iterations % batch:
+        sizes.append(iterations % batch)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    batches = list(zip(seeds, sizes))
+
+    workers = min(workers or os.cpu_count() or 1, len(batches))
+    if workers <= 1:
+        lengths, critical = _run_batches(network, batches)
+        lengths = np.concatenate(lengths)
+    else:
+        chunks = [batches[k::workers] for k in range(workers)]
+        # Spawned, not forked: the caller is usually a worker thread of a
+        # process with other threads (the GUI, a journal flusher), and a
+        # forked child inherits whatever locks they held.
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(_run_batches, [network] * workers, chunks))
+        # Worker k ran batches k, k + workers, ...; put them back in order.
+        ordered = [None] * len(batches)
+        for k, (chunk_lengths, _) in enumerate(results):
+            ordered[k::workers] = chunk_lengths
+        lengths = np.concatenate(ordered)
+        critical = sum(r[1] for r in results)
+    return lengths, critical[network.position]
+
+
+def simulate(schedule, iterations=10000, distribution=PERT, workers=None, batch=1000, seed=None):
+    """Simulate a Schedule; returns a SimulationResult.
+
+    Raises ValueError for inconsistent estimates or an unknown distribution.
+    """
+    network = Network(schedule, distribution)
+    return SimulationResult(schedule.nodes, *run_simulation(network, iterations, workers, batch, seed))
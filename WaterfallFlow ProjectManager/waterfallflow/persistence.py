@@ -0,0 +1,293 @@
+"""Reading and writing projects in their JSON form.
+
+A path ending in .gz, .bz2, .xz or .zst (e.g. "plan.json.gz") is read and
+written through the matching codec, streaming: the uncompressed JSON never
+exists on disk or in memory as a whole. Zstandard needs the standard
+library's compression.zstd (Python 3.14+).
+"""
+
+import bz2
+import codecs
+import contextlib
+import gzip
+import io
+import json
+import lzma
+import os
+import re
+import tempfile
+
+from .model import Phase, Project, Task
+from .pool import StringPool
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+
+def _zstd_file(raw, mode):
+    if zstd is None:
+        raise ValueError("Zstandard (.zst) project files need Python 3.14 or later")
+    return zstd.ZstdFile(raw, mode)
+
+
+# Extension -> function wrapping an open binary file in a (de)compressor.
+CODECS = {
+    ".gz": lambda raw, mode: gzip.GzipFile(filename="", mode=mode, fileobj=raw, compresslevel=6, mtime=0),
+    ".bz2": lambda raw, mode: bz2.BZ2File(raw, mode),
+    ".xz": lambda raw, mode: lzma.LZMAFile(raw, mode),
+    ".zst": _zstd_file,
+}
+
+# The CODECS extensions this Python can actually read and write.
+AVAILABLE_CODECS = tuple(suffix for suffix in CODECS if suffix != ".zst" or zstd is not None)
+
+
+def codec_of(path):
+    """The CODECS entry for `path`'s extension, or None for plain JSON."""
+    return CODECS.get(os.path.splitext(path)[1].lower())
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+def _attach_phases(project, phases, info):
+    # Files from before ids, or edited by hand, may mix nodes with and
+    # without ids, and their "nextId" may be missing or stale; number the
+    # id-less nodes above every id in the file so no id is taken twice.
+    ids = [phase.id for phase in phases]
+    for phase in phases:
+        for task in phase.tasks:
+            ids.append(task.id)
+            ids.extend(subtask.id for subtask in task.subtasks)
+    max_id = max((i for i in ids if type(i) is int), default=0)
+    project.next_id = max(info.get("nextId", 0), max_id + 1)
+    for phase in phases:
+        project.add_phase(phase)
+
+
+def build_project(data, progress=None, cancelled=None):
+    """Build a Project from its dict form.
+
+    `progress(done, total)` is called every few thousand tasks and
+    `cancelled()` is polled at the same points; LoadCancelled is raised
+    as soon as it returns True. Repeated titles and assignees are interned
+    so each distinct string is stored once.
+    """
+    phases_data = data.get('phases', [])
+    total = sum(len(p_data.get('tasks', [])) for p_data in phases_data)
+    done = 0
+    pool = StringPool()
+    phases = []
+    for p_data in phases_data:
+        phase = Phase(p_data.get('name'), p_data.get('description'))
+        phase.id = p_data.get('id')
+        for t_data in p_data.get('tasks', []):
+            phase.add_task(Task.from_dict(t_data, pool))
+            done += 1
+            if done % 5000 == 0:
+                if cancelled and cancelled():
+                    raise LoadCancelled()
+                if progress:
+                    progress(done, total)
+        phases.append(phase)
+    project = Project.from_info(data)
+    _attach_phases(project, phases, data)
+    if progress:
+        progress(total, total)
+    return project
+
+
+CHUNK_SIZE = 1 << 20
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _Reader:
+    """Buffered, incremental view of the JSON text in a binary file."""
+
+    def __init__(self, f):
+        self.f = f
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.scan = json.JSONDecoder().raw_decode
+        self.text = ""
+        self.pos = 0
+        self.read = 0  # bytes read from f
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            raise ValueError("unexpected end of JSON data")
+        data = self.f.read(CHUNK_SIZE)
+        self.read += len(data)
+        self.eof = not data
+        self.text = self.text[self.pos:] + self.decoder.decode(data, final=self.eof)
+        self.pos = 0
+
+    def peek(self):
+        """The next non-whitespace character."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            self.fill()
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"expected one of {chars!r} but found {char!r} in JSON project")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value, reading more as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.scan(self.text, self.pos)
+                # A number at the end of the buffer may continue in the next chunk.
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    def members(self):
+        """Yield the keys of the object at the cursor; the caller reads each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def elements(self):
+        """Yield once per element of the array at the cursor; the caller reads each one."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.expect(",]") == "]":
+                return
+
+    def finish(self):
+        while not self.eof:
+            self.fill()
+        if _WHITESPACE.match(self.text, self.pos).end() < len(self.text):
+            raise ValueError("extra data after JSON project")
+
+
+def read_project(f, total=None, progress=None, cancelled=None):
+    """Build a Project from the JSON text of binary file `f` as it is read.
+
+    Unlike json.load() followed by build_project(), the document never
+    exists as dicts in full: the top-level object, the "phases" array and
+    each phase are walked token by token, and each task is decoded by the
+    json module's C scanner as soon as its text is buffered and turned
+    straight into a Task. Peak memory is the model plus one chunk.
+
+    `progress(bytes read, total)` and `cancelled()` are called every few
+    thousand tasks, as in build_project. Returns (project, info), where
+    info holds the top-level fields other than "phases".
+    """
+    reader = _Reader(f)
+    pool = StringPool()
+    info = {}
+    phases = []
+    done = 0
+    for key in reader.members():
+        if key != 'phases':
+            info[key] = reader.value()
+            continue
+        for _ in reader.elements():
+            phase = Phase(None, None)
+            for p_key in reader.members():
+                if p_key == 'tasks':
+                    for _ in reader.elements():
+                        phase.add_task(Task.from_dict(reader.value(), pool))
+                        done += 1
+                        if done % 5000 == 0:
+                            if cancelled and cancelled():
+                                raise LoadCancelled()
+                            if progress:
+                                progress(reader.read, total)
+                elif p_key in ('name', 'description', 'id'):
+                    setattr(phase, p_key, reader.value())
+                else:
+                    reader.value()
+            phases.append(phase)
+    reader.finish()
+    # Attached once "nextId" is known, wherever it is in the file, so ids
+    # come out as with build_project().
+    project = Project.from_info(info)
+    _attach_phases(project, phases, info)
+    if progress:
+        progress(reader.read, total)
+    return project, info
+
+
+def read_project_file(path, progress=None, cancelled=None):
+    """read_project() on a (possibly compressed) JSON file; progress is in file bytes."""
+    codec = codec_of(path)
+    with open(path, 'rb') as raw:
+        size = os.fstat(raw.fileno()).st_size
+        if codec is None:
+            return read_project(raw, size, progress, cancelled)
+        report = progress and (lambda done, total: progress(raw.tell(), total))
+        with codec(raw, 'rb') as f:
+            return read_project(f, size, report, cancelled)
+
+
+def load_project(path, progress=None, cancelled=None):
+    """Read a (possibly compressed) JSON project file; see read_project()."""
+    return read_project_file(path, progress, cancelled)[0]
+
+
+def save_project(project, path):
+    save_json_atomic(path, project.to_dict())
+
+
+def save_json_atomic(path, data):
+    """Write `data` as JSON, compressed if `path` says so, and atomically replace `path` with it."""
+    codec = codec_of(path)
+    if codec is None:
+        with atomic_open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return
+    with atomic_open(path, 'wb') as raw:
+        # Closing the codec writes its trailer; `raw` stays open for the fsync.
+        with codec(raw, 'wb') as compressed, io.TextIOWrapper(compressed, encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+@contextlib.contextmanager
+def atomic_open(path, mode='w', encoding=None):
+    """Open a temp file next to `path` that replaces `path` on success.
+
+    The data is fsync'd before the rename, so a crash mid-write leaves the
+    previous file untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,132 @@
+"""Dictionary encoding for repeated strings, and an assignee -> tasks index."""
+
+from .model import ADDED, CHANGED, REMOVED, Phase, Task
+
+
+class StringPool:
+    """Stores each distinct string once and numbers them in first-seen order.
+
+    intern() returns the pooled object, so every task sharing an assignee or
+    title points at a single string; id() returns its small integer code and
+    pool[code] maps back.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __getitem__(self, code):
+        return self.strings[code]
+
+    def __contains__(self, value):
+        return value in self.ids
+
+    def id(self, value):
+        code = self.ids.get(value)
+        if code is None:
+            code = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def intern(self, value):
+        return self.strings[self.id(value)]
+
+
+class AssigneeIndex:
+    """Keeps, for every assignee of a project, the set of tasks assigned to it.
+
+    The index is built on first use (loading any lazy phases) and then kept
+    current from the project's change events, so tasks_for() and reassign()
+    cost O(k) in the number of matching tasks rather than a full scan.
+    Call detach() when the project is replaced.
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self.pool = StringPool()
+        self.buckets = []
+        self.built = False
+        project.subscribe(self.on_model_changed)
+
+    def detach(self):
+        self.project.unsubscribe(self.on_model_changed)
+
+    def build(self):
+        self.buckets = [{} for _ in self.pool.strings]
+        self.built = True
+        for phase in self.project.phases:
+            self._add_phase(phase)
+
+    def _bucket(self, assignee):
+        code = self.pool.id(assignee)
+        if code == len(self.buckets):
+            self.buckets.append({})
+        return self.buckets[code]
+
+    def _add_task(self, task):
+        self._bucket(task.assignee)[task] = None
+
+    def _remove_task(self, task, assignee=None):
+        self._bucket(task.assignee if assignee is None else assignee).pop(task, None)
+
+    def _add_phase(self, phase):
+        for task in phase.tasks:
+            self._add_task(task)
+
+    def _remove_phase(self, phase):
+        for task in phase.tasks:
+            self._remove_task(task)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def assignees(self):
+        """Map each assignee that has tasks to how many."""
+        if not self.built:
+            self.build()
+        return {self.pool[code]: len(bucket) for code, bucket in enumerate(self.buckets) if bucket}
+
+    def tasks_for_id(self, code):
+        if not self.built:
+            self.build()
+        return list(self.buckets[code])
+
+    def tasks_for(self, assignee):
+        # The pool only knows the assignees once the index is built.
+        if not self.built:
+            self.build()
+        if assignee not in self.pool:
+            return []
+        return self.tasks_for_id(self.pool.id(assignee))
+
+    def reassign(self, old, new):
+        """Move every task of `old` to `new`; returns how many moved."""
+        tasks = self.tasks_for(old)
+        for task in tasks:
+            task.assignee = new
+        return len(tasks)
+
+    # ------------------------------------------------------------------
+    # Change tracking
+    # ------------------------------------------------------------------
+    def on_model_changed(self, event):
+        if not self.built:
+            return
+        node = event.node
+        if event.kind == CHANGED:
+            if event.field == "assignee" and isinstance(node, Task):
+                self._remove_task(node, event.old)
+                self._add_task(node)
+        elif event.field == "tasks" and isinstance(node, Phase):
+            if event.kind == ADDED:
+                self._add_task(event.new)
+            elif event.kind == REMOVED:
+                self._remove_task(event.old)
+        elif event.field == "phases":
+            if event.kind == ADDED:
+                self._add_phase(event.new)
+            elif event.kind == REMOVED:
+                self._remove_phase(event.old)
@@ -0,0 +1,212 @@
+"""Resource over-allocation: who is booked on overlapping work, and leveling.
+
+A task books its assignee from its early start to its early finish in a
+Schedule. Subtasks are part of their task's work and book nobody again,
+and neither do milestones or unassigned tasks. An assignee works on
+`capacity` tasks at once (1 unless given).
+
+find_overallocations() sorts each assignee's start and finish events and
+sweeps them once, O(n log n) in the assignee's n tasks, reporting every
+maximal interval where more tasks overlap than the capacity allows.
+
+level_resources() removes conflicts by delaying non-critical tasks, never
+past their total float, so the project length does not change. Conflicts
+between critical tasks, or ones that no float can absorb, are left in
+place. The result is a leveling delay per task; apply_leveling() stores it
+in Task.delay, which Schedule honours, so the plan keeps the leveled dates.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from .model import FS, SS, Task
+from .schedule import CRITICAL_EPSILON
+
+UNASSIGNED = "Unassigned"
+
+Overallocation = namedtuple("Overallocation", "assignee start finish load tasks")
+Overallocation.__doc__ = """Days [start, finish) where `assignee` has up to `load` tasks at once."""
+
+
+def task_bookings(schedule):
+    """Slots of the tasks that book each assignee, as {assignee: [slot, ...]}."""
+    bookings = {}
+    duration = schedule.duration
+    for i, node in enumerate(schedule.nodes):
+        if isinstance(node, Task) and duration[i] > 0 and node.assignee and node.assignee != UNASSIGNED:
+            slots = bookings.get(node.assignee)
+            if slots is None:
+                slots = bookings[node.assignee] = []
+            slots.append(i)
+    return bookings
+
+
+def find_overallocations(schedule, capacity=None):
+    """Over-allocated intervals of every assignee, by assignee then start.
+
+    `capacity` optionally maps assignees to how many tasks they can work on
+    at once. Tasks that touch end-to-start do not overlap.
+    """
+    es, ef, nodes = schedule.early_start, schedule.early_finish, schedule.nodes
+    found = []
+    for assignee, slots in sorted(task_bookings(schedule).items()):
+        limit = capacity.get(assignee, 1) if capacity else 1
+        if len(slots) <= limit:
+            continue
+        # Finishes (0) sort before starts (1) at the same time.
+        events = [(es[i], 1, i) for i in slots]
+        events.extend([(ef[i], 0, i) for i in slots])
+        events.sort()
+        active = set()
+        opened = None
+        for time, starting, i in events:
+            if starting:
+                active.add(i)
+                if len(active) > limit:
+                    if opened is None:
+                        opened, peak, involved = time, len(active), set(active)
+                    else:
+                        peak = max(peak, len(active))
+                        involved.add(i)
+            else:
+                active.discard(i)
+                if opened is not None and len(active) <= limit:
+                    found.append(Overallocation(assignee, opened, time, peak,
+                                                tuple(nodes[j] for j in sorted(involved))))
+                    opened = None
+    return found
+
+
+class _Profile:
+    """An assignee's booked load over time, as a step function.
+
+    loads[k] holds from times[k] up to times[k + 1]; the load is zero
+    before the first breakpoint and after the last.
+    """
+
+    __slots__ = ("limit", "times", "loads")
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.times = []
+        self.loads = []
+
+    def _split(self, time):
+        times = self.times
+        k = bisect_left(times, time)
+        if k == len(times) or times[k] != time:
+            times.insert(k, time)
+            self.loads.insert(k, self.loads[k - 1] if k else 0)
+        return k
+
+    def book(self, start, finish):
+        times, loads = self.times, self.loads
+        if not times or start > times[-1]:
+            # Bookings mostly arrive in time order; append without searching.
+            times += (start, finish)
+            loads += (1, 0)
+        elif start == times[-1]:
+            loads[-1] = 1
+            times.append(finish)
+            loads.append(0)
+        else:
+            for k in range(self._split(start), self._split(finish)):
+                loads[k] += 1
+
+    def first_fit(self, start, duration, latest):
+        """Earliest start in [start, latest] free for `duration`, else None."""
+        times, loads, limit = self.times, self.loads, self.limit
+        count = len(times)
+        if not count or start >= times[-1]:
+            return start
+        k = bisect_right(times, start) - 1  # segment holding start; -1 before the first
+        while start <= latest + CRITICAL_EPSILON:
+            finish = start + duration
+            j = k
+            while j < 0 or loads[j] < limit:
+                j += 1
+                if j == count or times[j] >= finish:
+                    return start
+            # Segment j is full: try again where the load next drops.
+            while loads[j] >= limit:
+                j += 1
+            start, k = times[j], j
+        return None
+
+
+def level_resources(schedule, capacity=None):
+    """Delays that resolve over-allocations without moving the project end.
+
+    Activities are placed in order of late start once their predecessors
+    are placed: critical tasks keep their dates, other tasks go to the
+    first slot where their assignee is free that their float allows, or
+    stay put if there is none. Returns {task: new leveling delay} for the
+    tasks that move.
+    """
+    count = len(schedule.nodes)
+    nodes, duration, delay = schedule.nodes, schedule.duration, schedule.delay
+    preds, succs = schedule.preds, schedule.succs
+    es, tail, length = schedule.early_start, schedule.tail, schedule.length
+    late_start = [length - tail[i] - duration[i] for i in range(count)]
+
+    profile_of = {}
+    for assignee, slots in task_bookings(schedule).items():
+        profile = _Profile(capacity.get(assignee, 1) if capacity else 1)
+        for i in slots:
+            profile_of[i] = profile
+            if late_start[i] - es[i] <= CRITICAL_EPSILON:
+                profile.book(es[i], es[i] + duration[i])
+
+    start = [0] * count
+    finish = [0] * count
+    indegree = [len(p) for p in preds]
+    heap = [(late_start[i], es[i], i) for i in range(count) if not indegree[i]]
+    heapq.heapify(heap)
+    delays = {}
+    while heap:
+        latest, _, i = heapq.heappop(heap)
+        d = duration[i]
+        earliest = 0
+        for j, kind, lag in preds[i]:
+            if kind == FS:
+                t = finish[j] + lag
+            elif kind == SS:
+                t = start[j] + lag
+            else:
+                t = finish[j] + lag - d
+            if t > earliest:
+                earliest = t
+        earliest += delay[i]
+        s = earliest
+        profile = profile_of.get(i)
+        if profile is not None and latest - es[i] > CRITICAL_EPSILON:
+            fit = profile.first_fit(earliest, d, latest)
+            if fit is not None:
+                s = fit
+            profile.book(s, s + d)
+        if s > earliest:
+            delays[nodes[i]] = delay[i] + s - earliest
+        start[i] = s
+        finish[i] = s + d
+        for k, _, _ in succs[i]:
+            indegree[k] -= 1
+            if not indegree[k]:
+                heapq.heappush(heap, (late_start[k], es[k], k))
+    return delays
+
+
+def apply_leveling(delays):
+    for task, value in delays.items():
+        task.delay = value
+
+
+def clear_leveling(project):
+    """Remove every leveling delay; returns how many tasks had one."""
+    cleared = 0
+    for phase in project.phases:
+        for task in phase.tasks:
+            if task.delay:
+                task.delay = 0
+                cleared += 1
+    return cleared
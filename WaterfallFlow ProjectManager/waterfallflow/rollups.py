@@ -0,0 +1,122 @@
+"""Cached progress rollups: duration, completed duration and open/closed counts.
+
+A phase or project rolls up its tasks; a task rolls up its subtasks.
+Rollups computes a node's Totals on first request and from then on adjusts
+the cached values from change events, touching only the node's ancestors,
+so flipping a checkbox costs O(depth) however large the plan is.
+"""
+
+from .model import ADDED, CHANGED, REMOVED, Phase, Project, Subtask, Task
+
+
+class Totals:
+    __slots__ = ("total", "done", "open", "closed")
+
+    def __init__(self, total=0, done=0, open=0, closed=0):
+        self.total = total
+        self.done = done
+        self.open = open
+        self.closed = closed
+
+    @classmethod
+    def of_items(cls, items):
+        """Totals of a list of tasks or subtasks."""
+        totals = cls()
+        for item in items:
+            totals.add(item.duration, item.completed)
+        return totals
+
+    @property
+    def percent(self):
+        """Share of the duration that is completed, 0-100."""
+        return 100.0 * self.done / self.total if self.total else 0.0
+
+    @property
+    def count(self):
+        return self.open + self.closed
+
+    def add(self, duration, completed, sign=1):
+        self.total += sign * duration
+        if completed:
+            self.done += sign * duration
+            self.closed += sign
+        else:
+            self.open += sign
+
+    def merge(self, other, sign=1):
+        self.total += sign * other.total
+        self.done += sign * other.done
+        self.open += sign * other.open
+        self.closed += sign * other.closed
+
+    def as_tuple(self):
+        return self.total, self.done, self.open, self.closed
+
+
+class Rollups:
+    """Totals for the project, its phases and tasks, kept current by events.
+
+    A phase whose tasks are not loaded yet uses the `totals` its loader
+    carries (see session.BlobLoader) instead of loading them. Call detach()
+    when the project is replaced.
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self.cache = {}  # node -> Totals; a cached project implies cached phases
+        project.subscribe(self.on_model_changed)
+
+    def detach(self):
+        self.project.unsubscribe(self.on_model_changed)
+
+    def of(self, node):
+        totals = self.cache.get(node)
+        if totals is None:
+            if isinstance(node, Project):
+                totals = Totals()
+                for phase in node.phases:
+                    totals.merge(self.of(phase))
+            elif isinstance(node, Phase):
+                loaded = getattr(node.loader, "totals", None)
+                totals = Totals(*loaded) if loaded is not None else Totals.of_items(node.tasks)
+            else:
+                totals = Totals.of_items(node.subtasks)
+            self.cache[node] = totals
+        return totals
+
+    def _adjust(self, node, duration, completed, sign):
+        # Apply one item's contribution to every cached ancestor starting at `node`.
+        totals = self.cache.get(node)
+        if totals is not None:
+            totals.add(duration, completed, sign)
+            if isinstance(node, Phase):
+                totals = self.cache.get(node.parent)
+                if totals is not None:
+                    totals.add(duration, completed, sign)
+
+    def on_model_changed(self, event):
+        node = event.node
+        cache = self.cache
+        if event.kind == CHANGED:
+            if event.field in ("duration", "completed") and isinstance(node, (Task, Subtask)) \
+                    and node.parent is not None:
+                old = {"duration": node.duration, "completed": node.completed}
+                old[event.field] = event.old
+                self._adjust(node.parent, old["duration"], old["completed"], -1)
+                self._adjust(node.parent, node.duration, node.completed, 1)
+        elif event.field in ("tasks", "subtasks"):
+            item, sign = (event.new, 1) if event.kind == ADDED else (event.old, -1)
+            self._adjust(node, item.duration, item.completed, sign)
+            if event.kind == REMOVED:
+                cache.pop(item, None)
+        elif event.field == "phases":
+            project_totals = cache.get(node)
+            if event.kind == ADDED:
+                if project_totals is not None:
+                    project_totals.merge(self.of(event.new))
+            else:
+                phase_totals = cache.pop(event.old, None)
+                for task in event.old.children():
+                    cache.pop(task, None)
+                if project_totals is not None:
+                    project_totals.merge(phase_totals, -1)
@@ -0,0 +1,67 @@
+"""Row bookkeeping for flat task/subtask list views."""
+
+
+class RowIndex:
+    """Fenwick tree over the number of rows each task occupies (1 + subtasks).
+
+    Maps a visible row to its task in O(log n) without materialising a
+    row -> object table for the whole phase.
+    """
+
+    def __init__(self, sizes=()):
+        self.rebuild(sizes)
+
+    def rebuild(self, sizes):
+        tree = [0]
+        tree.extend(sizes)
+        n = len(tree) - 1
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self._tree = tree
+        self._n = n
+        self._top = 1 << n.bit_length() if n else 0
+
+    def __len__(self):
+        return self._n
+
+    def total(self):
+        return self.prefix(self._n)
+
+    def prefix(self, count):
+        """Number of rows used by the first `count` tasks."""
+        tree = self._tree
+        total = 0
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def add(self, index, delta):
+        tree = self._tree
+        i = index + 1
+        while i <= self._n:
+            tree[i] += delta
+            i += i & -i
+
+    def append(self, size):
+        n = self._n + 1
+        low = n & -n
+        self._tree.append(size + self.prefix(n - 1) - self.prefix(n - low))
+        self._n = n
+        if n >= self._top:
+            self._top = 1 << n.bit_length()
+
+    def find(self, row):
+        """Return (task_index, offset_within_task) for a row."""
+        tree = self._tree
+        pos = 0
+        step = self._top
+        while step:
+            nxt = pos + step
+            if nxt <= self._n and tree[nxt] <= row:
+                pos = nxt
+                row -= tree[nxt]
+            step >>= 1
+        return pos, row
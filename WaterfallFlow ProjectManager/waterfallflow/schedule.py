@@ -0,0 +1,358 @@
+"""Critical path scheduling over task and subtask dependencies.
+
+Every task and subtask is an activity lasting `duration` days, constrained
+only by its `dependencies` (see model.Dependency); a task's leveling
+`delay` pushes it that many days past the start they allow. Schedule topologically
+sorts the activities once and then runs the classic CPM passes:
+
+    forward   early start/finish, from predecessors in topological order
+    backward  late start/finish, from successors in reverse order
+
+Both passes touch every activity and link once, so a full schedule is
+O(V + E). Day numbers are offsets from the project start (day 0).
+
+Late dates are kept as `tail`, the time from an activity's late finish to
+the end of the project, which does not depend on the project length. That
+lets a watched Schedule absorb duration edits incrementally: update()
+re-runs both passes only over the activities downstream (forward) and
+upstream (backward) of the edit, stopping wherever values do not change.
+An edit whose cone reaches a large share of the plan costs more that way
+than the plain passes, so past a limit update() switches to compute().
+Edits that change the graph itself (adding or removing activities,
+changing dependencies) fall back to a full rebuild.
+"""
+
+import heapq
+import re
+from collections import deque
+
+from .model import ADDED, CHANGED, FS, REMOVED, SS, Dependency, Subtask, Task
+
+# Float at or below this is treated as zero, to absorb float rounding.
+CRITICAL_EPSILON = 1e-9
+
+# update() reschedules fully once this share of activities has pending edits,
+# or once an incremental pass has visited that share (but at least
+# MIN_CONE_LIMIT activities).
+FULL_PASS_RATIO = 0.05
+MIN_CONE_LIMIT = 1000
+
+
+class ScheduleError(ValueError):
+    pass
+
+
+class Schedule:
+    """Early/late dates, float and critical path for a project.
+
+    Activities are numbered in plan order; `slot` maps a Task or Subtask to
+    its number and the per-activity lists (`early_start`, `early_finish`,
+    `tail`) are indexed by it. Links whose predecessor id no longer exists
+    are ignored. Raises ScheduleError if the dependencies form a cycle.
+
+    After watch(), model edits are queued and applied by update(); call
+    detach() to stop watching.
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self.pending = set()  # activities whose duration or delay changed
+        self.stale = False  # the graph changed; update() must rebuild
+        self.last_update = None  # ("full" | "incremental", activities touched)
+        self.rebuild()
+
+    def rebuild(self):
+        nodes = []
+        for phase in self.project.phases:
+            for task in phase.tasks:
+                nodes.append(task)
+                nodes.extend(task.subtasks)
+        slot = {node: i for i, node in enumerate(nodes)}
+        by_id = self.project.nodes
+        preds = [[] for _ in nodes]
+        succs = [[] for _ in nodes]
+        for i, node in enumerate(nodes):
+            for dep in node.dependencies:
+                j = slot.get(by_id.get(dep.pred))
+                if j is not None and j != i:
+                    preds[i].append((j, dep.kind, dep.lag))
+                    succs[j].append((i, dep.kind, dep.lag))
+
+        self.nodes = nodes
+        self.slot = slot
+        self.duration = [node.duration for node in nodes]
+        self.delay = [getattr(node, "delay", 0) for node in nodes]  # subtasks have none
+        self.preds = preds
+        self.succs = succs
+        self.order = self._topological_order()
+        self.rank = [0] * len(nodes)
+        for position, i in enumerate(self.order):
+            self.rank[i] = position
+        self.pending.clear()
+        self.stale = False
+        self.compute()
+
+    def _topological_order(self):
+        indegree = [len(p) for p in self.preds]
+        ready = deque(i for i, n in enumerate(indegree) if n == 0)
+        order = []
+        succs = self.succs
+        while ready:
+            i = ready.popleft()
+            order.append(i)
+            for k, _, _ in succs[i]:
+                indegree[k] -= 1
+                if indegree[k] == 0:
+                    ready.append(k)
+        if len(order) < len(self.nodes):
+            stuck = [self.nodes[i].title for i, n in enumerate(indegree) if n][:5]
+            raise ScheduleError("Dependency cycle; cannot schedule: " + ", ".join(stuck))
+        return order
+
+    def compute(self):
+        """Run the forward and backward passes over the whole graph."""
+        count = len(self.nodes)
+        duration, delay, preds, succs = self.duration, self.delay, self.preds, self.succs
+        es = [0] * count
+        ef = [0] * count
+        for i in self.order:
+            d = duration[i]
+            start = 0
+            for j, kind, lag in preds[i]:
+                if kind == FS:
+                    t = ef[j] + lag
+                elif kind == SS:
+                    t = es[j] + lag
+                else:
+                    t = ef[j] + lag - d
+                if t > start:
+                    start = t
+            start += delay[i]
+            es[i] = start
+            ef[i] = start + d
+        finish = max(ef, default=0)
+
+        tail = [0] * count
+        for i in reversed(self.order):
+            d = duration[i]
+            longest = 0
+            for k, kind, lag in succs[i]:
+                # A successor's leveling delay acts as extra lag on its links.
+                if kind == FS:
+                    t = tail[k] + duration[k] + lag + delay[k]
+                elif kind == SS:
+                    t = tail[k] + duration[k] + lag + delay[k] - d
+                else:
+                    t = tail[k] + lag + delay[k]
+                if t > longest:
+                    longest = t
+            tail[i] = longest
+
+        self.early_start, self.early_finish, self.tail = es, ef, tail
+        self.length = finish
+        self.last_update = ("full", count)
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+    def watch(self):
+        self.project.subscribe(self.on_model_changed)
+
+    def detach(self):
+        self.project.unsubscribe(self.on_model_changed)
+
+    def on_model_changed(self, event):
+        if self.stale:
+            return
+        if event.kind == CHANGED:
+            if event.field in ("duration", "delay") and isinstance(event.node, (Task, Subtask)):
+                i = self.slot.get(event.node)
+                if i is None:
+                    self.stale = True
+                else:
+                    self.pending.add(i)
+            elif event.field == "dependencies":
+                self.stale = True
+        elif event.kind in (ADDED, REMOVED):
+            self.stale = True
+
+    @property
+    def dirty(self):
+        return self.stale or bool(self.pending)
+
+    def update(self):
+        """Apply queued edits; returns False if nothing was pending."""
+        if self.stale:
+            self.rebuild()
+            return True
+        if not self.pending:
+            return False
+        changed = self.pending
+        self.pending = set()
+        for i in changed:
+            node = self.nodes[i]
+            self.duration[i] = node.duration
+            self.delay[i] = getattr(node, "delay", 0)
+        limit = FULL_PASS_RATIO * len(self.nodes)
+        if len(changed) > limit or not self._propagate(changed, max(limit, MIN_CONE_LIMIT)):
+            self.compute()
+        return True
+
+    def _propagate(self, changed, limit):
+        """Re-run both passes over the cone of `changed`.
+
+        Returns False, leaving the dates half updated, once more than
+        `limit` activities have been visited; compute() must follow.
+        """
+        duration, delay, preds, succs, rank = self.duration, self.delay, self.preds, self.succs, self.rank
+        es, ef, tail = self.early_start, self.early_finish, self.tail
+        length = self.length
+        latest = 0
+        rescan = False  # an activity that ended the project now ends earlier
+        touched = 0
+        visited = 0
+
+        # Forward: recompute early dates in topological order, following
+        # successors only from activities whose dates moved.
+        heap = [(rank[i], i) for i in changed]
+        heapq.heapify(heap)
+        queued = set(changed)
+        while heap:
+            _, i = heapq.heappop(heap)
+            queued.discard(i)
+            visited += 1
+            if visited > limit:
+                return False
+            d = duration[i]
+            start = 0
+            for j, kind, lag in preds[i]:
+                if kind == FS:
+                    t = ef[j] + lag
+                elif kind == SS:
+                    t = es[j] + lag
+                else:
+                    t = ef[j] + lag - d
+                if t > start:
+                    start = t
+            start += delay[i]
+            finish = start + d
+            if start == es[i] and finish == ef[i]:
+                continue
+            if ef[i] == length and finish < length:
+                rescan = True
+            if finish > latest:
+                latest = finish
+            es[i] = start
+            ef[i] = finish
+            touched += 1
+            for k, _, _ in succs[i]:
+                if k not in queued:
+                    queued.add(k)
+                    heapq.heappush(heap, (rank[k], k))
+        self.length = max(ef, default=0) if rescan else max(length, latest)
+
+        # Backward: an edited activity's predecessors see its new duration
+        # and delay even if its own tail is unchanged, so they are always revisited.
+        heap = [(-rank[i], i) for i in changed]
+        queued = set(changed)
+        for i in changed:
+            for j, _, _ in preds[i]:
+                if j not in queued:
+                    queued.add(j)
+                    heap.append((-rank[j], j))
+        heapq.heapify(heap)
+        while heap:
+            _, i = heapq.heappop(heap)
+            queued.discard(i)
+            visited += 1
+            if visited > limit:
+                return False
+            d = duration[i]
+            longest = 0
+            for k, kind, lag in succs[i]:
+                if kind == FS:
+                    t = tail[k] + duration[k] + lag + delay[k]
+                elif kind == SS:
+                    t = tail[k] + duration[k] + lag + delay[k] - d
+                else:
+                    t = tail[k] + lag + delay[k]
+                if t > longest:
+                    longest = t
+            if longest == tail[i]:
+                continue
+            tail[i] = longest
+            touched += 1
+            for j, _, _ in preds[i]:
+                if j not in queued:
+                    queued.add(j)
+                    heapq.heappush(heap, (-rank[j], j))
+        self.last_update = ("incremental", touched)
+        return True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def __contains__(self, node):
+        return node in self.slot
+
+    def start(self, node):
+        return self.early_start[self.slot[node]]
+
+    def finish(self, node):
+        return self.early_finish[self.slot[node]]
+
+    def late_finish(self, node):
+        return self.length - self.tail[self.slot[node]]
+
+    def late_start(self, node):
+        i = self.slot[node]
+        return self.length - self.tail[i] - self.duration[i]
+
+    def _float(self, i):
+        return self.length - self.tail[i] - self.duration[i] - self.early_start[i]
+
+    def total_float(self, node):
+        return self._float(self.slot[node])
+
+    def is_critical(self, node):
+        i = self.slot.get(node)
+        return i is not None and self._float(i) <= CRITICAL_EPSILON
+
+    def critical_path(self):
+        """Critical activities in topological order."""
+        return [self.nodes[i] for i in self.order if self._float(i) <= CRITICAL_EPSILON]
+
+
+# ----------------------------------------------------------------------
+# Text form used by the task list, e.g. "12, 15SS+2, 20FF-1"
+# ----------------------------------------------------------------------
+_DEPENDENCY_RE = re.compile(r"^\s*(\d+)\s*(FS|SS|FF)?\s*([+-]\s*\d+(?:\.\d+)?)?\s*$", re.IGNORECASE)
+
+
+def format_dependencies(dependencies):
+    parts = []
+    for dep in dependencies:
+        text = str(dep.pred)
+        if dep.kind != FS or dep.lag:
+            text += dep.kind
+        if dep.lag:
+            text += f"{dep.lag:+g}"
+        parts.append(text)
+    return ", ".join(parts)
+
+
+def parse_dependencies(text):
+    """Parse format_dependencies() output; raises ValueError on bad input."""
+    deps = []
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        match = _DEPENDENCY_RE.match(part)
+        if match is None:
+            raise ValueError(f"Not a dependency: {part.strip()!r} (expected e.g. 12, 12SS or 12FF+2)")
+        pred, kind, lag = match.groups()
+        lag = float(lag.replace(" ", "")) if lag else 0
+        if lag == int(lag):
+            lag = int(lag)
+        deps.append(Dependency(int(pred), (kind or FS).upper(), lag))
+    return tuple(deps)
@@ -0,0 +1,108 @@
+"""Binary session snapshots, used to reopen the last project instantly.
+
+File layout (little endian)::
+
+    header  magic, format version, marshal version, Python major/minor,
+            length of the meta block
+    meta    marshal((state, project.info_dict(),
+                     [(phase name, description, id, totals, offset, length), ...]))
+    blobs   one marshal blob per phase holding [task.to_dict(), ...]
+
+load_session() memory-maps the file and only decodes the meta block; each
+phase's blob is decoded the first time its tasks are accessed; until then
+its rollup totals come from the meta block. marshal's
+format is tied to the interpreter, so snapshots written by a different
+Python version are rejected and the caller falls back to a normal start.
+"""
+
+import marshal
+import mmap
+import struct
+import sys
+
+from .model import Phase, Project, Task
+from .persistence import atomic_open
+from .pool import StringPool
+from .rollups import Totals
+
+MAGIC = b"WFSESS"
+VERSION = 4
+_HEADER = struct.Struct("<6sHHBBQ")
+
+
+class BlobLoader:
+    """Phase loader that decodes a marshalled list of task dicts.
+
+    Loaders of one snapshot share a StringPool, so strings repeated across
+    phases are stored once however the phases are loaded.
+    """
+
+    def __init__(self, blob, pool=None, totals=None):
+        self.blob = blob
+        self.pool = pool
+        self.totals = totals
+
+    def __call__(self):
+        pool = self.pool
+        return [Task.from_dict(d, pool) for d in marshal.loads(self.blob)]
+
+
+def snapshot_session(project, state, tasks_of=None):
+    """Capture everything write_session needs from the live project.
+
+    Must run on the thread that owns `project`. Phases that were never
+    opened are carried over as their raw blob, without decoding them.
+    `tasks_of(phase)` gives the other phases' tasks as to_dict() lists if
+    they were serialized beforehand (see SnapshotBuilder.session()).
+    """
+    phases = []
+    for phase in project.phases:
+        if isinstance(phase.loader, BlobLoader):
+            # Copy out of the old mapping so the file can be replaced.
+            phase.loader.blob = bytes(phase.loader.blob)
+            tasks = phase.loader.blob
+            totals = phase.loader.totals
+        else:
+            tasks = [t.to_dict() for t in phase.tasks] if tasks_of is None else tasks_of(phase)
+            totals = Totals.of_items(phase.tasks).as_tuple()
+        phases.append((phase.name, phase.description, phase.id, totals, tasks))
+    return dict(state), project.info_dict(), phases
+
+
+def write_session(path, snapshot):
+    state, info, phases = snapshot
+    blobs = [tasks if isinstance(tasks, bytes) else marshal.dumps(tasks) for *_, tasks in phases]
+    table = []
+    offset = 0
+    for (p_name, p_desc, p_id, totals, _), blob in zip(phases, blobs):
+        table.append((p_name, p_desc, p_id, totals, offset, len(blob)))
+        offset += len(blob)
+    meta = marshal.dumps((state, info, table))
+    with atomic_open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, marshal.version, *sys.version_info[:2], len(meta)))
+        f.write(meta)
+        for blob in blobs:
+            f.write(blob)
+
+
+def load_session(path):
+    """Return (project, state) from a snapshot; raises ValueError if unusable."""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if len(view) < _HEADER.size:
+        raise ValueError("truncated session snapshot")
+    magic, version, marshal_version, major, minor, meta_len = _HEADER.unpack_from(view)
+    if (magic, version, marshal_version, (major, minor)) != (MAGIC, VERSION, marshal.version, sys.version_info[:2]):
+        raise ValueError("incompatible session snapshot")
+    start = _HEADER.size
+    state, info, table = marshal.loads(view[start:start + meta_len])
+    base = start + meta_len
+    project = Project.from_info(info)
+    pool = StringPool()
+    for p_name, p_desc, p_id, totals, offset, length in table:
+        phase = Phase(p_name, p_desc)
+        phase.id = p_id
+        phase.set_loader(BlobLoader(view[base + offset:base + offset + length], pool, totals))
+        project.add_phase(phase)
+    return project, state
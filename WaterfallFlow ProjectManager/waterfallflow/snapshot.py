@@ -0,0 +1,118 @@
+"""Snapshots of a live project, built a slice at a time.
+
+A background save still needs a copy of the plan that the worker thread
+can own, and building it with Project.to_dict() walks every task on the
+thread that owns the model; for a large plan that walk is the whole pause
+the user sees. A SnapshotBuilder spreads it out: step() serializes at most
+`count` tasks and returns, so the GUI can call it from successive
+event-loop ticks and handle input in between.
+
+The builder follows the project's change events while it works, so the
+snapshot it returns is the plan as it is when it is taken:
+
+    a task (or one of its subtasks) edited after the task was serialized
+    is serialized again then; finding it costs one scan of its phase
+    a phase whose task list changes starts over
+    phases added meanwhile are queued, removed ones dropped
+
+Take the snapshot in the same call as the step() that returned True.
+Steps stay short, but the objects they allocate still set off the
+interpreter's occasional full garbage collections, which scan the whole
+plan; benchmarks/bench_snapshot.py measures both.
+"""
+
+from .model import ADDED, Phase, Project, Task
+from .session import BlobLoader, snapshot_session
+
+# Tasks serialized per step(); a few milliseconds of work.
+SLICE_TASKS = 2000
+
+
+class SnapshotBuilder:
+    """Builds project.to_dict() over several step() calls.
+
+    With keep_blobs, phases of a session snapshot that were never opened
+    are left alone, as snapshot_session() carries them over undecoded;
+    take that snapshot with session().
+    """
+
+    def __init__(self, project, keep_blobs=False):
+        self.project = project
+        self.keep_blobs = keep_blobs
+        self.queue = dict.fromkeys(project.phases)  # phases left to serialize, in order
+        self.built = {}  # phase -> its tasks' dicts so far
+        self.edited = {}  # phase -> tasks edited since they were serialized
+        project.subscribe(self.on_model_changed)
+
+    def detach(self):
+        self.project.unsubscribe(self.on_model_changed)
+
+    def step(self, count=SLICE_TASKS):
+        """Serialize up to `count` more tasks; returns True once every phase is done."""
+        queue = self.queue
+        while queue and count > 0:
+            phase = next(iter(queue))
+            if self.keep_blobs and isinstance(phase.loader, BlobLoader):
+                del queue[phase]
+                continue
+            tasks = phase.tasks  # loads a lazy phase
+            built = self.built.setdefault(phase, [])
+            start = len(built)
+            end = min(start + count, len(tasks))
+            built.extend([task.to_dict() for task in tasks[start:end]])
+            count -= end - start
+            if end == len(tasks):
+                del queue[phase]
+        return not queue
+
+    def tasks_of(self, phase):
+        """The to_dict() list of a phase's tasks, as of now."""
+        built = self.built.get(phase)
+        if built is None:
+            # A blob phase skipped by step() but opened since.
+            return [task.to_dict() for task in phase.tasks]
+        edited = self.edited.pop(phase, None)
+        if edited:
+            for i, task in enumerate(phase.tasks):
+                if task in edited:
+                    built[i] = task.to_dict()
+        return built
+
+    def project_dict(self):
+        """project.to_dict() once step() has returned True; stops following the project."""
+        self.detach()
+        data = self.project.info_dict()
+        data["phases"] = [phase.to_dict(self.tasks_of(phase)) for phase in self.project.phases]
+        return data
+
+    def session(self, state):
+        """snapshot_session(project, state) once step() has returned True; stops following the project."""
+        self.detach()
+        return snapshot_session(self.project, state, self.tasks_of)
+
+    # ------------------------------------------------------------------
+    # Change tracking
+    # ------------------------------------------------------------------
+    def _restart(self, phase):
+        self.built.pop(phase, None)
+        self.edited.pop(phase, None)
+        self.queue[phase] = None
+
+    def on_model_changed(self, event):
+        node = event.node
+        if isinstance(node, Project):
+            if event.field == "phases":
+                if event.kind == ADDED:
+                    self._restart(event.new)
+                else:
+                    self.queue.pop(event.old, None)
+                    self.built.pop(event.old, None)
+                    self.edited.pop(event.old, None)
+        elif isinstance(node, Phase):
+            # Its name and description are read when the snapshot is taken.
+            if event.field == "tasks":
+                self._restart(node)
+        else:
+            task = node if isinstance(node, Task) else node.parent
+            if task.parent in self.built:
+                self.edited.setdefault(task.parent, set()).add(task)
@@ -0,0 +1,305 @@
+"""SQLite project store: open by phase, save edit by edit.
+
+A .wfdb file holds one project in indexed tables::
+
+    meta      key -> value; "format" and "info" (project.info_dict() as JSON)
+    phases    id, position, name, description, rollup totals
+    tasks     id, phase_id, position, title, duration, assignee, completed, extra
+    subtasks  id, task_id, position, title, duration, completed, extra
+
+`extra` holds, as JSON, whatever else a node's to_dict() carries
+(dependencies, leveling delay, estimate), or NULL. Editing one of those
+fields rewrites the node's whole `extra`, dependencies included, rather
+than patching the JSON. Positions order the children of a parent;
+deletions leave gaps.
+
+SqlStore.open() reads only the meta and phases tables: every phase gets a
+loader that queries its tasks the first time they are accessed, and its
+rollup totals come from the phases row until then. The store then follows
+the project's change events and turns each edit into a few row updates;
+commit() ends the transaction, so a save only ever writes what changed.
+The connection belongs to the thread that opened it, like the model.
+"""
+
+import json
+import os
+import sqlite3
+
+from .model import ADDED, CHANGED, REMOVED, Phase, Project, Subtask, Task
+from .pool import StringPool
+from .rollups import Totals
+
+FORMAT = 1
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE phases (
+    id INTEGER PRIMARY KEY, position INTEGER NOT NULL, name TEXT, description TEXT,
+    total REAL NOT NULL DEFAULT 0, done REAL NOT NULL DEFAULT 0,
+    open INTEGER NOT NULL DEFAULT 0, closed INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY, phase_id INTEGER NOT NULL, position INTEGER NOT NULL,
+    title TEXT, duration REAL, assignee TEXT, completed INTEGER NOT NULL, extra TEXT);
+CREATE INDEX tasks_by_phase ON tasks (phase_id, position);
+CREATE TABLE subtasks (
+    id INTEGER PRIMARY KEY, task_id INTEGER NOT NULL, position INTEGER NOT NULL,
+    title TEXT, duration REAL, completed INTEGER NOT NULL, extra TEXT);
+CREATE INDEX subtasks_by_task ON subtasks (task_id, position);
+"""
+
+# to_dict() keys stored in their own columns; the rest go to `extra`.
+_COLUMNS = frozenset(("id", "title", "durationDays", "assignee", "completed", "subtasks"))
+
+# Child list field -> (table, parent column) of the children's rows.
+_CHILD_TABLES = {"phases": ("phases", None), "tasks": ("tasks", "phase_id"), "subtasks": ("subtasks", "task_id")}
+
+_TASK_FIELDS = {"title": "title", "duration": "duration", "assignee": "assignee", "completed": "completed"}
+_PHASE_FIELDS = {"name": "name", "description": "description"}
+
+
+def _extra(node):
+    extra = {key: value for key, value in node.to_dict().items() if key not in _COLUMNS}
+    return json.dumps(extra, ensure_ascii=False) if extra else None
+
+
+def _use_wal(connection):
+    # A write-ahead log makes each small commit an append instead of a page rewrite.
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+
+def _number(value):
+    # REAL columns hand whole days back as floats; keep them ints like JSON does.
+    return int(value) if value is not None and value == int(value) else value
+
+
+def _task_row(task, phase_id, position):
+    return (task.id, phase_id, position, task.title, task.duration, task.assignee, int(task.completed),
+            _extra(task))
+
+
+def _subtask_row(subtask, task_id, position):
+    return (subtask.id, task_id, position, subtask.title, subtask.duration, int(subtask.completed),
+            _extra(subtask))
+
+
+class SqlPhaseLoader:
+    """Phase loader that queries the phase's tasks and subtasks."""
+
+    def __init__(self, store, phase_id, totals):
+        self.store = store
+        self.phase_id = phase_id
+        self.totals = totals
+
+    def __call__(self):
+        return self.store.load_tasks(self.phase_id)
+
+
+class SqlStore:
+    """A Project written through to a SQLite database."""
+
+    def __init__(self, connection, project, path):
+        self.connection = connection
+        self.project = project
+        self.path = path
+        self.pool = StringPool()
+        self.saved_info = project.info_dict()
+
+    # ------------------------------------------------------------------
+    # Opening and creating
+    # ------------------------------------------------------------------
+    @classmethod
+    def open(cls, path):
+        """Open a .wfdb file; phases load on first access. Raises ValueError if it is not one."""
+        if not os.path.exists(path):
+            raise ValueError(f"{path} does not exist")
+        connection = sqlite3.connect(path)
+        try:
+            meta = dict(connection.execute("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError as e:
+            connection.close()
+            raise ValueError(f"not a WaterfallFlow database: {e}")
+        if meta.get("format") != str(FORMAT):
+            connection.close()
+            raise ValueError("unsupported WaterfallFlow database format")
+        _use_wal(connection)
+        project = Project.from_info(json.loads(meta["info"]))
+        store = cls(connection, project, path)
+        for phase_id, name, description, *totals in connection.execute(
+                "SELECT id, name, description, total, done, open, closed FROM phases ORDER BY position"):
+            phase = Phase(name, description)
+            phase.id = phase_id
+            totals[0], totals[1] = _number(totals[0]), _number(totals[1])
+            phase.set_loader(SqlPhaseLoader(store, phase_id, tuple(totals)))
+            project.add_phase(phase)
+        project.subscribe(store.on_model_changed)
+        return store
+
+    @classmethod
+    def create(cls, path, project):
+        """Write `project` to a new database at `path` and keep it in sync from now on.
+
+        The file is built under a temporary name and renamed into place, so
+        an existing file is only replaced once the copy is complete.
+        """
+        tmp_path = f"{path}.tmp"
+        for stale in (tmp_path, f"{tmp_path}-wal", f"{tmp_path}-shm"):
+            if os.path.exists(stale):
+                os.unlink(stale)
+        connection = sqlite3.connect(tmp_path)
+        try:
+            connection.executescript(SCHEMA)
+            connection.executemany("INSERT INTO meta VALUES (?, ?)",
+                                   [("format", str(FORMAT)), ("info", json.dumps(project.info_dict()))])
+            for position, phase in enumerate(project.phases):
+                cls._insert_phase(connection, phase, position)
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_path, path)
+        connection = sqlite3.connect(path)
+        _use_wal(connection)
+        store = cls(connection, project, path)
+        project.subscribe(store.on_model_changed)
+        return store
+
+    @staticmethod
+    def _insert_phase(connection, phase, position):
+        totals = Totals.of_items(phase.tasks)
+        connection.execute("INSERT INTO phases VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           (phase.id, position, phase.name, phase.description, *totals.as_tuple()))
+        connection.executemany("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                               [_task_row(task, phase.id, i) for i, task in enumerate(phase.tasks)])
+        connection.executemany("INSERT INTO subtasks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               [_subtask_row(subtask, task.id, j)
+                                for task in phase.tasks for j, subtask in enumerate(task.subtasks)])
+
+    def load_tasks(self, phase_id):
+        pool = self.pool
+        tasks = []
+        by_id = {}
+        for node_id, title, duration, assignee, completed, extra in self.connection.execute(
+                "SELECT id, title, duration, assignee, completed, extra FROM tasks "
+                "WHERE phase_id = ? ORDER BY position", (phase_id,)):
+            data = json.loads(extra) if extra else {}
+            data.update(id=node_id, title=title, durationDays=_number(duration), assignee=assignee,
+                        completed=bool(completed))
+            task = by_id[node_id] = Task.from_dict(data, pool)
+            tasks.append(task)
+        for task_id, node_id, title, duration, completed, extra in self.connection.execute(
+                "SELECT s.task_id, s.id, s.title, s.duration, s.completed, s.extra FROM subtasks s "
+                "JOIN tasks t ON t.id = s.task_id WHERE t.phase_id = ? ORDER BY s.task_id, s.position",
+                (phase_id,)):
+            data = json.loads(extra) if extra else {}
+            data.update(id=node_id, title=title, durationDays=_number(duration), completed=bool(completed))
+            by_id[task_id].add_subtask(Subtask.from_dict(data, pool))
+        return tasks
+
+    # ------------------------------------------------------------------
+    # Writing edits
+    # ------------------------------------------------------------------
+    def commit(self):
+        """End the current transaction, writing the edits made since the last one."""
+        info = self.project.info_dict()
+        if info != self.saved_info:
+            self.connection.execute("UPDATE meta SET value = ? WHERE key = 'info'", (json.dumps(info),))
+            self.saved_info = info
+        self.connection.commit()
+
+    def close(self):
+        self.project.unsubscribe(self.on_model_changed)
+        self.commit()
+        self.connection.close()
+
+    def detach(self):
+        """Stop following the project without committing pending edits."""
+        self.project.unsubscribe(self.on_model_changed)
+        self.connection.rollback()
+        self.connection.close()
+
+    def on_model_changed(self, event):
+        node = event.node
+        execute = self.connection.execute
+        if event.kind == CHANGED:
+            if isinstance(node, Task):
+                column = _TASK_FIELDS.get(event.field)
+                if column is None:
+                    execute("UPDATE tasks SET extra = ? WHERE id = ?", (_extra(node), node.id))
+                else:
+                    execute(f"UPDATE tasks SET {column} = ? WHERE id = ?", (event.new, node.id))
+                    if event.field in ("duration", "completed") and node.parent is not None:
+                        old = {"duration": node.duration, "completed": node.completed}
+                        old[event.field] = event.old
+                        delta = Totals()
+                        delta.add(old["duration"], old["completed"], -1)
+                        delta.add(node.duration, node.completed)
+                        self._adjust_totals(node.parent, delta)
+            elif isinstance(node, Subtask):
+                column = _TASK_FIELDS.get(event.field)
+                if column is None:
+                    execute("UPDATE subtasks SET extra = ? WHERE id = ?", (_extra(node), node.id))
+                else:
+                    execute(f"UPDATE subtasks SET {column} = ? WHERE id = ?", (event.new, node.id))
+            elif isinstance(node, Phase):
+                column = _PHASE_FIELDS.get(event.field)
+                if column is not None:
+                    execute(f"UPDATE phases SET {column} = ? WHERE id = ?", (event.new, node.id))
+            # Project fields are written with the info row on commit().
+        elif event.kind == ADDED:
+            self._added(node, event.field, event.new, event.index)
+        elif event.kind == REMOVED:
+            self._removed(node, event.field, event.old)
+
+    def _adjust_totals(self, phase, delta):
+        self.connection.execute(
+            "UPDATE phases SET total = total + ?, done = done + ?, open = open + ?, closed = closed + ? "
+            "WHERE id = ?", (*delta.as_tuple(), phase.id))
+
+    def _position(self, parent, field, index):
+        # Room for a child inserted at `index` of parent.<field>: after the
+        # last row when appending, else the next sibling's position, shifting
+        # it and everything after it up by one.
+        table, parent_column = _CHILD_TABLES[field]
+        siblings = getattr(parent, field)
+        where = f"{parent_column} = ?" if parent_column else "1"
+        args = (parent.id,) if parent_column else ()
+        if index + 1 >= len(siblings):
+            row = self.connection.execute(f"SELECT MAX(position) FROM {table} WHERE {where}", args).fetchone()
+            return 0 if row[0] is None else row[0] + 1
+        (position,) = self.connection.execute(f"SELECT position FROM {table} WHERE id = ?",
+                                              (siblings[index + 1].id,)).fetchone()
+        self.connection.execute(f"UPDATE {table} SET position = position + 1 WHERE {where} AND position >= ?",
+                                (*args, position))
+        return position
+
+    def _added(self, parent, field, child, index):
+        connection = self.connection
+        position = self._position(parent, field, index)
+        if field == "phases":
+            self._insert_phase(connection, child, position)
+        elif field == "tasks":
+            connection.execute("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                               _task_row(child, parent.id, position))
+            connection.executemany("INSERT INTO subtasks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   [_subtask_row(s, child.id, j) for j, s in enumerate(child.subtasks)])
+            delta = Totals()
+            delta.add(child.duration, child.completed)
+            self._adjust_totals(parent, delta)
+        else:
+            connection.execute("INSERT INTO subtasks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               _subtask_row(child, parent.id, position))
+
+    def _removed(self, parent, field, child):
+        execute = self.connection.execute
+        if field == "phases":
+            execute("DELETE FROM subtasks WHERE task_id IN (SELECT id FROM tasks WHERE phase_id = ?)", (child.id,))
+            execute("DELETE FROM tasks WHERE phase_id = ?", (child.id,))
+            execute("DELETE FROM phases WHERE id = ?", (child.id,))
+        elif field == "tasks":
+            execute("DELETE FROM subtasks WHERE task_id = ?", (child.id,))
+            execute("DELETE FROM tasks WHERE id = ?", (child.id,))
+            delta = Totals()
+            delta.add(child.duration, child.completed, -1)
+            self._adjust_totals(parent, delta)
+        else:
+            execute("DELETE FROM subtasks WHERE id = ?", (child.id,))
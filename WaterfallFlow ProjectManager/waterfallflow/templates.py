@@ -0,0 +1,117 @@
+"""Offline plan templates used by the project wizard."""
+
+TEMPLATES = {
+    "software": {
+        "name": "Enterprise Software Project",
+        "description": "Full Waterfall SDLC with Validation & Verification.",
+        "phases": [
+            ("Requirements", "Gathering needs", [
+                ("Stakeholder Interviews", 5, "Alice (PM)", [("Prep", 1), ("Interview", 3), ("Review", 1)]),
+                ("Spec Doc", 7, "Alice (PM)", [])
+            ]),
+            ("Design", "System architecture", [
+                ("UI Mockups", 5, "Carol (Design)", [("Wireframes", 2), ("Hi-Fi", 3)]),
+                ("DB Schema", 3, "Dave (DBA)", [])
+            ]),
+            ("Implementation", "Coding", [
+                ("Backend Setup", 5, "Backend Team", []),
+                ("API Dev", 10, "Backend Team", []),
+                ("Frontend", 10, "Frontend Team", [])
+            ]),
+            ("Verification", "Internal Testing", [
+                ("Code Reviews", 3, "Tech Lead", []),
+                ("Unit Testing", 5, "Dev Team", []),
+                ("Integration Testing", 5, "QA", [])
+            ]),
+            ("Validation", "Requirements Check", [
+                ("User Acceptance Testing (UAT)", 5, "Stakeholders", []),
+                ("Compliance Check", 2, "Legal", [])
+            ]),
+            ("Final Test & Demo", "Final steps", [
+                ("Performance Test", 3, "QA", []),
+                ("Final Client Demo", 1, "PM & Lead", []),
+                ("Sign-off Meeting", 1, "Sponsors", [])
+            ]),
+            ("Maintenance", "Support", [
+                ("Production Deployment", 1, "DevOps", []),
+                ("User Training", 2, "Alice (PM)", [])
+            ])
+        ]
+    },
+    "construction": {
+        "name": "Construction Project",
+        "description": "Physical infrastructure project.",
+        "phases": [
+            ("Planning", "Permits and blueprints", [
+                ("Site Survey", 3, "Surveyor", []),
+                ("Permits", 14, "Manager", [])
+            ]),
+            ("Foundation", "Ground work", [
+                ("Excavation", 5, "Crew A", []),
+                ("Pouring Concrete", 7, "Crew A", [])
+            ]),
+            ("Structure", "Framing", [
+                ("Framing", 10, "Carpenters", [("Walls", 6), ("Roof", 4)])
+            ])
+        ]
+    },
+    "generic": {
+        "name": "General Project",
+        "description": "Generic 5-stage waterfall plan.",
+        "phases": [
+            ("Initiation", "Define goals", [("Kickoff Meeting", 1, "Lead", [])]),
+            ("Planning", "Roadmap", [("Resource Plan", 3, "Manager", [])]),
+            ("Execution", "Core work", [
+                ("Task A", 5, "Team A", [("Subtask 1", 2), ("Subtask 2", 3)]),
+                ("Task B", 5, "Team B", [])
+            ]),
+            ("Monitoring", "Quality check", [("Review", 2, "Lead", [])]),
+            ("Closing", "Handover", [("Final Report", 1, "Admin", [])])
+        ]
+    }
+}
+
+
+def generate_offline_plan(prompt):
+    prompt = prompt.lower()
+    if any(x in prompt for x in ['soft', 'app', 'web', 'code', 'program']):
+        key = 'software'
+    elif any(x in prompt for x in ['build', 'house', 'construct', 'civil']):
+        key = 'construction'
+    else:
+        key = 'generic'
+
+    data = TEMPLATES[key]
+
+    project_data = {
+        "name": data["name"],
+        "description": f"{data['description']}",
+        "phases": []
+    }
+
+    for p_name, p_desc, tasks in data["phases"]:
+        phase_tasks = []
+        for t in tasks:
+            title, duration, assignee, sub_raw = t
+            subtasks_list = []
+            sub_duration_sum = 0
+            for st in sub_raw:
+                subtasks_list.append({"title": st[0], "durationDays": st[1]})
+                sub_duration_sum += st[1]
+
+            final_duration = sub_duration_sum if subtasks_list else duration
+            phase_tasks.append({
+                "title": title,
+                "durationDays": final_duration,
+                "assignee": assignee,
+                "subtasks": subtasks_list
+            })
+
+        phase_obj = {
+            "name": p_name,
+            "description": p_desc,
+            "tasks": phase_tasks
+        }
+        project_data["phases"].append(phase_obj)
+
+    return project_data
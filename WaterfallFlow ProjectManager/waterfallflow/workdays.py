@@ -0,0 +1,96 @@
+"""Calendar dates for a schedule, using NumPy business-day arithmetic.
+
+Schedule works in working-day offsets from the project start. ProjectDates
+turns them into dates in two vectorised steps:
+
+  1. an activity's start offset is a day on the project ("default")
+     calendar, which all activities share, so links keep their order;
+  2. that day is rolled forward to the next working day of the activity's
+     own calendar -- its assignee's (subtasks use their task's), else the
+     default -- and its length is counted in that calendar. The finish
+     date is the last working day (a zero-length milestone finishes on its
+     start date).
+
+The passes themselves stay calendar-free, so an activity whose calendar has
+fewer working days than the project's can end after a successor starts;
+its float is still measured in project working days.
+
+Calendar edits only change the offset -> date mapping, so refresh() redoes
+just the vectorised part; refresh(assignments=True) also re-reads who is
+assigned to what. Requires NumPy, like waterfallflow.columnar.
+"""
+
+import datetime
+
+import numpy as np
+
+from .model import Task
+
+DEFAULT_CALENDAR = "default"
+DEFAULT_WEEKMASK = "1111100"
+
+
+def busday_calendar(spec):
+    """np.busdaycalendar for a calendar dict {"weekmask", "holidays"}."""
+    spec = spec or {}
+    return np.busdaycalendar(weekmask=spec.get("weekmask", DEFAULT_WEEKMASK),
+                             holidays=spec.get("holidays", []))
+
+
+def compute_dates(start, early_start, early_finish, calendar_of, calendars):
+    """Vectorised offset -> date mapping (see the module docstring).
+
+    `early_start`/`early_finish` are per-activity working-day offsets,
+    `calendar_of` the index into `calendars` (np.busdaycalendar objects,
+    the project calendar first) for each activity. Returns (start dates,
+    finish dates) as datetime64[D] arrays.
+    """
+    start = np.datetime64(start, "D")
+    first = np.floor(np.asarray(early_start, dtype=np.float64)).astype(np.int64)
+    last = np.ceil(np.asarray(early_finish, dtype=np.float64)).astype(np.int64) - 1
+    span = np.maximum(last - first, 0)
+    starts = np.busday_offset(start, first, roll="forward", busdaycal=calendars[0])
+    finishes = np.busday_offset(starts, span, busdaycal=calendars[0])
+    for code in range(1, len(calendars)):
+        mask = calendar_of == code
+        if not mask.any():
+            continue
+        calendar = calendars[code]
+        own = np.busday_offset(starts[mask], 0, roll="forward", busdaycal=calendar)
+        starts[mask] = own
+        finishes[mask] = np.busday_offset(own, span[mask], busdaycal=calendar)
+    return starts, finishes
+
+
+class ProjectDates:
+    """Start and finish dates for the activities of a Schedule."""
+
+    def __init__(self, project, schedule):
+        self.project = project
+        self.schedule = schedule
+        self.calendar_of = None
+        self.refresh(assignments=True)
+
+    def refresh(self, assignments=False):
+        project, schedule = self.project, self.schedule
+        specs = project.calendars
+        names = [DEFAULT_CALENDAR] + sorted(name for name in specs if name != DEFAULT_CALENDAR)
+        self.calendars = [busday_calendar(specs.get(name)) for name in names]
+        if assignments or self.calendar_of is None or len(self.calendar_of) != len(schedule.nodes):
+            code_of = {name: code for code, name in enumerate(names)}
+            self.calendar_of = np.fromiter(
+                (code_of.get((node if isinstance(node, Task) else node.parent).assignee, 0)
+                 for node in schedule.nodes),
+                dtype=np.int32, count=len(schedule.nodes))
+        self.start, self.finish = compute_dates(
+            project.start_date or datetime.date.today().isoformat(),
+            schedule.early_start, schedule.early_finish, self.calendar_of, self.calendars)
+
+    def start_of(self, node):
+        return self.start[self.schedule.slot[node]].item()
+
+    def finish_of(self, node):
+        return self.finish[self.schedule.slot[node]].item()
+
+    def project_finish(self):
+        return self.finish.max().item() if len(self.finish) else None
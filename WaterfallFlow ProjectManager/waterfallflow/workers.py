@@ -0,0 +1,100 @@
+"""Background threads for plan generation, loading, saving and simulation."""
+
+import threading
+import time
+
+from .persistence import LoadCancelled, load_project, save_json_atomic
+from .templates import generate_offline_plan
+
+
+class OfflineWorker(threading.Thread):
+    def __init__(self, prompt, callback):
+        threading.Thread.__init__(self)
+        self.prompt = prompt
+        self.callback = callback
+
+    def run(self):
+        time.sleep(0.5)
+        try:
+            data = generate_offline_plan(self.prompt)
+            self.callback(data, None)
+        except Exception as e:
+            self.callback(None, str(e))
+
+
+class ProjectSaveWorker(threading.Thread):
+    """Serialises a project snapshot to disk off the GUI thread.
+
+    The snapshot is the plain dict from Project.to_dict() (or, with
+    write=write_session, the tuple from snapshot_session()); it shares no
+    mutable state with the live model, so editing can continue meanwhile.
+    The worker drops the snapshot once written, so a large one is freed on
+    this thread rather than the GUI's.
+    """
+
+    def __init__(self, snapshot, path, callback, write=save_json_atomic):
+        threading.Thread.__init__(self)
+        self.snapshot = snapshot
+        self.path = path
+        self.callback = callback
+        self.write = write
+
+    def run(self):
+        try:
+            self.write(self.path, self.snapshot)
+            error = None
+        except Exception as e:
+            error = str(e)
+        self.snapshot = None
+        self.callback(self.path, error)
+
+
+class ProjectLoadWorker(threading.Thread):
+    """Parses a project file and builds the model off the GUI thread.
+
+    Calls `callback(project, error)` exactly once; both are None when the
+    load was cancelled. With load=journal.open_journal the result is the
+    Journal holding the recovered project instead.
+    """
+
+    def __init__(self, path, progress, callback, load=load_project):
+        threading.Thread.__init__(self, daemon=True)
+        self.path = path
+        self.progress = progress
+        self.callback = callback
+        self.load = load
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            project = self.load(self.path, self.progress, self.cancel_event.is_set)
+            self.callback(project, None)
+        except LoadCancelled:
+            self.callback(None, None)
+        except Exception as e:
+            self.callback(None, str(e))
+
+
+class SimulationWorker(threading.Thread):
+    """Runs montecarlo.run_simulation() for a prepared Network.
+
+    The Network is built from the model on the GUI thread and shares no
+    state with it. Calls `callback((lengths, critical), error)` once.
+    """
+
+    def __init__(self, network, iterations, callback, seed=None):
+        threading.Thread.__init__(self, daemon=True)
+        self.network = network
+        self.iterations = iterations
+        self.callback = callback
+        self.seed = seed
+
+    def run(self):
+        try:
+            from .montecarlo import run_simulation
+            self.callback(run_simulation(self.network, self.iterations, seed=self.seed), None)
+        except Exception as e:
+            self.callback(None, str(e))